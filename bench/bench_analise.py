@@ -0,0 +1,59 @@
+"""
+Benchmark dos relatórios de main.analytics.
+
+Gera um dia de atendimentos em colunas e mede o relatório diário (visitas por risco e hora,
+pacientes frequentes e espera média por risco) calculado sobre as colunas, e o mesmo relatório
+respondido pelos agregados mantidos na inserção. Usa o NumPy se estiver instalado.
+
+Uso: python -m bench.bench_analise [quantidade]
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from main.analytics import AnaliseAtendimentos
+
+QUANTIDADE = 1_000_000
+PACIENTES = 200_000
+DIA = datetime(2024, 1, 1)
+
+
+def gerar(analise, quantidade):
+    inicio = DIA.timestamp()
+    np = analise.numpy
+    if np is not None:
+        gerador = np.random.default_rng(42)
+        analise.carregar_colunas(gerador.integers(1, PACIENTES, quantidade, dtype=np.uint64),
+                                 gerador.integers(1, 6, quantidade, dtype=np.uint8),
+                                 inicio + gerador.random(quantidade) * 86400,
+                                 gerador.exponential(1800, quantidade))
+    else:
+        gerador = random.Random(42)
+        analise.carregar_colunas([gerador.randrange(1, PACIENTES) for _ in range(quantidade)],
+                                 [gerador.randrange(1, 6) for _ in range(quantidade)],
+                                 [inicio + gerador.random() * 86400 for _ in range(quantidade)],
+                                 [gerador.expovariate(1 / 1800) for _ in range(quantidade)])
+
+
+def relatorio(analise, desde=None, ate=None):
+    inicio = time.perf_counter()
+    analise.visitas_por_risco(desde=desde, ate=ate)
+    analise.frequentes(desde=desde, ate=ate)
+    analise.espera_media(desde=desde, ate=ate)
+    return time.perf_counter() - inicio
+
+
+def executar(quantidade):
+    analise = AnaliseAtendimentos()
+    inicio = time.perf_counter()
+    gerar(analise, quantidade)
+    carga = time.perf_counter() - inicio
+    print(f"{quantidade} atendimentos ({'NumPy' if analise.numpy is not None else 'array, sem NumPy'})")
+    print(f"carga e agregados: {carga:.2f} s")
+    print(f"relatório diário sobre as colunas: {relatorio(analise, DIA, DIA + timedelta(days=1)):.2f} s")
+    print(f"relatório pelos agregados: {relatorio(analise) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    executar(int(sys.argv[1]) if len(sys.argv) > 1 else QUANTIDADE)
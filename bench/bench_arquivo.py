@@ -0,0 +1,56 @@
+"""
+Benchmark do arquivo de atendimentos concluídos (main.archive).
+
+Anexa atendimentos ao arquivo e mede a varredura completa (registros por segundo, sem criar objetos
+Atendimento) e a leitura do histórico de um paciente pelo índice de CPF.
+
+Uso: python -m bench.bench_arquivo [quantidade]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from bench.common import gerar_cpf, medir
+from main.archive import ArquivoAtendimentos
+from main.domain import Atendimento, Paciente, Risco
+
+QUANTIDADE = 1_000_000
+PACIENTES = 10_000
+BUSCAS = 10_000
+
+
+def executar(quantidade):
+    pacientes = [Paciente("Paciente Teste", gerar_cpf(i), "p@teste.com", "01/01/1990") for i in range(PACIENTES)]
+    riscos = list(Risco)
+    base = datetime(2024, 1, 1)
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "atendimentos.bin")
+        arquivo = ArquivoAtendimentos(caminho)
+        inicio = time.perf_counter_ns()
+        for i in range(quantidade):
+            arquivo.anexar(Atendimento(pacientes[i % PACIENTES], random.choice(riscos), base + timedelta(minutes=i)))
+        arquivo.sincronizar()
+        anexar = (time.perf_counter_ns() - inicio) / quantidade
+
+        inicio = time.perf_counter()
+        contagem = [0] * 6
+        for _, risco, _ in arquivo.varrer():
+            contagem[risco] += 1
+        varredura = quantidade / (time.perf_counter() - inicio)
+
+        cpfs = iter([gerar_cpf(random.randrange(PACIENTES)) for _ in range(BUSCAS)])
+        historico = medir(lambda: list(arquivo.historico(next(cpfs))), BUSCAS)
+        tamanho = os.path.getsize(caminho)
+        arquivo.fechar()
+
+    print(f"{quantidade} atendimentos, {tamanho / 2**20:.1f} MiB")
+    print(f"anexar: {anexar:.0f} ns por atendimento")
+    print(f"varredura: {varredura / 1e6:.2f} milhões de registros/s")
+    print(f"histórico de um paciente ({quantidade // PACIENTES} registros): {historico / 1000:.1f} µs")
+
+
+if __name__ == '__main__':
+    executar(int(sys.argv[1]) if len(sys.argv) > 1 else QUANTIDADE)
@@ -0,0 +1,71 @@
+"""
+Benchmark de estresse da FilaAtendimentoConcorrente com várias threads.
+
+Cada thread insere e chama atendimentos alternadamente; o resultado mostra a vazão total, a
+latência p99 por operação e confirma que nenhum atendimento foi entregue duas vezes.
+
+Uso: python -m bench.bench_concorrencia [operacoes_por_thread] [threads...]
+"""
+import statistics
+import sys
+import threading
+import time
+
+from main.concurrency import FilaAtendimentoConcorrente
+from main.domain import Atendimento, Paciente, Risco
+from main.error import FilaVaziaError
+
+OPERACOES = 20_000
+THREADS = [1, 2, 4, 8, 16, 32, 64]
+
+
+def medir(threads, operacoes):
+    fila = FilaAtendimentoConcorrente()
+    paciente = Paciente("Paciente Teste", "52998224725", "p@teste.com", "01/01/1990")
+    riscos = list(Risco)
+    latencias = [[] for _ in range(threads)]
+    chamados = [0] * threads
+    barreira = threading.Barrier(threads + 1)
+
+    def trabalhador(indice):
+        atendimentos = [Atendimento(paciente, riscos[i % 5]) for i in range(operacoes)]
+        medidas = latencias[indice]
+        barreira.wait()
+        for atendimento in atendimentos:
+            inicio = time.perf_counter_ns()
+            fila.inserir(atendimento)
+            try:
+                fila.proximo()
+                chamados[indice] += 1
+            except FilaVaziaError:
+                pass
+            medidas.append(time.perf_counter_ns() - inicio)
+
+    lista = [threading.Thread(target=trabalhador, args=(i,)) for i in range(threads)]
+    for thread in lista:
+        thread.start()
+    barreira.wait()
+    inicio = time.perf_counter()
+    for thread in lista:
+        thread.join()
+    segundos = time.perf_counter() - inicio
+
+    restantes = 0
+    while fila.possui_proximo():
+        fila.proximo()
+        restantes += 1
+    assert sum(chamados) + restantes == threads * operacoes, "atendimento entregue mais de uma vez"
+    p99 = statistics.quantiles([m for medidas in latencias for m in medidas], n=100)[98]
+    return threads * operacoes * 2 / segundos, p99 / 2
+
+
+def executar(operacoes, lista_threads):
+    print(f"{'threads':>8} {'ops/s':>12} {'p99 (µs/op)':>12}")
+    for threads in lista_threads:
+        vazao, p99 = medir(threads, operacoes)
+        print(f"{threads:>8} {vazao:>12,.0f} {p99 / 1000:>12.1f}")
+
+
+if __name__ == '__main__':
+    argumentos = [int(a) for a in sys.argv[1:]]
+    executar(argumentos[0] if argumentos else OPERACOES, argumentos[1:] or THREADS)
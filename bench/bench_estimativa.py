@@ -0,0 +1,57 @@
+"""
+Benchmark da estimativa de espera (main.estimate).
+
+Para filas de tamanhos crescentes, mede estimar_espera de atendimentos aleatórios (deve crescer
+apenas com o logaritmo do tamanho da fila), o recálculo da fila inteira por atendimento e o custo
+que o estimador acrescenta a inserir_fila_atendimento e chamar_proximo.
+
+Uso: python -m bench.bench_estimativa [tamanhos...]
+"""
+import random
+import sys
+import time
+
+from bench.common import gerar_cpf, medir
+from main.domain import Atendimento, FilaAtendimentoMultinivel, Paciente, Risco
+from main.estimate import EstimadorEspera
+from main.service import ProntoSocorroService
+
+TAMANHOS = [1_000, 10_000, 100_000, 1_000_000]
+CONSULTAS = 10_000
+
+
+def medir_operacoes(estimador, atendimentos):
+    servico = ProntoSocorroService({}, {}, FilaAtendimentoMultinivel(), estimador=estimador)
+    inicio = time.perf_counter_ns()
+    for atendimento in atendimentos:
+        servico.inserir_fila_atendimento(atendimento)
+    inserir = (time.perf_counter_ns() - inicio) / len(atendimentos)
+    chamadas = len(atendimentos) // 10
+    inicio = time.perf_counter_ns()
+    for _ in range(chamadas):
+        servico.chamar_proximo()
+    chamar = (time.perf_counter_ns() - inicio) / chamadas
+    return servico, inserir, chamar
+
+
+def executar(tamanhos):
+    pacientes = [Paciente("Paciente Teste", gerar_cpf(i), "p@teste.com", "01/01/1990") for i in range(1000)]
+    riscos = list(Risco)
+    print(f"{'fila':>10} {'estimar (ns)':>13} {'fila inteira (ns/atend.)':>25} "
+          f"{'inserir +ns':>12} {'chamar +ns':>11}")
+    for tamanho in tamanhos:
+        atendimentos = [Atendimento(pacientes[i % 1000], random.choice(riscos)) for i in range(tamanho)]
+        _, sem_inserir, sem_chamar = medir_operacoes(None, atendimentos)
+        servico, com_inserir, com_chamar = medir_operacoes(EstimadorEspera(preservar_ordem=False), atendimentos)
+        na_fila = [a for a in atendimentos if id(a) in servico.fila_atendimento.entradas]
+        consultas = iter([random.choice(na_fila) for _ in range(CONSULTAS)])
+        estimar = medir(lambda: servico.estimar_espera(next(consultas)), CONSULTAS)
+        inicio = time.perf_counter_ns()
+        servico.estimar_espera_fila()
+        fila_inteira = (time.perf_counter_ns() - inicio) / len(na_fila)
+        print(f"{tamanho:>10} {estimar:>13.0f} {fila_inteira:>25.0f} "
+              f"{com_inserir - sem_inserir:>12.0f} {com_chamar - sem_chamar:>11.0f}")
+
+
+if __name__ == '__main__':
+    executar([int(t) for t in sys.argv[1:]] or TAMANHOS)
@@ -0,0 +1,55 @@
+"""
+Benchmark do barramento de eventos.
+
+Mede chamar_proximo do serviço sem barramento, com barramento e sem assinaturas, e com 100
+assinaturas (que leem os eventos depois das chamadas, como um painel que redesenha a tela).
+
+Uso: python -m bench.bench_eventos [quantidade]
+"""
+import random
+import sys
+import time
+
+from bench.common import gerar_cpf
+from main.domain import Atendimento, FilaAtendimentoMultinivel, Paciente, Risco
+from main.events import BarramentoEventos
+from main.service import ProntoSocorroService
+
+QUANTIDADE = 1_000_000
+ASSINATURAS = 100
+
+
+def medir_chamar(eventos, atendimentos):
+    servico = ProntoSocorroService({}, {}, FilaAtendimentoMultinivel(), eventos=eventos)
+    for atendimento in atendimentos:
+        servico.inserir_fila_atendimento(atendimento)
+    inicio = time.perf_counter_ns()
+    for _ in range(len(atendimentos)):
+        servico.chamar_proximo()
+    return (time.perf_counter_ns() - inicio) / len(atendimentos)
+
+
+def executar(quantidade):
+    pacientes = [Paciente("Paciente Teste", gerar_cpf(i), "p@teste.com", "01/01/1990") for i in range(1000)]
+    riscos = list(Risco)
+    atendimentos = [Atendimento(pacientes[i % 1000], random.choice(riscos)) for i in range(quantidade)]
+
+    sem_barramento = medir_chamar(None, atendimentos)
+    sem_assinaturas = medir_chamar(BarramentoEventos(), atendimentos)
+    barramento = BarramentoEventos()
+    assinaturas = [barramento.assinar() for _ in range(ASSINATURAS)]
+    com_assinaturas = medir_chamar(barramento, atendimentos)
+    inicio = time.perf_counter_ns()
+    lidos = sum(len(assinatura.ler()) for assinatura in assinaturas)
+    leitura = (time.perf_counter_ns() - inicio) / max(lidos, 1)
+    perdidos = sum(assinatura.perdidos for assinatura in assinaturas)
+
+    print(f"{'chamar_proximo':>32} {'ns/op':>8}")
+    print(f"{'sem barramento':>32} {sem_barramento:>8.0f}")
+    print(f"{'barramento sem assinaturas':>32} {sem_assinaturas:>8.0f}")
+    print(f"{f'barramento com {ASSINATURAS} assinaturas':>32} {com_assinaturas:>8.0f}")
+    print(f"leitura pelas assinaturas: {leitura:.0f} ns por evento ({lidos} lidos, {perdidos} descartados)")
+
+
+if __name__ == '__main__':
+    executar(int(sys.argv[1]) if len(sys.argv) > 1 else QUANTIDADE)
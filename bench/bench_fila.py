@@ -0,0 +1,46 @@
+"""
+Micro-benchmark de inserção e remoção nas filas de atendimento.
+
+Compara a FilaAtendimento (heap) com a FilaAtendimentoMultinivel (uma fila FIFO por nível).
+
+Uso: python -m bench.bench_fila [quantidades...]
+"""
+import random
+import sys
+import time
+
+from bench.common import gerar_cpf
+from main.domain import Atendimento, FilaAtendimento, FilaAtendimentoMultinivel, Paciente, Risco
+
+QUANTIDADES = [10_000, 100_000, 1_000_000, 10_000_000]
+FILAS = [FilaAtendimento, FilaAtendimentoMultinivel]
+
+
+def medir_fila(classe_fila, atendimentos):
+    fila = classe_fila()
+    inicio = time.perf_counter()
+    for atendimento in atendimentos:
+        fila.inserir(atendimento)
+    tempo_inserir = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    while fila.possui_proximo():
+        fila.proximo()
+    tempo_proximo = time.perf_counter() - inicio
+    return tempo_inserir, tempo_proximo
+
+
+def executar(quantidades):
+    pacientes = [Paciente("Paciente Teste", gerar_cpf(i), "p@teste.com", "01/01/1990") for i in range(1000)]
+    riscos = list(Risco)
+    print(f"{'fila':>26} {'pacientes':>10} {'inserir (ns/op)':>16} {'proximo (ns/op)':>16}")
+    for quantidade in quantidades:
+        atendimentos = [Atendimento(pacientes[i % 1000], random.choice(riscos)) for i in range(quantidade)]
+        for classe_fila in FILAS:
+            tempo_inserir, tempo_proximo = medir_fila(classe_fila, atendimentos)
+            print(f"{classe_fila.__name__:>26} {quantidade:>10} "
+                  f"{tempo_inserir / quantidade * 1e9:>16.0f} {tempo_proximo / quantidade * 1e9:>16.0f}")
+
+
+if __name__ == '__main__':
+    executar([int(q) for q in sys.argv[1:]] or QUANTIDADES)
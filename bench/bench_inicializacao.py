@@ -0,0 +1,67 @@
+"""
+Benchmark do tempo de inicialização (partida a frio) do cliente de terminal.
+
+Executa `python -X importtime` em processos novos, importando os mesmos módulos que o main.py, e
+mostra a mediana do tempo total de importação e os módulos que mais contribuem para ele. O tempo
+de parede do processo é comparado com o de um interpretador que não importa nada.
+
+Uso: python -m bench.bench_inicializacao [execucoes]
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+EXECUCOES = 20
+MODULOS = ("main.cli", "main.render", "main.repository", "main.service")
+MAIORES = 10
+
+
+def importar(codigo: str):
+    """Executa `codigo` em um novo interpretador e retorna (segundos, linhas do -X importtime)."""
+    inicio = time.perf_counter()
+    processo = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo],
+                              capture_output=True, text=True, check=True)
+    segundos = time.perf_counter() - inicio
+    linhas = []
+    for linha in processo.stderr.splitlines():
+        if linha.startswith("import time:") and "|" in linha and "self" not in linha:
+            proprio, acumulado, modulo = linha[len("import time:"):].split("|")
+            linhas.append((modulo.rstrip(), int(proprio), int(acumulado)))
+    return segundos, linhas
+
+def medir_importacao(execucoes: int) -> dict:
+    """Mediana do tempo de importação dos módulos do main.py (µs) e do tempo de parede (s)."""
+    codigo = "; ".join(f"import {modulo}" for modulo in MODULOS)
+    totais, paredes, vazio = [], [], []
+    proprio = {}
+    for _ in range(execucoes):
+        vazio.append(importar("pass")[0])
+        segundos, linhas = importar(codigo)
+        paredes.append(segundos)
+        # Linhas sem indentação são importações de primeiro nível; o acumulado já inclui as internas.
+        totais.append(sum(acumulado for modulo, _, acumulado in linhas
+                          if not modulo.startswith("  ") and modulo.strip().startswith("main")))
+        for modulo, tempo, _ in linhas:
+            proprio.setdefault(modulo.strip(), []).append(tempo)
+    return {
+        "importacao_us": statistics.median(totais),
+        "parede_s": statistics.median(paredes),
+        "interpretador_s": statistics.median(vazio),
+        "maiores": sorted(((statistics.median(tempos), modulo) for modulo, tempos in proprio.items()),
+                          reverse=True)[:MAIORES],
+    }
+
+
+def executar(execucoes):
+    resultado = medir_importacao(execucoes)
+    print(f"importação dos módulos do main.py: {resultado['importacao_us'] / 1000:.1f} ms (mediana de {execucoes})")
+    print(f"processo completo: {resultado['parede_s'] * 1000:.1f} ms "
+          f"(interpretador vazio: {resultado['interpretador_s'] * 1000:.1f} ms)")
+    print(f"{'módulo':>30} {'tempo próprio (µs)':>20}")
+    for tempo, modulo in resultado["maiores"]:
+        print(f"{modulo:>30} {tempo:>20.0f}")
+
+
+if __name__ == '__main__':
+    executar(int(sys.argv[1]) if len(sys.argv) > 1 else EXECUCOES)
@@ -0,0 +1,62 @@
+"""
+Benchmark de memória (tracemalloc): bytes por atendimento em cada representação.
+
+Uso: python -m bench.bench_memoria [quantidade]
+"""
+import sys
+import tracemalloc
+from dataclasses import make_dataclass
+from datetime import datetime, timedelta
+
+from bench.common import gerar_cpf
+from main.domain import Atendimento, Paciente, Risco
+from main.store import AtendimentoCompacto, AtendimentoStore
+
+QUANTIDADE = 1_000_000
+
+# Atendimento como era antes de __slots__ (com __dict__ por instância), para comparação.
+AtendimentoOriginal = make_dataclass("AtendimentoOriginal", ["paciente", "risco", "entrada"])
+
+
+def medir_bytes(construir, quantidade):
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    registros = construir()
+    total = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    del registros
+    return total / quantidade
+
+
+def executar(quantidade):
+    pacientes = [Paciente("Paciente Teste", gerar_cpf(i), "p@teste.com", "01/01/1990") for i in range(1000)]
+    riscos = list(Risco)
+    base = datetime(2024, 1, 1)
+
+    def dados():
+        return ((pacientes[i % 1000], riscos[i % 5], base + timedelta(seconds=i)) for i in range(quantidade))
+
+    def lista_originais():
+        return [AtendimentoOriginal(*d) for d in dados()]
+
+    def lista_atendimentos():
+        return [Atendimento(*d) for d in dados()]
+
+    def lista_compactos():
+        return [AtendimentoCompacto(int(p.cpf), r.value, e.timestamp()) for p, r, e in dados()]
+
+    def store_colunar():
+        store = AtendimentoStore()
+        for p, r, e in dados():
+            store.inserir_valores(int(p.cpf), r.value, e.timestamp())
+        return store
+
+    for nome, construir in [("Atendimento sem slots", lista_originais),
+                            ("Atendimento (slots)", lista_atendimentos),
+                            ("AtendimentoCompacto", lista_compactos),
+                            ("AtendimentoStore", store_colunar)]:
+        print(f"{nome:>24}: {medir_bytes(construir, quantidade):7.1f} bytes/registro")
+
+
+if __name__ == '__main__':
+    executar(int(sys.argv[1]) if len(sys.argv) > 1 else QUANTIDADE)
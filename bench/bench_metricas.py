@@ -0,0 +1,48 @@
+"""
+Benchmark do custo das métricas da fila de atendimento.
+
+Mede inserir_fila_atendimento e chamar_proximo do serviço com e sem MetricasFila e mostra o custo
+adicional por operação.
+
+Uso: python -m bench.bench_metricas [quantidade]
+"""
+import random
+import sys
+import time
+
+from bench.common import gerar_cpf
+from main.domain import Atendimento, FilaAtendimentoMultinivel, Paciente, Risco
+from main.metrics import MetricasFila
+from main.service import ProntoSocorroService
+
+QUANTIDADE = 1_000_000
+
+
+def medir_servico(metricas, atendimentos):
+    servico = ProntoSocorroService({}, {}, FilaAtendimentoMultinivel(), metricas=metricas)
+    inicio = time.perf_counter_ns()
+    for atendimento in atendimentos:
+        servico.inserir_fila_atendimento(atendimento)
+    tempo_inserir = time.perf_counter_ns() - inicio
+
+    inicio = time.perf_counter_ns()
+    for _ in range(len(atendimentos)):
+        servico.chamar_proximo()
+    tempo_chamar = time.perf_counter_ns() - inicio
+    return tempo_inserir / len(atendimentos), tempo_chamar / len(atendimentos)
+
+
+def executar(quantidade):
+    pacientes = [Paciente("Paciente Teste", gerar_cpf(i), "p@teste.com", "01/01/1990") for i in range(1000)]
+    riscos = list(Risco)
+    atendimentos = [Atendimento(pacientes[i % 1000], random.choice(riscos)) for i in range(quantidade)]
+
+    sem_inserir, sem_chamar = medir_servico(None, atendimentos)
+    com_inserir, com_chamar = medir_servico(MetricasFila(), atendimentos)
+    print(f"{'operação':>10} {'sem métricas (ns)':>18} {'com métricas (ns)':>18} {'custo (ns)':>11}")
+    print(f"{'inserir':>10} {sem_inserir:>18.0f} {com_inserir:>18.0f} {com_inserir - sem_inserir:>11.0f}")
+    print(f"{'chamar':>10} {sem_chamar:>18.0f} {com_chamar:>18.0f} {com_chamar - sem_chamar:>11.0f}")
+
+
+if __name__ == '__main__':
+    executar(int(sys.argv[1]) if len(sys.argv) > 1 else QUANTIDADE)
@@ -0,0 +1,59 @@
+"""
+Benchmark do log de eventos: vazão de escrita sustentada por política de fsync e tempo de
+recuperação do serviço a partir do log.
+
+Uso: python -m bench.bench_persistence [eventos]
+"""
+import shutil
+import sys
+import tempfile
+import time
+
+from bench.common import gerar_cpf
+from main.domain import Risco
+from main.persistence import LogEventos, ProntoSocorroServicePersistente, POLITICAS_FSYNC
+
+EVENTOS = 1_000_000
+EVENTOS_FSYNC_SEMPRE = 10_000
+
+
+def medir_escrita(diretorio, politica, eventos):
+    log = LogEventos(f"{diretorio}/{politica}.log", politica_fsync=politica)
+    inicio = time.perf_counter()
+    for i in range(eventos):
+        log.registrar('fila', i)
+    log.fechar()
+    return eventos / (time.perf_counter() - inicio)
+
+
+def medir_recuperacao(diretorio, eventos):
+    servico = ProntoSocorroServicePersistente(diretorio, politica_fsync='nunca', intervalo_snapshot=0)
+    riscos = list(Risco)
+    pacientes = eventos // 4
+    for i in range(pacientes):
+        paciente = servico.registrar_paciente("Paciente Teste", gerar_cpf(i), "p@teste.com", "01/01/1990")
+        servico.inserir_fila_atendimento(servico.registrar_atendimento(paciente, riscos[i % 5]))
+        if i % 2:
+            servico.chamar_proximo()
+    total = servico.log.lsn
+    servico.fechar()
+
+    inicio = time.perf_counter()
+    ProntoSocorroServicePersistente(diretorio, intervalo_snapshot=0).fechar()
+    return total, time.perf_counter() - inicio
+
+
+def executar(eventos):
+    diretorio = tempfile.mkdtemp()
+    try:
+        for politica in POLITICAS_FSYNC:
+            quantidade = EVENTOS_FSYNC_SEMPRE if politica == 'sempre' else eventos
+            print(f"escrita fsync={politica:<6} {medir_escrita(diretorio, politica, quantidade):>12,.0f} eventos/s")
+        total, segundos = medir_recuperacao(f"{diretorio}/servico", eventos)
+        print(f"recuperação de {total:,} eventos: {segundos:.2f}s")
+    finally:
+        shutil.rmtree(diretorio)
+
+
+if __name__ == '__main__':
+    executar(int(sys.argv[1]) if len(sys.argv) > 1 else EVENTOS)
@@ -0,0 +1,43 @@
+"""
+Benchmark da busca por CPF no PacienteRepository.
+
+Mostra que a latência de `buscar` permanece constante conforme o cadastro cresce.
+
+Uso: python -m bench.bench_repository [tamanhos...]
+"""
+import random
+import sys
+
+from bench.common import gerar_cpf, medir
+from main.domain import Paciente
+from main.repository import PacienteRepository
+
+TAMANHOS = [1_000, 10_000, 100_000, 1_000_000, 5_000_000]
+BUSCAS = 100_000
+
+
+def executar(tamanhos):
+    repo = PacienteRepository()
+    total = 0
+    print(f"{'pacientes':>12} {'buscar (ns)':>12} {'inserir duplicado (ns)':>24}")
+    for tamanho in tamanhos:
+        for i in range(total, tamanho):
+            repo.inserir(Paciente("Paciente Teste", gerar_cpf(i), f"p{i}@teste.com", "01/01/1990"))
+        total = tamanho
+
+        cpfs = [gerar_cpf(random.randrange(total)) for _ in range(BUSCAS)]
+        it = iter(cpfs)
+        ns_busca = medir(lambda: repo.buscar(next(it)), BUSCAS)
+        existente = repo.buscar(cpfs[0])
+
+        def inserir_duplicado():
+            try:
+                repo.inserir(existente)
+            except Exception:
+                pass
+        ns_duplicado = medir(inserir_duplicado, BUSCAS)
+        print(f"{tamanho:>12} {ns_busca:>12.0f} {ns_duplicado:>24.0f}")
+
+
+if __name__ == '__main__':
+    executar([int(t) for t in sys.argv[1:]] or TAMANHOS)
@@ -0,0 +1,81 @@
+"""
+Gerador de carga para o servidor HTTP/JSON (main.server).
+
+Abre várias conexões keep-alive simultâneas; cada uma envia lotes de requisições em pipeline
+(registra um atendimento e chama o próximo da fila) e mede a latência de cada lote.
+
+Uso: python -m bench.bench_server [conexoes] [lotes_por_conexao] [pipeline]
+Sem --porta, sobe um servidor no próprio processo.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from bench.common import gerar_cpf
+from main.repository import PacienteRepository, AtendimentoRepository
+from main.server import ServidorHTTP
+from main.service import ProntoSocorroService
+
+
+def requisicao(metodo, alvo, dados=None):
+    corpo = json.dumps(dados).encode() if dados is not None else b""
+    return f"{metodo} {alvo} HTTP/1.1\r\nHost: bench\r\nContent-Length: {len(corpo)}\r\n\r\n".encode() + corpo
+
+
+async def ler_resposta(reader):
+    cabecalho = await reader.readuntil(b"\r\n\r\n")
+    tamanho = int(cabecalho.lower().split(b"content-length: ")[1].split(b"\r\n")[0])
+    await reader.readexactly(tamanho)
+    return int(cabecalho.split(b" ")[1])
+
+
+async def cliente(host, porta, indice, lotes, pipeline, latencias, erros):
+    reader, writer = await asyncio.open_connection(host, porta)
+    cpf = gerar_cpf(indice)
+    writer.write(requisicao("POST", "/pacientes", {"nome": "Paciente Teste", "cpf": cpf,
+                                                   "email": "p@teste.com", "nascimento": "01/01/1990"}))
+    await ler_resposta(reader)
+    lote = b"".join(requisicao("POST", "/atendimentos", {"cpf": cpf, "gravidade_moderada": True})
+                    + requisicao("POST", "/fila/proximo") for _ in range(pipeline // 2))
+    for _ in range(lotes):
+        inicio = time.perf_counter()
+        writer.write(lote)
+        for _ in range(pipeline // 2 * 2):
+            if await ler_resposta(reader) >= 400:
+                erros.append(1)
+        latencias.append(time.perf_counter() - inicio)
+    writer.close()
+
+
+async def executar(conexoes, lotes, pipeline, host, porta):
+    servidor = None
+    if porta is None:
+        pacientes = PacienteRepository()
+        ps_service = ProntoSocorroService(pacientes, AtendimentoRepository(pacientes))
+        servidor = await ServidorHTTP(ps_service).iniciar(host, 0)
+        porta = servidor.sockets[0].getsockname()[1]
+
+    latencias, erros = [], []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(host, porta, i, lotes, pipeline, latencias, erros) for i in range(conexoes)))
+    segundos = time.perf_counter() - inicio
+
+    total = conexoes * lotes * (pipeline // 2 * 2)
+    quantis = statistics.quantiles(latencias, n=100)
+    print(f"{conexoes} conexões, pipeline de {pipeline}: {total / segundos:,.0f} req/s, {len(erros)} erros")
+    print(f"latência por lote: p50 {quantis[49] * 1000:.1f} ms, p99 {quantis[98] * 1000:.1f} ms")
+    if servidor is not None:
+        servidor.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("conexoes", type=int, nargs="?", default=1000)
+    parser.add_argument("lotes", type=int, nargs="?", default=20)
+    parser.add_argument("pipeline", type=int, nargs="?", default=8)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, help="Porta de um servidor já em execução.")
+    opcoes = parser.parse_args()
+    asyncio.run(executar(opcoes.conexoes, opcoes.lotes, opcoes.pipeline, opcoes.host, opcoes.porta))
@@ -0,0 +1,47 @@
+"""
+Benchmark dos repositórios SQLite: carga em lote e latência de busca e histórico.
+
+Uso: python -m bench.bench_sqlite [pacientes] [atendimentos_por_paciente]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from bench.common import gerar_cpf, medir
+from main.domain import Atendimento, Paciente, Risco
+from main.sqlite_repository import conectar, PacienteRepositorySQLite, AtendimentoRepositorySQLite
+
+PACIENTES = 1_000_000
+ATENDIMENTOS_POR_PACIENTE = 5
+LOTE = 50_000
+BUSCAS = 10_000
+
+
+def executar(quantidade, por_paciente):
+    diretorio = tempfile.mkdtemp()
+    pacientes = PacienteRepositorySQLite(conectar(os.path.join(diretorio, "ps.db")))
+    atendimentos = AtendimentoRepositorySQLite(pacientes)
+    riscos = list(Risco)
+    base = datetime(2024, 1, 1)
+
+    inicio = time.perf_counter()
+    for lote in range(0, quantidade, LOTE):
+        novos = [Paciente("Paciente Teste", gerar_cpf(i), "p@teste.com", "01/01/1990")
+                 for i in range(lote, min(lote + LOTE, quantidade))]
+        pacientes.inserir_lote(novos)
+        atendimentos.inserir_lote(Atendimento(p, random.choice(riscos), base + timedelta(hours=h))
+                                  for p in novos for h in range(por_paciente))
+    segundos = time.perf_counter() - inicio
+    print(f"carga: {quantidade:,} pacientes e {quantidade * por_paciente:,} atendimentos em {segundos:.1f}s")
+
+    cpfs = iter([gerar_cpf(random.randrange(quantidade)) for _ in range(2 * BUSCAS)])
+    print(f"buscar: {medir(lambda: pacientes.buscar(next(cpfs)), BUSCAS) / 1000:.1f} µs")
+    print(f"historico_atendimentos: {medir(lambda: atendimentos.historico_atendimentos(next(cpfs)), BUSCAS) / 1000:.1f} µs")
+
+
+if __name__ == '__main__':
+    argumentos = [int(a) for a in sys.argv[1:]]
+    executar(*(argumentos + [PACIENTES, ATENDIMENTOS_POR_PACIENTE][len(argumentos):]))
@@ -0,0 +1,34 @@
+"""
+Benchmark da validação de pacientes (meta: 1 milhão de validações por segundo).
+
+Uso: python -m bench.bench_validation [quantidade]
+"""
+import sys
+import time
+
+from bench.common import gerar_cpf
+from main.domain import Paciente
+from main.validation import validar_lote
+
+QUANTIDADE = 1_000_000
+
+
+def executar(quantidade):
+    registros = [("Paciente Teste", gerar_cpf(i), f"p{i % 1000}@teste.com", f"{i % 28 + 1:02d}/{i % 12 + 1:02d}/{1940 + i % 80}")
+                 for i in range(quantidade)]
+
+    inicio = time.perf_counter()
+    erros = validar_lote(registros)
+    segundos = time.perf_counter() - inicio
+    assert not any(erros)
+    print(f"validar_lote: {quantidade / segundos:,.0f} registros/s")
+
+    inicio = time.perf_counter()
+    for registro in registros:
+        Paciente(*registro)
+    segundos = time.perf_counter() - inicio
+    print(f"Paciente(...): {quantidade / segundos:,.0f} pacientes/s")
+
+
+if __name__ == '__main__':
+    executar(int(sys.argv[1]) if len(sys.argv) > 1 else QUANTIDADE)
@@ -0,0 +1,26 @@
+"""
+Funções auxiliares compartilhadas pelos benchmarks.
+"""
+import time
+
+
+def digito_verificador(base: str) -> str:
+    soma = sum(int(d) * peso for d, peso in zip(base, range(len(base) + 1, 1, -1)))
+    return str(soma * 10 % 11 % 10)
+
+def gerar_cpf(i: int) -> str:
+    """
+    Gera um CPF válido (com dígitos verificadores) a partir de um número sequencial, pulando as
+    bases com todos os dígitos iguais (000000000, 111111111, ...).
+    """
+    bloco, posicao = divmod(i, 111111110)
+    base = f"{bloco * 111111111 + 1 + posicao:09d}"
+    base += digito_verificador(base)
+    return base + digito_verificador(base)
+
+def medir(funcao, repeticoes: int) -> float:
+    """Executa `funcao` `repeticoes` vezes e retorna o tempo médio por chamada, em nanossegundos."""
+    inicio = time.perf_counter_ns()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter_ns() - inicio) / repeticoes
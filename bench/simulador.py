@@ -0,0 +1,163 @@
+"""
+Simulador de eventos discretos de um dia de pronto-socorro.
+
+Gera chegadas de pacientes por um processo de Poisson com taxa variável ao longo do dia e uma
+mistura de riscos realista, e conduz o ProntoSocorroService como em produção: registra o paciente
+(ou reaproveita o cadastro de quem retorna), classifica o risco, registra o atendimento, insere na
+fila e chama o próximo quando um médico fica livre. O relógio simulado avança de evento em evento,
+portanto 24 horas simuladas levam apenas o tempo de processamento das operações.
+
+O resultado traz a latência real das operações do serviço e as esperas simuladas por nível de risco.
+
+Uso: python -m bench.simulador [escala] [horas] [semente]
+"""
+import heapq
+import itertools
+import random
+import sys
+import time
+
+from bench.common import gerar_cpf
+from main.domain import FichaAnalise, FilaAtendimentoMultinivel, Risco
+from main.metrics import HistogramaLog
+from main.repository import PacienteRepository, AtendimentoRepository
+from main.service import ProntoSocorroService
+
+ESCALA = 100
+HORAS = 24
+SEMENTE = 42
+
+# Volume de referência de um pronto-socorro de porte médio, antes da escala.
+CHEGADAS_POR_DIA = 300
+MEDICOS = 6
+RETORNO = 0.2
+
+# Distribuição das chegadas ao longo do dia (peso relativo de cada hora, 0h a 23h).
+PERFIL_HORARIO = (0.4, 0.3, 0.25, 0.2, 0.2, 0.3, 0.6, 1.0, 1.4, 1.6, 1.6, 1.5,
+                  1.4, 1.4, 1.5, 1.5, 1.4, 1.3, 1.3, 1.2, 1.0, 0.8, 0.6, 0.5)
+
+# Proporção de cada nível de risco e ficha de triagem que leva a ele.
+MISTURA_RISCO = (
+    (Risco.VERMELHO, 0.01, FichaAnalise(True, False, False, False)),
+    (Risco.LARANJA, 0.09, FichaAnalise(False, True, False, False)),
+    (Risco.AMARELO, 0.30, FichaAnalise(False, False, True, False)),
+    (Risco.VERDE, 0.45, FichaAnalise(False, False, False, True)),
+    (Risco.AZUL, 0.15, FichaAnalise(False, False, False, False)),
+)
+
+# Duração média do atendimento médico por nível de risco, em minutos.
+DURACAO_MEDIA = {Risco.VERMELHO: 90, Risco.LARANJA: 45, Risco.AMARELO: 30, Risco.VERDE: 15, Risco.AZUL: 10}
+
+CHEGADA, FIM = 0, 1
+OPERACOES = ("registrar_paciente", "classificar_risco", "registrar_atendimento", "inserir_fila_atendimento",
+             "chamar_proximo")
+
+
+class Simulador:
+    """
+    Simulação de um dia de pronto-socorro com `escala` vezes o volume de referência.
+
+    O número de médicos acompanha a escala, de modo que a ocupação média é a mesma do cenário de
+    referência. A sequência de eventos depende apenas da semente.
+    """
+    def __init__(self, escala: int = ESCALA, horas: int = HORAS, semente: int = SEMENTE):
+        self.escala = escala
+        self.horas = horas
+        self.aleatorio = random.Random(semente)
+        pacientes = PacienteRepository()
+        self.servico = ProntoSocorroService(pacientes, AtendimentoRepository(pacientes), FilaAtendimentoMultinivel())
+        self.medicos_livres = MEDICOS * escala
+        self.eventos = []
+        self.sequencia = itertools.count()
+        self.cadastrados = []
+        self.chegada = {}
+        self.latencias = {operacao: HistogramaLog() for operacao in OPERACOES}
+        self.esperas = {risco: HistogramaLog() for risco in Risco}
+        self.maior_fila = 0
+
+    def _agendar(self, minuto: float, tipo: int, dados=None):
+        heapq.heappush(self.eventos, (minuto, next(self.sequencia), tipo, dados))
+
+    def _medir(self, operacao: str, funcao, *argumentos):
+        inicio = time.perf_counter_ns()
+        resultado = funcao(*argumentos)
+        self.latencias[operacao].registrar(time.perf_counter_ns() - inicio)
+        return resultado
+
+    def _gerar_chegadas(self):
+        """Gera as chegadas de cada hora por um processo de Poisson com a taxa daquela hora."""
+        peso_total = sum(PERFIL_HORARIO)
+        riscos = [ficha for _, _, ficha in MISTURA_RISCO]
+        pesos = [proporcao for _, proporcao, _ in MISTURA_RISCO]
+        for hora in range(self.horas):
+            taxa = CHEGADAS_POR_DIA * self.escala * PERFIL_HORARIO[hora % 24] / peso_total / 60
+            minuto = hora * 60 + self.aleatorio.expovariate(taxa)
+            while minuto < (hora + 1) * 60:
+                self._agendar(minuto, CHEGADA, self.aleatorio.choices(riscos, pesos)[0])
+                minuto += self.aleatorio.expovariate(taxa)
+
+    def _chegar(self, minuto: float, ficha: FichaAnalise):
+        if self.cadastrados and self.aleatorio.random() < RETORNO:
+            paciente = self.aleatorio.choice(self.cadastrados)
+        else:
+            paciente = self._medir("registrar_paciente", self.servico.registrar_paciente, "Paciente Simulado",
+                                   gerar_cpf(len(self.cadastrados)), "paciente@teste.com", "01/01/1980")
+            self.cadastrados.append(paciente)
+        risco = self._medir("classificar_risco", self.servico.classificar_risco, ficha)
+        atendimento = self._medir("registrar_atendimento", self.servico.registrar_atendimento, paciente, risco)
+        self._medir("inserir_fila_atendimento", self.servico.inserir_fila_atendimento, atendimento)
+        self.chegada[id(atendimento)] = minuto
+        self.maior_fila = max(self.maior_fila, self.servico.fila_atendimento.tamanho())
+
+    def _chamar(self, minuto: float):
+        while self.medicos_livres and self.servico.fila_atendimento.possui_proximo():
+            atendimento = self._medir("chamar_proximo", self.servico.chamar_proximo)
+            self.medicos_livres -= 1
+            espera = minuto - self.chegada.pop(id(atendimento))
+            self.esperas[atendimento.risco].registrar(round(espera * 60))
+            duracao = self.aleatorio.expovariate(1 / DURACAO_MEDIA[atendimento.risco])
+            self._agendar(minuto + duracao, FIM)
+
+    def executar(self) -> dict:
+        self._gerar_chegadas()
+        chegadas = len(self.eventos)
+        inicio = time.perf_counter()
+        while self.eventos:
+            minuto, _, tipo, dados = heapq.heappop(self.eventos)
+            if tipo == CHEGADA:
+                self._chegar(minuto, dados)
+            else:
+                self.medicos_livres += 1
+            self._chamar(minuto)
+        segundos = time.perf_counter() - inicio
+
+        operacoes = sum(histograma.total for histograma in self.latencias.values())
+        return {
+            "chegadas": chegadas,
+            "pacientes": len(self.cadastrados),
+            "segundos": segundos,
+            "operacoes_por_segundo": operacoes / segundos,
+            "maior_fila": self.maior_fila,
+            "latencia_ns": {operacao: {"p50": h.quantil(0.5), "p99": h.quantil(0.99)}
+                            for operacao, h in self.latencias.items()},
+            "espera_minutos": {risco.name: {"p50": h.quantil(0.5) / 60, "p95": h.quantil(0.95) / 60}
+                               for risco, h in self.esperas.items() if h.total},
+        }
+
+
+def executar(escala, horas, semente):
+    resultado = Simulador(escala, horas, semente).executar()
+    print(f"{resultado['chegadas']:,} chegadas ({resultado['pacientes']:,} pacientes) em {horas}h simuladas, "
+          f"processadas em {resultado['segundos']:.2f}s ({resultado['operacoes_por_segundo']:,.0f} operações/s)")
+    print(f"maior fila: {resultado['maior_fila']:,}")
+    print(f"{'operação':>26} {'p50 (ns)':>10} {'p99 (ns)':>10}")
+    for operacao, latencia in resultado["latencia_ns"].items():
+        print(f"{operacao:>26} {latencia['p50']:>10.0f} {latencia['p99']:>10.0f}")
+    print(f"{'risco':>26} {'espera p50 (min)':>17} {'espera p95 (min)':>17}")
+    for risco, espera in resultado["espera_minutos"].items():
+        print(f"{risco:>26} {espera['p50']:>17.1f} {espera['p95']:>17.1f}")
+
+
+if __name__ == '__main__':
+    argumentos = [int(a) for a in sys.argv[1:]]
+    executar(*(argumentos + [ESCALA, HORAS, SEMENTE][len(argumentos):]))
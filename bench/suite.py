@@ -0,0 +1,127 @@
+"""
+Suíte de benchmarks reprodutível: micro-benchmarks das operações principais, o simulador de um
+dia de pronto-socorro (bench.simulador) e o tempo de importação na inicialização
+(bench.bench_inicializacao).
+
+Os resultados (tempo por operação, em nanossegundos) são gravados em JSON. Com --base, cada
+resultado é comparado ao de uma execução anterior e os que ficaram mais lentos que a tolerância são
+marcados como regressão; nesse caso o comando termina com código 1.
+
+Uso: python -m bench.suite [--saida resultados.json] [--base baseline.json] [--tolerancia 0.1] [--rapido]
+"""
+import argparse
+import itertools
+import json
+import platform
+import random
+import sys
+from datetime import datetime, timedelta
+
+from bench.bench_inicializacao import medir_importacao
+from bench.common import gerar_cpf, medir
+from bench.simulador import Simulador
+from main.domain import Atendimento, FichaAnalise, FilaAtendimento, Paciente, Risco
+from main.repository import PacienteRepository, AtendimentoRepository
+from main.service import ProntoSocorroService
+
+TAMANHO = 100_000
+TAMANHO_RAPIDO = 10_000
+RODADAS = 5
+ATENDIMENTOS_POR_PACIENTE = 10
+TOLERANCIA = 0.1
+SEMENTE = 42
+
+
+def melhor(funcao, repeticoes: int) -> float:
+    """Menor tempo médio por chamada (ns) entre RODADAS medições, para reduzir o ruído."""
+    return min(medir(funcao, repeticoes) for _ in range(RODADAS))
+
+def micro_benchmarks(tamanho: int) -> dict:
+    aleatorio = random.Random(SEMENTE)
+    cpfs = [gerar_cpf(i) for i in range(tamanho)]
+    riscos = list(Risco)
+    resultados = {}
+
+    dados = itertools.cycle([("Paciente Teste", cpf, "p@teste.com", "01/01/1990") for cpf in cpfs])
+    resultados["paciente_construcao"] = melhor(lambda: Paciente(*next(dados)), tamanho)
+
+    pacientes = PacienteRepository()
+    for cpf in cpfs:
+        pacientes.inserir(Paciente("Paciente Teste", cpf, "p@teste.com", "01/01/1990"))
+    buscas = itertools.cycle([aleatorio.choice(cpfs) for _ in range(tamanho)])
+    resultados["paciente_buscar"] = melhor(lambda: pacientes.buscar(next(buscas)), tamanho)
+
+    atendimentos = AtendimentoRepository(pacientes)
+    base = datetime(2024, 1, 1)
+    quantidade_pacientes = tamanho // ATENDIMENTOS_POR_PACIENTE
+    for i in range(tamanho):
+        paciente = pacientes.buscar(cpfs[i % quantidade_pacientes])
+        atendimentos.inserir(Atendimento(paciente, aleatorio.choice(riscos), base + timedelta(minutes=i)))
+    historicos = itertools.cycle([cpfs[aleatorio.randrange(quantidade_pacientes)] for _ in range(tamanho)])
+    resultados["historico_atendimentos"] = melhor(lambda: atendimentos.historico_atendimentos(next(historicos)),
+                                                  tamanho // 10)
+
+    fila_atendimentos = [Atendimento(pacientes.buscar(cpf), aleatorio.choice(riscos), base) for cpf in cpfs]
+    tempos_inserir, tempos_proximo = [], []
+    for _ in range(RODADAS):
+        fila = FilaAtendimento()
+        proximos = iter(fila_atendimentos)
+        tempos_inserir.append(medir(lambda: fila.inserir(next(proximos)), tamanho))
+        tempos_proximo.append(medir(fila.proximo, tamanho))
+    resultados["fila_inserir"] = min(tempos_inserir)
+    resultados["fila_proximo"] = min(tempos_proximo)
+
+    servico = ProntoSocorroService(pacientes, atendimentos)
+    fichas = itertools.cycle([FichaAnalise(*valores) for valores in itertools.product([False, True], repeat=4)])
+    resultados["classificar_risco"] = melhor(lambda: servico.classificar_risco(next(fichas)), tamanho)
+    return resultados
+
+def simulacao(escala: int) -> dict:
+    resultado = Simulador(escala).executar()
+    return {f"simulacao_{operacao}_p50": latencia["p50"] for operacao, latencia in resultado["latencia_ns"].items()}
+
+def comparar(resultados: dict, base: dict, tolerancia: float) -> dict:
+    """Compara com a execução de referência; retorna, por benchmark, a variação relativa e se é regressão."""
+    comparacao = {}
+    for nome, valor in resultados.items():
+        if nome in base and base[nome]:
+            variacao = valor / base[nome] - 1
+            comparacao[nome] = {"base": base[nome], "variacao": variacao, "regressao": variacao > tolerancia}
+    return comparacao
+
+def executar(argumentos=None) -> int:
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks do pronto-socorro.")
+    parser.add_argument("--saida", default="bench_resultados.json")
+    parser.add_argument("--base", help="Resultados de referência (JSON gravado por uma execução anterior).")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA,
+                        help="Aumento relativo de tempo tolerado antes de marcar regressão (padrão: 0.1).")
+    parser.add_argument("--rapido", action="store_true", help="Usa volumes menores (para CI).")
+    opcoes = parser.parse_args(argumentos)
+
+    resultados = micro_benchmarks(TAMANHO_RAPIDO if opcoes.rapido else TAMANHO)
+    resultados.update(simulacao(10 if opcoes.rapido else 100))
+    resultados["inicializacao_importacao"] = medir_importacao(5 if opcoes.rapido else 20)["importacao_us"] * 1000
+    relatorio = {"data": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+                 "plataforma": platform.platform(), "rapido": opcoes.rapido, "resultados_ns": resultados}
+
+    comparacao = {}
+    if opcoes.base:
+        with open(opcoes.base, encoding="utf-8") as arquivo:
+            comparacao = comparar(resultados, json.load(arquivo)["resultados_ns"], opcoes.tolerancia)
+        relatorio["comparacao"] = comparacao
+    with open(opcoes.saida, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, indent=2)
+
+    print(f"{'benchmark':>42} {'ns/op':>10} {'base':>10} {'variação':>9}")
+    for nome, valor in resultados.items():
+        linha = f"{nome:>42} {valor:>10.0f}"
+        if nome in comparacao:
+            item = comparacao[nome]
+            linha += f" {item['base']:>10.0f} {item['variacao']:>+9.1%}{'  REGRESSÃO' if item['regressao'] else ''}"
+        print(linha)
+    print(f"resultados gravados em {opcoes.saida}")
+    return 1 if any(item["regressao"] for item in comparacao.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(executar())
@@ -1,10 +1,32 @@
+import sys
+
 from main.cli import TerminalClient
+from main.render import Tela
 from main.repository import PacienteRepository, AtendimentoRepository
 from main.service import ProntoSocorroService
 
+
+def ler_opcoes(argumentos):
+    # O argparse só é importado quando há argumentos: o menu interativo inicia sem ele.
+    if not argumentos:
+        return None
+    import argparse
+    parser = argparse.ArgumentParser(description="Sistema de controle de fila de atendimentos de um pronto-socorro.")
+    parser.add_argument("--lote", metavar="ARQUIVO",
+                        help="Executa os comandos do arquivo (ou da entrada padrão, com -) sem o menu interativo.")
+    return parser.parse_args(argumentos).lote
+
 if __name__ == '__main__':
+    lote = ler_opcoes(sys.argv[1:])
+
     paciente_repo = PacienteRepository()
     atendimento_repo = AtendimentoRepository(paciente_repo)
     ps_service = ProntoSocorroService(paciente_repo, atendimento_repo)
-    cli = TerminalClient(ps_service)
-    cli.executar()
\ No newline at end of file
+    cli = TerminalClient(ps_service, Tela(cores=lote is None or sys.stdout.isatty()))
+    if lote is None:
+        cli.executar()
+    elif lote == "-":
+        sys.exit(1 if cli.executar_lote(sys.stdin) else 0)
+    else:
+        with open(lote, encoding="utf-8") as arquivo:
+            sys.exit(1 if cli.executar_lote(arquivo) else 0)
@@ -0,0 +1,271 @@
+import logging
+import math
+import time
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from main.domain import Atendimento, Risco
+from main.error import ValidacaoError
+from main.repository import normalizar_cpf
+
+PERIODO = 3600
+SEM_ESPERA = math.nan
+EPOCA = datetime(1970, 1, 1)
+# Mesmo layout de main.archive.REGISTRO, para ler o arquivo com numpy.frombuffer.
+TIPO_REGISTRO = [("cpf", "<u8"), ("risco", "u1"), ("entrada", "<f8")]
+
+log = logging.getLogger(__name__)
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+class AnaliseAtendimentos:
+    """
+    Relatórios sobre todos os atendimentos, com os dados em colunas (array): CPF (uint64), risco
+    (uint8), entrada e espera até a chamada (double, em segundos; NaN enquanto não chamado).
+
+    As consultas são agregações sobre as colunas inteiras. Com o NumPy instalado, elas são feitas
+    por operações vetorizadas sobre as próprias colunas (numpy.frombuffer, sem cópia); caso
+    contrário, por laços sobre os arrays, com os mesmos resultados.
+
+    Os atendimentos inseridos aguardam a chamada em `pendentes`, identificados pelo CPF e pela
+    entrada (como os registros do ArquivoAtendimentos), e não pela identidade do objeto: uma cópia
+    do atendimento, como a lida do arquivo, encontra a mesma linha. Cada chave guarda a lista das
+    suas linhas pendentes: atendimentos do mesmo CPF com a mesma entrada (no mesmo microssegundo)
+    não se sobrescrevem, e as esperas são atribuídas na ordem de inserção.
+
+    Três agregados são mantidos a cada inserção e chamada, de modo que os relatórios sobre todo o
+    histórico não percorrem as colunas: visitas por período e risco, visitas por CPF e soma e
+    quantidade de esperas por risco. As consultas com intervalo de datas (ou com outro período)
+    usam as colunas.
+
+    Os períodos são contados no horário local (e não em UTC), para que um relatório diário, por
+    exemplo, vá de meia-noite a meia-noite. O deslocamento de cada entrada é o do fuso horário local
+    naquele instante (com horário de verão), ou um deslocamento fixo informado na criação.
+
+    Attributes:
+        periodo: Tamanho do período (em segundos) dos agregados de visitas por risco.
+        deslocamento: Segundos somados às entradas (UTC) antes de agrupá-las em períodos, ou None
+            para usar o fuso horário local.
+        numpy: Módulo NumPy usado nas consultas, ou None.
+    """
+    def __init__(self, periodo: int = PERIODO, usar_numpy: Optional[bool] = None, relogio=datetime.now,
+                 deslocamento: Optional[float] = None):
+        self.periodo = periodo
+        self.deslocamento = deslocamento
+        self.numpy = _numpy() if usar_numpy is not False else None
+        if usar_numpy and self.numpy is None:
+            raise ValidacaoError("O NumPy não está instalado.")
+        self.relogio = relogio
+        self.cpfs = array("Q")
+        self.riscos = array("B")
+        self.entradas = array("d")
+        self.esperas = array("d")
+        self.pendentes: Dict[Tuple[int, float], List[int]] = {}
+        self.visitas_periodo: Counter = Counter()
+        self.visitas_cpf: Counter = Counter()
+        self.soma_espera = [0.0] * (len(Risco) + 1)
+        self.chamadas = [0] * (len(Risco) + 1)
+
+    def __len__(self):
+        return len(self.cpfs)
+
+    # --- inserção ---
+
+    def inserir(self, atendimento: Atendimento) -> int:
+        """Acrescenta o atendimento às colunas; a espera é preenchida em `registrar_chamada`."""
+        cpf, entrada = chave = self._chave(atendimento)
+        indice = self.inserir_valores(cpf, atendimento.risco.value, entrada)
+        linhas = self.pendentes.setdefault(chave, [])
+        if linhas:
+            log.warning("Atendimentos pendentes do CPF %011d com a mesma entrada (%s); as esperas serão "
+                        "registradas na ordem de inserção.", cpf, atendimento.entrada.isoformat())
+        linhas.append(indice)
+        return indice
+
+    @staticmethod
+    def _chave(atendimento: Atendimento) -> Tuple[int, float]:
+        return int(normalizar_cpf(atendimento.paciente.cpf)), atendimento.entrada.timestamp()
+
+    def _retirar_pendente(self, atendimento: Atendimento) -> Optional[int]:
+        chave = self._chave(atendimento)
+        linhas = self.pendentes.get(chave)
+        if not linhas:
+            return None
+        indice = linhas.pop(0)
+        if not linhas:
+            del self.pendentes[chave]
+        return indice
+
+    def inserir_valores(self, cpf: int, risco: int, entrada: float, espera: float = SEM_ESPERA) -> int:
+        self.cpfs.append(cpf)
+        self.riscos.append(risco)
+        self.entradas.append(entrada)
+        self.esperas.append(espera)
+        self.visitas_periodo[int(self._local(entrada) // self.periodo), risco] += 1
+        self.visitas_cpf[cpf] += 1
+        if espera == espera:
+            self.soma_espera[risco] += espera
+            self.chamadas[risco] += 1
+        return len(self.cpfs) - 1
+
+    def registrar_chamada(self, atendimento: Atendimento, chamada: Optional[datetime] = None):
+        """Registra a espera do atendimento até a chamada (por padrão, agora)."""
+        indice = self._retirar_pendente(atendimento)
+        if indice is None:
+            return
+        espera = ((self.relogio() if chamada is None else chamada) - atendimento.entrada).total_seconds()
+        self.esperas[indice] = espera
+        self.soma_espera[self.riscos[indice]] += espera
+        self.chamadas[self.riscos[indice]] += 1
+
+    def descartar(self, atendimento: Atendimento):
+        """Encerra um atendimento que saiu da fila sem ser chamado: a visita conta, sem espera registrada."""
+        self._retirar_pendente(atendimento)
+
+    def carregar_colunas(self, cpfs: Iterable[int], riscos: Iterable[int], entradas: Iterable[float],
+                         esperas: Optional[Iterable[float]] = None):
+        """Acrescenta vários registros de uma vez (listas, arrays ou arrays NumPy de mesmo tamanho)."""
+        np = self.numpy
+        if np is None:
+            if esperas is None:
+                for cpf, risco, entrada in zip(cpfs, riscos, entradas):
+                    self.inserir_valores(cpf, risco, entrada)
+            else:
+                for valores in zip(cpfs, riscos, entradas, esperas):
+                    self.inserir_valores(*valores)
+            return
+        cpfs = np.ascontiguousarray(cpfs, dtype=np.uint64)
+        riscos = np.ascontiguousarray(riscos, dtype=np.uint8)
+        entradas = np.ascontiguousarray(entradas, dtype=np.float64)
+        esperas = (np.full(len(cpfs), np.nan) if esperas is None
+                   else np.ascontiguousarray(esperas, dtype=np.float64))
+        self.cpfs.frombytes(cpfs.tobytes())
+        self.riscos.frombytes(riscos.tobytes())
+        self.entradas.frombytes(entradas.tobytes())
+        self.esperas.frombytes(esperas.tobytes())
+        chaves, contagens = np.unique((self._locais(entradas) // self.periodo).astype(np.int64) * 8 + riscos,
+                                      return_counts=True)
+        for chave, contagem in zip(chaves.tolist(), contagens.tolist()):
+            self.visitas_periodo[chave // 8, chave % 8] += contagem
+        self.visitas_cpf.update(dict(zip(*(valores.tolist() for valores in np.unique(cpfs, return_counts=True)))))
+        validas = ~np.isnan(esperas)
+        soma = np.bincount(riscos[validas], weights=esperas[validas], minlength=len(self.soma_espera))
+        chamadas = np.bincount(riscos[validas], minlength=len(self.chamadas))
+        for risco in range(len(self.chamadas)):
+            self.soma_espera[risco] += float(soma[risco])
+            self.chamadas[risco] += int(chamadas[risco])
+
+    def carregar_arquivo(self, arquivo):
+        """Acrescenta os registros de um ArquivoAtendimentos (sem espera registrada)."""
+        if self.numpy is None or len(arquivo) == 0:
+            for cpf, risco, entrada in arquivo.varrer():
+                self.inserir_valores(cpf, risco, entrada)
+            return
+        registros = self.numpy.frombuffer(arquivo.dados(), dtype=self.numpy.dtype(TIPO_REGISTRO))
+        self.carregar_colunas(registros["cpf"], registros["risco"], registros["entrada"])
+
+    # --- consultas ---
+
+    def _local(self, entrada: float) -> float:
+        """Entrada (segundos desde a época, UTC) no horário local, para o agrupamento em períodos."""
+        if self.deslocamento is not None:
+            return entrada + self.deslocamento
+        return entrada + time.localtime(entrada).tm_gmtoff
+
+    def _locais(self, entradas):
+        """Como `_local`, para um array NumPy; o deslocamento é obtido uma vez por hora distinta."""
+        np = self.numpy
+        if self.deslocamento is not None:
+            return entradas + self.deslocamento
+        horas, posicoes = np.unique(entradas // 3600, return_inverse=True)
+        deslocamentos = np.array([time.localtime(hora * 3600).tm_gmtoff for hora in horas.tolist()], dtype=np.float64)
+        return entradas + deslocamentos[posicoes.reshape(-1)]
+
+    def _vetorizar(self) -> bool:
+        return self.numpy is not None and len(self.cpfs) > 0
+
+    def _colunas(self, desde: Optional[datetime], ate: Optional[datetime]):
+        """Colunas NumPy (cpfs, riscos, entradas, esperas), filtradas pelo intervalo de entrada."""
+        np = self.numpy
+        colunas = [np.frombuffer(self.cpfs, dtype=np.uint64), np.frombuffer(self.riscos, dtype=np.uint8),
+                   np.frombuffer(self.entradas, dtype=np.float64), np.frombuffer(self.esperas, dtype=np.float64)]
+        if desde is None and ate is None:
+            return colunas
+        entradas = colunas[2]
+        filtro = np.ones(len(entradas), dtype=bool)
+        if desde is not None:
+            filtro &= entradas >= desde.timestamp()
+        if ate is not None:
+            filtro &= entradas <= ate.timestamp()
+        return [coluna[filtro] for coluna in colunas]
+
+    def _registros(self, desde: Optional[datetime], ate: Optional[datetime]):
+        """Percorre (cpf, risco, entrada, espera) no intervalo de entrada, sem NumPy."""
+        registros = zip(self.cpfs, self.riscos, self.entradas, self.esperas)
+        if desde is None and ate is None:
+            return registros
+        inicio = -math.inf if desde is None else desde.timestamp()
+        fim = math.inf if ate is None else ate.timestamp()
+        return (registro for registro in registros if inicio <= registro[2] <= fim)
+
+    def visitas_por_risco(self, periodo: Optional[int] = None, desde: Optional[datetime] = None,
+                          ate: Optional[datetime] = None) -> Dict[Tuple[datetime, Risco], int]:
+        """
+        Quantidade de atendimentos por (início do período no horário local, risco); por padrão,
+        períodos de uma hora.
+        """
+        periodo = self.periodo if periodo is None else periodo
+        if periodo == self.periodo and desde is None and ate is None:
+            contagem = self.visitas_periodo
+        elif not self._vetorizar():
+            contagem = Counter((int(self._local(entrada) // periodo), risco)
+                               for _, risco, entrada, _ in self._registros(desde, ate))
+        else:
+            np = self.numpy
+            _, riscos, entradas, _ = self._colunas(desde, ate)
+            chaves, quantidades = np.unique((self._locais(entradas) // periodo).astype(np.int64) * 8 + riscos,
+                                            return_counts=True)
+            contagem = {(chave // 8, chave % 8): quantidade
+                        for chave, quantidade in zip(chaves.tolist(), quantidades.tolist())}
+        return {(EPOCA + timedelta(seconds=inicio * periodo), Risco(risco)): quantidade
+                for (inicio, risco), quantidade in sorted(contagem.items()) if quantidade}
+
+    def frequentes(self, quantidade: int = 10, minimo: int = 2, desde: Optional[datetime] = None,
+                   ate: Optional[datetime] = None) -> List[Tuple[str, int]]:
+        """Os `quantidade` CPFs com mais atendimentos (pelo menos `minimo`), em ordem decrescente."""
+        if desde is None and ate is None:
+            contagem = self.visitas_cpf
+        elif not self._vetorizar():
+            contagem = Counter(cpf for cpf, _, _, _ in self._registros(desde, ate))
+        else:
+            cpfs = self._colunas(desde, ate)[0]
+            contagem = Counter(dict(zip(*(valores.tolist() for valores in self.numpy.unique(cpfs, return_counts=True)))))
+        return [(f"{cpf:011d}", visitas) for cpf, visitas in contagem.most_common(quantidade) if visitas >= minimo]
+
+    def espera_media(self, desde: Optional[datetime] = None,
+                     ate: Optional[datetime] = None) -> Dict[Risco, Optional[timedelta]]:
+        """Espera média até a chamada por risco (None para riscos sem atendimentos chamados)."""
+        if desde is None and ate is None:
+            soma, chamadas = self.soma_espera, self.chamadas
+        elif not self._vetorizar():
+            soma, chamadas = [0.0] * len(self.soma_espera), [0] * len(self.chamadas)
+            for _, risco, _, espera in self._registros(desde, ate):
+                if espera == espera:
+                    soma[risco] += espera
+                    chamadas[risco] += 1
+        else:
+            np = self.numpy
+            _, riscos, _, esperas = self._colunas(desde, ate)
+            validas = ~np.isnan(esperas)
+            soma = np.bincount(riscos[validas], weights=esperas[validas], minlength=len(self.soma_espera)).tolist()
+            chamadas = np.bincount(riscos[validas], minlength=len(self.chamadas)).tolist()
+        return {risco: timedelta(seconds=soma[risco.value] / chamadas[risco.value]) if chamadas[risco.value] else None
+                for risco in Risco}
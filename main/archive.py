@@ -0,0 +1,279 @@
+import bisect
+import heapq
+import itertools
+import mmap
+import os
+import struct
+from array import array
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from main.domain import Atendimento
+from main.error import PersistenciaError
+from main.repository import normalizar_cpf
+
+CABECALHO = b"PSARQ001"
+# CPF (uint64), risco (uint8) e entrada (double, segundos desde a época Unix): o mesmo registro de
+# 17 bytes do AtendimentoStore, sem alinhamento.
+REGISTRO = struct.Struct("<QBd")
+# Índice de CPF (arquivo <caminho>.idx): cabeçalho e quantidade de registros cobertos (uint64),
+# seguidos das colunas cpf (uint64), entrada (double) e número do registro (uint64), ordenadas
+# por (cpf, entrada, número).
+CABECALHO_INDICE = b"PSIDX001"
+COBERTOS = struct.Struct("<Q")
+INICIO_COLUNAS = len(CABECALHO_INDICE) + COBERTOS.size
+ENTRADA_INDICE = 24
+PENDENTES_INDICE = 65_536
+BLOCO_INDICE = 65_536
+
+
+class ArquivoAtendimentos:
+    """
+    Arquivo de atendimentos concluídos: um arquivo binário, apenas com anexação, de registros de
+    tamanho fixo (REGISTRO), lido por meio de mmap.
+
+    As varreduras percorrem o mapeamento com memoryview e struct.iter_unpack, sem criar objetos
+    Atendimento. O índice de CPF fica em um segundo arquivo (<caminho>.idx), também mapeado, com
+    os números dos registros ordenados por (CPF, entrada): o histórico de um paciente é localizado
+    por busca binária e lido diretamente das posições dos seus registros, sem carregar o índice
+    em memória.
+
+    Os registros anexados depois da última gravação do índice ficam em um índice em memória
+    (arrays por CPF) até serem intercalados ao arquivo do índice por `salvar_indice`, chamado
+    ao fechar e sempre que os pendentes passam de PENDENTES_INDICE ou de 1/8 do índice. Ao
+    abrir, apenas os registros não cobertos pelo índice são lidos; um índice ausente ou inválido
+    é reconstruído. Um registro incompleto no fim do arquivo (escrita interrompida) é descartado.
+
+    Attributes:
+        caminho: Caminho do arquivo.
+        caminho_indice: Caminho do arquivo do índice de CPF.
+        quantidade: Quantidade de registros no arquivo.
+        indexados: Quantidade de registros cobertos pelo arquivo do índice.
+    """
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self.caminho_indice = caminho + ".idx"
+        novo = not os.path.exists(caminho) or os.path.getsize(caminho) == 0
+        self.arquivo = open(caminho, "a+b")
+        if novo:
+            self.arquivo.write(CABECALHO)
+            self.arquivo.flush()
+        self.arquivo.seek(0)
+        if self.arquivo.read(len(CABECALHO)) != CABECALHO:
+            self.arquivo.close()
+            raise PersistenciaError(f"Arquivo de atendimentos inválido: {caminho}")
+        tamanho = os.path.getsize(caminho) - len(CABECALHO)
+        self.quantidade = tamanho // REGISTRO.size
+        if tamanho % REGISTRO.size:
+            self.arquivo.truncate(len(CABECALHO) + self.quantidade * REGISTRO.size)
+        self.mapeados = 0
+        self.mapa = None
+        self.mapa_indice = None
+        self._carregar_indice()
+        self.pendentes_registros: Dict[int, array] = {}
+        self.pendentes_entradas: Dict[int, array] = {}
+        for numero, (cpf, _, entrada) in enumerate(self.varrer(self.indexados), self.indexados):
+            self._indexar(cpf, entrada, numero)
+        if self.quantidade >= self.limite_pendentes:
+            self.salvar_indice()
+
+    @staticmethod
+    def _liberar(mapa: Optional[mmap.mmap]):
+        """
+        Fecha um mapeamento substituído. Se ainda houver leituras em andamento sobre ele (views
+        exportadas), o fechamento fica para quando a última delas o soltar.
+        """
+        if mapa is not None:
+            try:
+                mapa.close()
+            except BufferError:
+                pass
+
+    def _carregar_indice(self):
+        """Mapeia o arquivo do índice; um índice ausente, inválido ou maior que o arquivo é ignorado."""
+        anterior, self.mapa_indice = self.mapa_indice, None
+        self.indexados = 0
+        self.limite_pendentes = PENDENTES_INDICE
+        self.indice_cpfs, self.indice_entradas, self.indice_registros = array("Q"), array("d"), array("Q")
+        self._liberar(anterior)
+        try:
+            with open(self.caminho_indice, "rb") as arquivo:
+                if os.fstat(arquivo.fileno()).st_size < INICIO_COLUNAS:
+                    return
+                mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return
+        indexados = COBERTOS.unpack_from(mapa, len(CABECALHO_INDICE))[0]
+        if (mapa[:len(CABECALHO_INDICE)] != CABECALHO_INDICE or indexados > self.quantidade
+                or len(mapa) != INICIO_COLUNAS + indexados * ENTRADA_INDICE):
+            mapa.close()
+            return
+        dados = memoryview(mapa)
+        cpfs, entradas, registros = (INICIO_COLUNAS + coluna * 8 * indexados for coluna in range(3))
+        self.mapa_indice = mapa
+        self.indice_cpfs = dados[cpfs:entradas].cast("Q")
+        self.indice_entradas = dados[entradas:registros].cast("d")
+        self.indice_registros = dados[registros:registros + 8 * indexados].cast("Q")
+        self.indexados = indexados
+        self.limite_pendentes = indexados + max(PENDENTES_INDICE, indexados // 8)
+
+    def salvar_indice(self):
+        """Intercala os registros pendentes ao arquivo do índice e o grava (substituindo o anterior)."""
+        if self.indexados == self.quantidade:
+            return
+        # O índice só pode cobrir registros que já estão em disco.
+        self.sincronizar()
+        temporario = self.caminho_indice + ".tmp"
+        self._gravar_indice(temporario)
+        os.replace(temporario, self.caminho_indice)
+        self._carregar_indice()
+        self.pendentes_registros.clear()
+        self.pendentes_entradas.clear()
+
+    def _gravar_indice(self, caminho: str):
+        """
+        Grava o índice intercalado em blocos de BLOCO_INDICE entradas, cada coluna na sua posição
+        do arquivo, sem materializar o índice inteiro em memória.
+        """
+        pendentes = sorted((cpf, entrada, numero) for cpf, registros in self.pendentes_registros.items()
+                           for entrada, numero in zip(self.pendentes_entradas[cpf], registros))
+        indexados = zip(self.indice_cpfs, self.indice_entradas, self.indice_registros)
+        intercalados = heapq.merge(indexados, pendentes)
+        posicoes = [INICIO_COLUNAS + coluna * 8 * self.quantidade for coluna in range(3)]
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(CABECALHO_INDICE)
+            arquivo.write(COBERTOS.pack(self.quantidade))
+            while True:
+                colunas = array("Q"), array("d"), array("Q")
+                cpfs, entradas, registros = colunas
+                for cpf, entrada, numero in itertools.islice(intercalados, BLOCO_INDICE):
+                    cpfs.append(cpf)
+                    entradas.append(entrada)
+                    registros.append(numero)
+                if not cpfs:
+                    break
+                for coluna, valores in enumerate(colunas):
+                    arquivo.seek(posicoes[coluna])
+                    valores.tofile(arquivo)
+                    posicoes[coluna] += len(valores) * valores.itemsize
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+
+    def _indexar(self, cpf: int, entrada: float, numero: int):
+        registros = self.pendentes_registros.get(cpf)
+        if registros is None:
+            registros = self.pendentes_registros[cpf] = array("Q")
+            entradas = self.pendentes_entradas[cpf] = array("d")
+        else:
+            entradas = self.pendentes_entradas[cpf]
+        if entradas and entrada < entradas[-1]:
+            posicao = bisect.bisect_right(entradas, entrada)
+            registros.insert(posicao, numero)
+            entradas.insert(posicao, entrada)
+        else:
+            registros.append(numero)
+            entradas.append(entrada)
+
+    def anexar(self, atendimento: Atendimento) -> int:
+        """Acrescenta o atendimento ao fim do arquivo e retorna o número do seu registro."""
+        cpf = int(normalizar_cpf(atendimento.paciente.cpf))
+        entrada = atendimento.entrada.timestamp()
+        self.arquivo.write(REGISTRO.pack(cpf, atendimento.risco.value, entrada))
+        numero = self.quantidade
+        self.quantidade += 1
+        self._indexar(cpf, entrada, numero)
+        if self.quantidade >= self.limite_pendentes:
+            self.salvar_indice()
+        return numero
+
+    def anexar_lote(self, atendimentos: List[Atendimento]):
+        """
+        Acrescenta os atendimentos ao fim do arquivo e os grava em disco: ou todos são gravados, ou
+        nenhum (em caso de erro, o arquivo é truncado de volta e o índice não é alterado).
+        """
+        registros = [(int(normalizar_cpf(atendimento.paciente.cpf)), atendimento.risco.value,
+                      atendimento.entrada.timestamp()) for atendimento in atendimentos]
+        self.arquivo.flush()
+        descritor = self.arquivo.fileno()
+        tamanho = len(CABECALHO) + self.quantidade * REGISTRO.size
+        dados = memoryview(b"".join(REGISTRO.pack(*registro) for registro in registros))
+        try:
+            while dados:
+                dados = dados[os.write(descritor, dados):]
+            os.fsync(descritor)
+        except BaseException:
+            os.ftruncate(descritor, tamanho)
+            raise
+        for cpf, _, entrada in registros:
+            self._indexar(cpf, entrada, self.quantidade)
+            self.quantidade += 1
+        if self.quantidade >= self.limite_pendentes:
+            self.salvar_indice()
+
+    def sincronizar(self):
+        """Grava os registros anexados em disco (flush + fsync)."""
+        self.arquivo.flush()
+        os.fsync(self.arquivo.fileno())
+
+    def dados(self) -> memoryview:
+        """memoryview do mapeamento, refeito quando há registros anexados desde o último."""
+        if self.mapeados != self.quantidade:
+            self.arquivo.flush()
+            anterior, self.mapa = self.mapa, mmap.mmap(self.arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+            self._liberar(anterior)
+            self.mapeados = self.quantidade
+        if self.mapa is None:
+            return memoryview(b"")
+        return memoryview(self.mapa)[len(CABECALHO):len(CABECALHO) + self.quantidade * REGISTRO.size]
+
+    def varrer(self, inicio: int = 0, fim: Optional[int] = None) -> Iterator[Tuple[int, int, float]]:
+        """Percorre os registros [inicio, fim) como tuplas (cpf, risco, entrada), sem cópia dos dados."""
+        if self.quantidade == 0:
+            return iter(())
+        fim = self.quantidade if fim is None else min(fim, self.quantidade)
+        return REGISTRO.iter_unpack(self.dados()[inicio * REGISTRO.size:max(inicio, fim) * REGISTRO.size])
+
+    def registro(self, numero: int) -> Tuple[int, int, float]:
+        return REGISTRO.unpack_from(self.dados(), numero * REGISTRO.size)
+
+    def _intervalos(self, cpf: int, desde: Optional[datetime], ate: Optional[datetime]):
+        """Intervalos [inicio, fim) do paciente no arquivo do índice e nos pendentes."""
+        inicio = bisect.bisect_left(self.indice_cpfs, cpf)
+        fim = bisect.bisect_right(self.indice_cpfs, cpf, inicio)
+        indexados = self._intervalo(self.indice_entradas, inicio, fim, desde, ate)
+        entradas = self.pendentes_entradas.get(cpf, ())
+        return indexados, self._intervalo(entradas, 0, len(entradas), desde, ate)
+
+    @staticmethod
+    def _intervalo(entradas, inicio: int, fim: int, desde: Optional[datetime], ate: Optional[datetime]):
+        primeiro = inicio if desde is None else bisect.bisect_left(entradas, desde.timestamp(), inicio, fim)
+        ultimo = fim if ate is None else bisect.bisect_right(entradas, ate.timestamp(), inicio, fim)
+        return primeiro, max(primeiro, ultimo)
+
+    def contar(self, cpf: str, desde: Optional[datetime] = None, ate: Optional[datetime] = None) -> int:
+        (inicio, fim), (primeiro, ultimo) = self._intervalos(int(normalizar_cpf(cpf)), desde, ate)
+        return fim - inicio + ultimo - primeiro
+
+    def historico(self, cpf: str, desde: Optional[datetime] = None,
+                  ate: Optional[datetime] = None) -> Iterator[Tuple[int, int, float]]:
+        """Percorre, em ordem de entrada, os registros (cpf, risco, entrada) do paciente no intervalo."""
+        cpf = int(normalizar_cpf(cpf))
+        (inicio, fim), (primeiro, ultimo) = self._intervalos(cpf, desde, ate)
+        dados, indice = self.dados(), self.indice_registros
+        indexados = (REGISTRO.unpack_from(dados, indice[posicao] * REGISTRO.size) for posicao in range(inicio, fim))
+        if primeiro == ultimo:
+            return indexados
+        registros = self.pendentes_registros[cpf]
+        pendentes = (REGISTRO.unpack_from(dados, registros[posicao] * REGISTRO.size)
+                     for posicao in range(primeiro, ultimo))
+        return heapq.merge(indexados, pendentes, key=lambda registro: registro[2])
+
+    def __len__(self):
+        return self.quantidade
+
+    def fechar(self):
+        if not self.arquivo.closed:
+            self.salvar_indice()
+            self.arquivo.close()
+        anterior, self.mapa = self.mapa, None
+        self._liberar(anterior)
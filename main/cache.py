@@ -0,0 +1,108 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Set
+
+CAPACIDADE_PACIENTES = 10_000
+CAPACIDADE_HISTORICOS = 1_000
+TTL = 60.0
+
+
+class CacheLRU:
+    """
+    Cache de tamanho limitado com descarte do item usado há mais tempo (LRU) e validade (TTL).
+
+    Opcionalmente, as chaves são agrupadas por `agrupar(chave)`, de modo que todas as entradas de
+    um grupo podem ser invalidadas de uma vez (ex.: todas as páginas do histórico de um CPF).
+
+    Attributes:
+        capacidade: Quantidade máxima de itens.
+        ttl: Validade de cada item em segundos (None para não expirar).
+        acertos, falhas: Buscas encontradas e não encontradas no cache.
+        expirados: Itens encontrados mas descartados por terem expirado (contados também em falhas).
+        descartados: Itens removidos para respeitar a capacidade.
+    """
+    def __init__(self, capacidade: int, ttl: Optional[float] = None, agrupar: Optional[Callable] = None,
+                 relogio: Callable[[], float] = time.monotonic):
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self.agrupar = agrupar
+        self.relogio = relogio
+        self.itens: OrderedDict = OrderedDict()
+        self.grupos: Dict[object, Set] = {}
+        self.acertos = 0
+        self.falhas = 0
+        self.expirados = 0
+        self.descartados = 0
+
+    def obter(self, chave, carregar: Callable):
+        """
+        Retorna o valor em cache ou, se ausente ou expirado, o valor de `carregar(chave)`, guardando-o.
+        None (ex.: paciente não encontrado) não é guardado, para que um cadastro feito diretamente
+        no repositório seja visto na próxima busca, e não só depois do TTL.
+        """
+        item = self.itens.get(chave)
+        if item is not None:
+            valor, validade = item
+            if validade is None or validade > self.relogio():
+                self.itens.move_to_end(chave)
+                self.acertos += 1
+                return valor
+            self.expirados += 1
+            self._retirar(chave)
+        self.falhas += 1
+        valor = carregar(chave)
+        if valor is not None:
+            self.guardar(chave, valor)
+        return valor
+
+    def guardar(self, chave, valor):
+        validade = None if self.ttl is None else self.relogio() + self.ttl
+        if chave in self.itens:
+            self.itens.move_to_end(chave)
+        elif self.agrupar is not None:
+            self.grupos.setdefault(self.agrupar(chave), set()).add(chave)
+        self.itens[chave] = (valor, validade)
+        while len(self.itens) > self.capacidade:
+            self._retirar(next(iter(self.itens)))
+            self.descartados += 1
+
+    def _retirar(self, chave):
+        del self.itens[chave]
+        if self.agrupar is not None:
+            grupo = self.agrupar(chave)
+            chaves = self.grupos[grupo]
+            chaves.discard(chave)
+            if not chaves:
+                del self.grupos[grupo]
+
+    def invalidar(self, chave):
+        if chave in self.itens:
+            self._retirar(chave)
+
+    def invalidar_grupo(self, grupo):
+        for chave in self.grupos.pop(grupo, ()):
+            del self.itens[chave]
+
+    def limpar(self):
+        self.itens.clear()
+        self.grupos.clear()
+
+    def estatisticas(self) -> dict:
+        buscas = self.acertos + self.falhas
+        return {"tamanho": len(self.itens), "acertos": self.acertos, "falhas": self.falhas,
+                "taxa_acerto": self.acertos / buscas if buscas else 0.0,
+                "expirados": self.expirados, "descartados": self.descartados}
+
+class CacheServico:
+    """
+    Caches de leitura do ProntoSocorroService: pacientes por CPF e páginas de histórico de
+    atendimentos (agrupadas por CPF, invalidadas quando um atendimento do paciente é registrado).
+    """
+    def __init__(self, capacidade_pacientes: int = CAPACIDADE_PACIENTES,
+                 capacidade_historicos: int = CAPACIDADE_HISTORICOS, ttl: Optional[float] = TTL,
+                 relogio: Callable[[], float] = time.monotonic):
+        self.pacientes = CacheLRU(capacidade_pacientes, ttl, relogio=relogio)
+        self.historicos = CacheLRU(capacidade_historicos, ttl, agrupar=lambda chave: chave[0], relogio=relogio)
+
+    def estatisticas(self) -> dict:
+        return {"pacientes": self.pacientes.estatisticas(), "historicos": self.historicos.estatisticas()}
@@ -1,100 +1,158 @@
-from main.service import *
-from colorama import Fore, Style
+from main.domain import FichaAnalise
+from main.error import PSBaseError
+from main.render import Tela, formatar_atendimento
+from main.service import ProntoSocorroService
+
+TAMANHO_PAGINA = 20
+PERGUNTAS_TRIAGEM = (
+    "O paciente corre risco de morte? ",
+    "O paciente tem gravidade alta? ",
+    "O paciente tem gravidade moderada? ",
+    "O paciente tem gravidade baixa? ",
+)
+
+
+def resposta_sim(resposta: str) -> bool:
+    return resposta.strip().lower() == "sim"
 
 class TerminalClient:
     """
     Cliente em linha de comando para o sistema de controle de fila de atendimentos de um pronto-socorro.
+
+    A saída de cada tela é montada em uma Tela e escrita de uma só vez, antes de cada pergunta ao
+    usuário e ao final de cada operação. Além do menu interativo, os comandos podem ser lidos de um
+    arquivo (ver `executar_lote`).
     """
-    def __init__(self, ps_service: ProntoSocorroService):
+    def __init__(self, ps_service: ProntoSocorroService, tela: Tela = None, tamanho_pagina: int = TAMANHO_PAGINA):
         self.ps_service = ps_service
+        self.tela = tela if tela is not None else Tela()
+        self.tamanho_pagina = tamanho_pagina
+        self.interativo = True
+
+    def ler(self, pergunta: str) -> str:
+        self.tela.descarregar()
+        return input(pergunta)
 
     def mostrar_menu(self):
-        print("\n--- MENU ---")
-        print("1 - Registrar Paciente")
-        print("2 - Registrar Atendimento")
-        print("3 - Chamar Próximo da Fila")
-        print("4 - Buscar Histórico de Atendimento")
-        print("5 - Sair")
+        self.tela.escrever("\n--- MENU ---")
+        self.tela.escrever("1 - Registrar Paciente")
+        self.tela.escrever("2 - Registrar Atendimento")
+        self.tela.escrever("3 - Chamar Próximo da Fila")
+        self.tela.escrever("4 - Buscar Histórico de Atendimento")
+        self.tela.escrever("5 - Sair")
 
 
     def registrar_paciente(self):
-        print("\n--- REGISTRAR PACIENTE ---")
-        nome = input("Nome: ")
-        cpf = input("CPF (apenas números): ")
-        email = input("E-mail: ")
-        nascimento = input("Data de nascimento (DD/MM/YYYY): ")
-
+        self.tela.escrever("\n--- REGISTRAR PACIENTE ---")
+        nome = self.ler("Nome: ")
+        cpf = self.ler("CPF (apenas números): ")
+        email = self.ler("E-mail: ")
+        nascimento = self.ler("Data de nascimento (DD/MM/YYYY): ")
+        self._registrar_paciente(nome, cpf, email, nascimento)
+        self.tela.descarregar()
+
+    def _registrar_paciente(self, nome, cpf, email, nascimento) -> bool:
         try:
             paciente = self.ps_service.registrar_paciente(nome, cpf, email, nascimento)
-            print(f"\nPaciente registrado com sucesso:\n{paciente}")
+            self.tela.escrever(f"\nPaciente registrado com sucesso:\n{paciente}")
+            return True
         except PSBaseError as e:
-            print(Fore.RED + f"\nErro ao registrar paciente: {e.message}" + Style.RESET_ALL)
+            self.tela.erro(f"\nErro ao registrar paciente: {e.message}")
+            return False
 
 
     def registrar_atendimento(self):
-        print("\n--- REGISTRAR ATENDIMENTO ---")
-        cpf = input("CPF do paciente (apenas números): ")
+        self.tela.escrever("\n--- REGISTRAR ATENDIMENTO ---")
+        cpf = self.ler("CPF do paciente (apenas números): ")
+        self._registrar_atendimento(cpf, self._perguntar_triagem)
+        self.tela.descarregar()
 
+    def _perguntar_triagem(self):
+        self.tela.escrever("\nResponda as perguntas de triagem (Sim ou Não):")
+        return [resposta_sim(self.ler(pergunta)) for pergunta in PERGUNTAS_TRIAGEM]
+
+    def _registrar_atendimento(self, cpf, respostas_triagem) -> bool:
         try:
             # Verifica se o paciente está cadastrado
-            paciente = self.ps_service.pacientes.buscar(cpf)
+            paciente = self.ps_service.buscar_paciente(cpf)
             if paciente is None:
-                print(Fore.RED + "\nPaciente não encontrado." + Style.RESET_ALL)
-                return
+                self.tela.erro("\nPaciente não encontrado.")
+                return False
 
-            # Perguntas para a triagem
-            print("\nResponda as perguntas de triagem (Sim ou Não):")
-            risco_morte = input("O paciente corre risco de morte? ").strip().lower() == "sim"
-            gravidade_alta = input("O paciente tem gravidade alta? ").strip().lower() == "sim"
-            gravidade_moderada = input("O paciente tem gravidade moderada? ").strip().lower() == "sim"
-            gravidade_baixa = input("O paciente tem gravidade baixa? ").strip().lower() == "sim"
-            ficha = FichaAnalise(risco_morte, gravidade_alta, gravidade_moderada, gravidade_baixa)
-
-            # Classifica o risco
-            risco = self.ps_service.classificar_risco(ficha)
-            print(f"\nClassificação de risco: {risco.name}")
+            # Classifica o risco a partir das respostas da triagem
+            risco = self.ps_service.classificar_risco(FichaAnalise(*respostas_triagem()))
+            self.tela.escrever(f"\nClassificação de risco: {risco.name}")
 
             # Registra o atendimento e insere na fila
             atendimento = self.ps_service.registrar_atendimento(paciente, risco)
             self.ps_service.inserir_fila_atendimento(atendimento)
-            print(f"\nAtendimento registrado e inserido na fila:\n{atendimento}")
+            self.tela.escrever(f"\nAtendimento registrado e inserido na fila:\n{formatar_atendimento(atendimento)}")
+            return True
         except PSBaseError as e:
-            print(Fore.RED + f"\nErro ao registrar atendimento: {e.message}" + Style.RESET_ALL)
+            self.tela.erro(f"\nErro ao registrar atendimento: {e.message}")
+            return False
 
 
     def chamar_proximo(self):
-        print("\n--- CHAMAR PRÓXIMO DA FILA ---")
+        self.tela.escrever("\n--- CHAMAR PRÓXIMO DA FILA ---")
+        self._chamar_proximo()
+        self.tela.descarregar()
+
+    def _chamar_proximo(self) -> bool:
         try:
             proximo = self.ps_service.chamar_proximo()
-            print(f"\nPróximo Paciente:\n{proximo}")
+            self.tela.escrever(f"\nPróximo Paciente:\n{formatar_atendimento(proximo)}")
+            return True
         except PSBaseError as e:
-            print(Fore.RED + f"\nErro ao chamar próximo: {e.message}" + Style.RESET_ALL)
+            self.tela.erro(f"\nErro ao chamar próximo: {e.message}")
+            return False
 
 
     def buscar_historico(self):
-        print("\n--- BUSCAR HISTÓRICO DE ATENDIMENTO ---")
-        cpf = input("CPF do paciente (apenas números): ")
+        self.tela.escrever("\n--- BUSCAR HISTÓRICO DE ATENDIMENTO ---")
+        cpf = self.ler("CPF do paciente (apenas números): ")
+        self._buscar_historico(cpf)
+        self.tela.descarregar()
+
+    def _paginas_historico(self, paciente):
+        """Busca o histórico uma página por vez, apenas quando a página for exibida."""
+        inicio = 0
+        while True:
+            pagina = self.ps_service.buscar_historico(paciente, inicio=inicio, limite=self.tamanho_pagina)
+            if pagina:
+                yield pagina
+            if len(pagina) < self.tamanho_pagina:
+                return
+            inicio += len(pagina)
 
+    def _buscar_historico(self, cpf) -> bool:
         try:
             # Verifica se o paciente está cadastrado
-            paciente = self.ps_service.pacientes.buscar(cpf)
+            paciente = self.ps_service.buscar_paciente(cpf)
             if paciente is None:
-                print(Fore.RED + "\nPaciente não encontrado." + Style.RESET_ALL)
-                return
-
-            # Busca o histórico
-            historico = self.ps_service.buscar_historico(paciente)
-            print(f"\nHistórico de atendimentos para {paciente.nome}:")
-            for atendimento in historico:
-                print(atendimento)
+                self.tela.erro("\nPaciente não encontrado.")
+                return False
+
+            self.tela.escrever(f"\nHistórico de atendimentos para {paciente.nome}:")
+            for pagina in self._paginas_historico(paciente):
+                for atendimento in pagina:
+                    self.tela.escrever(formatar_atendimento(atendimento))
+                if len(pagina) < self.tamanho_pagina:
+                    break
+                if not self.interativo:
+                    self.tela.descarregar()
+                elif not resposta_sim(self.ler("\nExibir mais atendimentos? (Sim ou Não) ")):
+                    break
+            return True
         except PSBaseError as e:
-            print(Fore.RED + f"\nErro ao buscar histórico: {e.message}" + Style.RESET_ALL)
+            self.tela.erro(f"\nErro ao buscar histórico: {e.message}")
+            return False
 
     def executar(self):
         # Inicializa o cliente do serviço do pronto-socorro
         while True:
             self.mostrar_menu()
-            opcao = input("\nEscolha uma opção: ")
+            opcao = self.ler("\nEscolha uma opção: ")
 
             if opcao == "1":
                 self.registrar_paciente()
@@ -105,7 +163,55 @@ class TerminalClient:
             elif opcao == "4":
                 self.buscar_historico()
             elif opcao == "5":
-                print("\nSaindo do sistema...")
+                self.tela.escrever("\nSaindo do sistema...")
+                self.tela.descarregar()
                 break
             else:
-                print(Fore.RED + "\nOpção inválida, tente novamente." + Style.RESET_ALL)
+                self.tela.erro("\nOpção inválida, tente novamente.")
+
+    def executar_lote(self, linhas) -> int:
+        """
+        Executa comandos lidos de um arquivo (ou da entrada padrão), um por linha, sem perguntas.
+
+        Comandos (argumentos com espaços entre aspas; linhas iniciadas por # são ignoradas):
+            paciente NOME CPF EMAIL NASCIMENTO
+            atendimento CPF RISCO_MORTE GRAVIDADE_ALTA GRAVIDADE_MODERADA GRAVIDADE_BAIXA  (sim/não)
+            proximo
+            historico CPF
+
+        Returns:
+            A quantidade de comandos que falharam.
+        """
+        comandos = {
+            "paciente": (4, self._registrar_paciente),
+            "atendimento": (5, lambda cpf, *respostas: self._registrar_atendimento(
+                cpf, lambda: [resposta_sim(r) for r in respostas])),
+            "proximo": (0, self._chamar_proximo),
+            "historico": (1, self._buscar_historico),
+        }
+        self.interativo = False
+        erros = 0
+        for numero, linha in enumerate(linhas, 1):
+            if not self._executar_linha(comandos, numero, linha):
+                erros += 1
+            self.tela.descarregar()
+        return erros
+
+    def _executar_linha(self, comandos, numero: int, linha: str) -> bool:
+        import shlex  # usado só no modo em lote, fora da inicialização do menu interativo
+        try:
+            partes = shlex.split(linha, comments=True)
+        except ValueError as e:
+            self.tela.erro(f"\nLinha {numero}: {e}")
+            return False
+        if not partes:
+            return True
+        comando, *argumentos = partes
+        if comando not in comandos:
+            self.tela.erro(f"\nLinha {numero}: comando desconhecido: {comando}")
+            return False
+        quantidade, operacao = comandos[comando]
+        if len(argumentos) != quantidade:
+            self.tela.erro(f"\nLinha {numero}: o comando {comando} espera {quantidade} argumento(s).")
+            return False
+        return operacao(*argumentos)
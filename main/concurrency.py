@@ -0,0 +1,138 @@
+import bisect
+import threading
+from collections import deque
+
+from main.domain import Atendimento, Risco
+from main.error import FilaError, FilaVaziaError, PacienteNaoCadastradoError
+from main.repository import PacienteRepository, AtendimentoRepository, normalizar_cpf
+
+
+class FilaAtendimentoConcorrente:
+    """
+    Fila de atendimento segura para uso por várias threads (vários guichês chamando ao mesmo tempo).
+
+    Assim como a FilaAtendimentoMultinivel, possui uma fila FIFO por nível de risco, mas cada nível
+    tem o seu próprio lock, de modo que operações em níveis diferentes não disputam entre si.
+    Cada atendimento é entregue exatamente uma vez: a posse de uma entrada é decidida pela remoção
+    atômica do dicionário `entradas`, tanto em `proximo` quanto em `remover`.
+
+    A ordem de prioridade vale para as operações já concluídas; um atendimento inserido em um nível
+    mais alto durante uma chamada de `proximo` concorrente pode ser atendido na chamada seguinte.
+    """
+    def __init__(self):
+        self.niveis = {risco: deque() for risco in Risco}
+        self.travas = {risco: threading.Lock() for risco in Risco}
+        self.contagem = {risco: 0 for risco in Risco}
+        self.entradas = {}
+
+    def inserir(self, atendimento: Atendimento):
+        risco = atendimento.risco
+        entrada = [atendimento, risco]
+        if self.entradas.setdefault(id(atendimento), entrada) is not entrada:
+            raise FilaError('Atendimento já está na fila')
+        with self.travas[risco]:
+            self.niveis[risco].append(entrada)
+            self.contagem[risco] += 1
+
+    def remover(self, atendimento: Atendimento):
+        """Retira da fila um atendimento que ainda não foi chamado (ex.: paciente desistiu)."""
+        entrada = self.entradas.pop(id(atendimento), None)
+        if entrada is None:
+            raise FilaError('Atendimento não está na fila')
+        risco = entrada[1]
+        with self.travas[risco]:
+            entrada[0] = None
+            self.contagem[risco] -= 1
+
+    def reclassificar(self, atendimento: Atendimento, risco: Risco):
+        """Altera o risco de um atendimento; ele vai para o fim da fila do novo nível."""
+        self.remover(atendimento)
+        atendimento.risco = risco
+        self.inserir(atendimento)
+
+    def _retirar(self, risco: Risco):
+        with self.travas[risco]:
+            nivel = self.niveis[risco]
+            while nivel:
+                entrada = nivel.popleft()
+                atendimento = entrada[0]
+                if atendimento is not None and self.entradas.pop(id(atendimento), None) is entrada:
+                    self.contagem[risco] -= 1
+                    return atendimento
+        return None
+
+    def proximo(self, risco: Risco = None):
+        """Retira o próximo atendimento da fila ou, se `risco` for informado, o primeiro daquele nível."""
+        for nivel in (Risco if risco is None else (risco,)):
+            atendimento = self._retirar(nivel)
+            if atendimento is not None:
+                return atendimento
+        raise FilaVaziaError('Não tem nenhum paciente na fila de atendimento')
+
+    def espiar(self, risco: Risco = None):
+        """Retorna o próximo atendimento (da fila ou do nível `risco`) sem retirá-lo da fila."""
+        for nivel in (Risco if risco is None else (risco,)):
+            with self.travas[nivel]:
+                for entrada in self.niveis[nivel]:
+                    if entrada[0] is not None:
+                        return entrada[0]
+        raise FilaVaziaError('Não tem nenhum paciente na fila de atendimento')
+
+    def niveis_ocupados(self):
+        return [risco for risco in Risco if self.contagem[risco] > 0]
+
+    def possui_proximo(self):
+        return len(self.entradas) > 0
+
+    def tamanho(self, risco: Risco = None):
+        if risco is not None:
+            return self.contagem[risco]
+        return len(self.entradas)
+
+class PacienteRepositoryConcorrente(PacienteRepository):
+    """
+    PacienteRepository seguro para várias threads: as inserções são serializadas por um lock (o
+    que garante a unicidade do CPF) e as buscas são feitas sem lock, exceto a cópia das chaves do
+    índice de nomes feita pela busca por prefixo curto, que não pode percorrer o dicionário
+    enquanto uma inserção acrescenta chaves.
+    """
+    def __init__(self):
+        super().__init__()
+        self.trava = threading.Lock()
+
+    def inserir(self, paciente):
+        with self.trava:
+            super().inserir(paciente)
+
+    def _itens_indice_nome(self):
+        with self.trava:
+            return list(self.indice_nome.items())
+
+class AtendimentoRepositoryConcorrente(AtendimentoRepository):
+    """
+    AtendimentoRepository seguro para várias threads.
+
+    As inserções são serializadas por um lock. O histórico de cada paciente é atualizado por
+    cópia (read-copy-update): a inserção monta novas listas e publica o par (entradas, histórico)
+    com uma única atribuição, de modo que as leituras de histórico não usam lock e sempre
+    enxergam uma versão consistente.
+    """
+    def __init__(self, paciente_repository: PacienteRepository):
+        super().__init__(paciente_repository)
+        self.trava = threading.Lock()
+        self.versoes = {}
+
+    def inserir(self, atendimento: Atendimento):
+        if self.paciente_repository.buscar(atendimento.paciente.cpf) == None:
+            raise PacienteNaoCadastradoError('Paciente não cadastrado')
+        cpf = normalizar_cpf(atendimento.paciente.cpf)
+        with self.trava:
+            self.atendimentos.append(atendimento)
+            entradas, historico = self._indice(cpf)
+            posicao = bisect.bisect_right(entradas, atendimento.entrada)
+            entradas = entradas[:posicao] + [atendimento.entrada] + entradas[posicao:]
+            historico = historico[:posicao] + [atendimento] + historico[posicao:]
+            self.versoes[cpf] = (entradas, historico)
+
+    def _indice(self, cpf: str):
+        return self.versoes.get(cpf, ([], []))
@@ -1,13 +1,15 @@
 import heapq
-import re
-from dataclasses import dataclass
-from datetime import datetime
+import itertools
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from enum import Enum
 
-from main.error import *
+from main import validation
+from main.error import FilaError, FilaVaziaError
 
 
-@dataclass
+@dataclass(slots=True)
 class Paciente:
     """
     Representa um paciente no sistema.
@@ -27,33 +29,19 @@ class Paciente:
         self.validar_nome(self.nome)
         self.validar_cpf(self.cpf)
         self.validar_email(self.email)
+        self.validar_nascimento(self.nascimento)
 
     def validar_nome(self, nome: str) -> str:
-        if not nome or not nome.strip():
-            raise ValidacaoError("O nome do paciente é obrigatório.")
-        if not re.match(r"^[a-zA-ZÀ-ú\s]+$", nome):
-            raise ValidacaoError("O nome do paciente contém caracteres inválidos.")
-        return nome.strip()
+        return validation.validar_nome(nome)
 
     def validar_cpf(self, cpf: str) -> str:
-        cpf = re.sub(r"[^0-9]", "", cpf)  # Remove caracteres não numéricos
-        if not cpf.isdigit():
-            raise ValidacaoError("CPF inválido, deve conter 11 dígitos numéricos.")
-        return cpf
+        return validation.validar_cpf(cpf)
 
     def validar_email(self, email: str) -> str:
-        if not re.match(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$", email):
-            raise ValidacaoError("E-mail inválido.")
-        return email
+        return validation.validar_email(email)
 
     def validar_nascimento(self, nascimento: str) -> str:
-        try:
-            data = datetime.strptime(nascimento, "%d/%m/%Y")
-            if data > datetime.now():
-                raise ValidacaoError("A data de nascimento não pode ser futura.")
-            return nascimento
-        except ValueError:
-            raise ValidacaoError("Data de nascimento inválida, use o formato DD/MM/YYYY.")
+        return validation.validar_nascimento(nascimento)
 
     def __str__(self):
         return f'Paciente: {self.nome} ({self.cpf})'
@@ -75,7 +63,24 @@ class Risco(Enum):
     VERDE    = 4
     AZUL     = 5
 
-@dataclass
+TEMPO_MAXIMO_ESPERA = {
+    Risco.VERMELHO: timedelta(minutes=0),
+    Risco.LARANJA:  timedelta(minutes=10),
+    Risco.AMARELO:  timedelta(minutes=60),
+    Risco.VERDE:    timedelta(minutes=120),
+    Risco.AZUL:     timedelta(minutes=240),
+}
+
+# Tipos dos eventos publicados pelo ProntoSocorroService (ver main.events). Ficam aqui para que o
+# serviço não precise importar o barramento quando os eventos não são usados.
+PACIENTE_REGISTRADO = "paciente_registrado"
+ATENDIMENTO_REGISTRADO = "atendimento_registrado"
+FILA_INSERIDO = "fila_inserido"
+FILA_REMOVIDO = "fila_removido"
+RISCO_RECLASSIFICADO = "risco_reclassificado"
+PACIENTE_CHAMADO = "paciente_chamado"
+
+@dataclass(slots=True)
 class FichaAnalise:
     """
     Representa a ficha de análise de um paciente durante a triagem.
@@ -91,7 +96,7 @@ class FichaAnalise:
     gravidade_moderada: bool
     gravidade_baixa: bool
 
-@dataclass
+@dataclass(slots=True)
 class Atendimento:
     """
     Representa um atendimento de um paciente no pronto-socorro.
@@ -103,7 +108,7 @@ class Atendimento:
     """
     paciente: Paciente
     risco: Risco
-    entrada: datetime = datetime.now()
+    entrada: datetime = field(default_factory=datetime.now)
 
     def __str__(self):
         return f"Atendimento:\nPaciente: {self.paciente}\nRisco: {self.risco.name}\nEntrada: {self.entrada.strftime('%d/%m/%Y %X')}"
@@ -111,21 +116,156 @@ class Atendimento:
 class FilaAtendimento:
     """
     Gerencia a fila de atendimento dos pacientes, priorizando por nível de risco.
+
+    Atendimentos com o mesmo risco são chamados por ordem de chegada: cada entrada do heap carrega
+    um número de sequência crescente como critério de desempate, seguido de um contador que nunca
+    se repete (uma entrada reclassificada mantém a sua sequência de chegada, e o contador a
+    distingue da entrada removida que ainda está no heap). A remoção de um atendimento qualquer é
+    preguiçosa (a entrada é marcada e descartada quando chega ao topo do heap).
     """
     def __init__(self):
         self.fila = []
+        self.entradas = {}
+        self.contagem = {risco: 0 for risco in Risco}
+        self.sequencia = itertools.count()
+        self.desempate = itertools.count()
+        self.removidos = 0
 
     def inserir(self, atendimento: Atendimento):
-        heapq.heappush(self.fila, (atendimento.risco.value, atendimento))
+        self._inserir(atendimento, next(self.sequencia))
+
+    def _inserir(self, atendimento: Atendimento, sequencia: int):
+        if id(atendimento) in self.entradas:
+            raise FilaError('Atendimento já está na fila')
+        entrada = [atendimento.risco.value, sequencia, next(self.desempate), atendimento]
+        self.entradas[id(atendimento)] = entrada
+        self.contagem[atendimento.risco] += 1
+        heapq.heappush(self.fila, entrada)
+
+    def remover(self, atendimento: Atendimento):
+        """Retira da fila um atendimento que ainda não foi chamado (ex.: paciente desistiu)."""
+        entrada = self.entradas.pop(id(atendimento), None)
+        if entrada is None:
+            raise FilaError('Atendimento não está na fila')
+        entrada[3] = None
+        self.contagem[atendimento.risco] -= 1
+        self.removidos += 1
+        if self.removidos > len(self.entradas):
+            self._compactar()
+        return entrada[1]
+
+    def reclassificar(self, atendimento: Atendimento, risco: Risco):
+        """Altera o risco de um atendimento na fila, preservando a sua ordem de chegada."""
+        sequencia = self.remover(atendimento)
+        atendimento.risco = risco
+        self._inserir(atendimento, sequencia)
+
+    def _compactar(self):
+        self.fila = [entrada for entrada in self.fila if entrada[3] is not None]
+        heapq.heapify(self.fila)
+        self.removidos = 0
+
+    def _descartar_removidos(self):
+        while self.fila and self.fila[0][3] is None:
+            heapq.heappop(self.fila)
+            self.removidos -= 1
 
     def proximo(self):
+        self._descartar_removidos()
+        if len(self.fila) == 0:
+            raise FilaVaziaError('Não tem nenhum paciente na fila de atendimento')
+        atendimento = heapq.heappop(self.fila)[3]
+        del self.entradas[id(atendimento)]
+        self.contagem[atendimento.risco] -= 1
+        return atendimento
+
+    def espiar(self):
+        """Retorna o próximo atendimento sem retirá-lo da fila."""
+        self._descartar_removidos()
         if len(self.fila) == 0:
             raise FilaVaziaError('Não tem nenhum paciente na fila de atendimento')
-        return heapq.heappop(self.fila)[1]
+        return self.fila[0][3]
 
     def possui_proximo(self):
-        return len(self.fila) > 0
+        return len(self.entradas) > 0
+
+    def tamanho(self, risco: Risco = None):
+        if risco is not None:
+            return self.contagem[risco]
+        return len(self.entradas)
+
+class FilaAtendimentoMultinivel:
+    """
+    Fila de atendimento com uma fila FIFO por nível de risco.
 
-    def tamanho(self):
-        return len(self.fila)
+    Como o protocolo de Manchester possui apenas cinco níveis, uma máscara de bits indica quais
+    níveis possuem pacientes e o próximo atendimento é obtido em O(1), sem heap. Oferece a mesma
+    interface de FilaAtendimento. Um atendimento reclassificado vai para o fim da fila do novo nível.
+    """
+    def __init__(self):
+        self.niveis = {risco.value: deque() for risco in Risco}
+        self.entradas = {}
+        self.contagem = {risco: 0 for risco in Risco}
+        self.mascara = 0
+
+    def inserir(self, atendimento: Atendimento):
+        if id(atendimento) in self.entradas:
+            raise FilaError('Atendimento já está na fila')
+        entrada = [atendimento]
+        self.entradas[id(atendimento)] = entrada
+        self.niveis[atendimento.risco.value].append(entrada)
+        self.contagem[atendimento.risco] += 1
+        self.mascara |= 1 << atendimento.risco.value
+
+    def remover(self, atendimento: Atendimento):
+        """Retira da fila um atendimento que ainda não foi chamado (ex.: paciente desistiu)."""
+        entrada = self.entradas.pop(id(atendimento), None)
+        if entrada is None:
+            raise FilaError('Atendimento não está na fila')
+        entrada[0] = None
+        self._decrementar(atendimento.risco)
+
+    def reclassificar(self, atendimento: Atendimento, risco: Risco):
+        self.remover(atendimento)
+        atendimento.risco = risco
+        self.inserir(atendimento)
+
+    def _decrementar(self, risco: Risco):
+        self.contagem[risco] -= 1
+        if self.contagem[risco] == 0:
+            self.mascara &= ~(1 << risco.value)
+            self.niveis[risco.value].clear()
+
+    def _primeiro_nivel(self, risco: Risco = None):
+        if risco is not None:
+            mascara = self.mascara & (1 << risco.value)
+        else:
+            mascara = self.mascara
+        if mascara == 0:
+            raise FilaVaziaError('Não tem nenhum paciente na fila de atendimento')
+        nivel = self.niveis[(mascara & -mascara).bit_length() - 1]
+        while nivel[0][0] is None:
+            nivel.popleft()
+        return nivel
+
+    def proximo(self, risco: Risco = None):
+        """Retira o próximo atendimento da fila ou, se `risco` for informado, o primeiro daquele nível."""
+        atendimento = self._primeiro_nivel(risco).popleft()[0]
+        del self.entradas[id(atendimento)]
+        self._decrementar(atendimento.risco)
+        return atendimento
+
+    def espiar(self, risco: Risco = None):
+        """Retorna o próximo atendimento (da fila ou do nível `risco`) sem retirá-lo da fila."""
+        return self._primeiro_nivel(risco)[0][0]
+
+    def niveis_ocupados(self):
+        return [risco for risco in Risco if self.mascara & (1 << risco.value)]
+
+    def possui_proximo(self):
+        return self.mascara != 0
 
+    def tamanho(self, risco: Risco = None):
+        if risco is not None:
+            return self.contagem[risco]
+        return len(self.entradas)
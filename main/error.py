@@ -16,4 +16,20 @@ class CPFDuplicadoError(PSBaseError):
 
 class PacienteNaoCadastradoError(PSBaseError):
     def __init__(self, message: str):
-        self.message = message
\ No newline at end of file
+        self.message = message
+
+class FilaError(PSBaseError):
+    def __init__(self, message: str):
+        self.message = message
+
+class PersistenciaError(PSBaseError):
+    def __init__(self, message: str):
+        self.message = message
+
+class ProtocoloError(PSBaseError):
+    def __init__(self, message: str):
+        self.message = message
+
+class EventoError(PSBaseError):
+    def __init__(self, message: str):
+        self.message = message
@@ -0,0 +1,188 @@
+import time
+from array import array
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from main.domain import Atendimento, Risco
+from main.error import FilaError
+
+ALFA = 0.2
+TAMANHO_INICIAL = 1024
+
+
+class IndiceOrdem:
+    """
+    Posição dos atendimentos de um nível de risco na ordem de chamada.
+
+    Cada atendimento é identificado por um número de ordem crescente; uma árvore de Fenwick sobre
+    os números de ordem (a partir de `base`) conta quantos atendimentos ainda na fila vêm antes de
+    um deles em O(log n). Quando um número de ordem cai fora da árvore, ela é reconstruída em O(n)
+    a partir do menor número de ordem presente.
+
+    Attributes:
+        vivos: Atendimentos na fila por número de ordem.
+    """
+    def __init__(self):
+        self.base = 0
+        self.arvore = array("q", bytes(8 * (TAMANHO_INICIAL + 1)))
+        self.vivos: Dict[int, Atendimento] = {}
+
+    def _somar(self, indice: int, delta: int):
+        arvore = self.arvore
+        indice += 1
+        tamanho = len(arvore)
+        while indice < tamanho:
+            arvore[indice] += delta
+            indice += indice & -indice
+
+    def inserir(self, ordem: int, atendimento: Atendimento):
+        if ordem < self.base or ordem - self.base >= len(self.arvore) - 1:
+            self._reconstruir(ordem)
+        self.vivos[ordem] = atendimento
+        self._somar(ordem - self.base, 1)
+
+    def remover(self, ordem: int):
+        del self.vivos[ordem]
+        self._somar(ordem - self.base, -1)
+
+    def posicao(self, ordem: int) -> int:
+        """Quantidade de atendimentos na fila com número de ordem menor que `ordem`."""
+        arvore = self.arvore
+        indice = ordem - self.base
+        total = 0
+        while indice > 0:
+            total += arvore[indice]
+            indice -= indice & -indice
+        return total
+
+    def _reconstruir(self, ordem: int):
+        base = min(min(self.vivos, default=ordem), ordem)
+        maior = max(max(self.vivos, default=ordem), ordem)
+        tamanho = max(TAMANHO_INICIAL, 1 << (2 * (maior - base + 1)).bit_length())
+        arvore = array("q", bytes(8 * (tamanho + 1)))
+        for vivo in self.vivos:
+            arvore[vivo - base + 1] = 1
+        for indice in range(1, tamanho + 1):
+            pai = indice + (indice & -indice)
+            if pai <= tamanho:
+                arvore[pai] += arvore[indice]
+        self.base = base
+        self.arvore = arvore
+
+class EstimadorEspera:
+    """
+    Estima o tempo de espera de cada atendimento na fila.
+
+    Para cada nível de risco é mantida uma média com decaimento exponencial (peso `alfa` para a
+    observação mais recente) do intervalo entre chamadas daquele nível, contado apenas enquanto o
+    nível tinha pacientes esperando. A espera de um atendimento é estimada como
+    (posição no nível + 1) × intervalo médio do nível, descontado o tempo desde a última chamada.
+    Enquanto um nível não tem chamadas, é usado o intervalo médio entre chamadas de qualquer nível,
+    multiplicado pela quantidade de pacientes à frente nos níveis de maior risco e no próprio nível.
+
+    A posição no nível é obtida de um IndiceOrdem por nível, de modo que cada estimativa custa
+    O(log n). O estimador é atualizado pelo ProntoSocorroService a cada inserção, remoção,
+    reclassificação e chamada.
+
+    Attributes:
+        alfa: Peso da observação mais recente nas médias.
+        preservar_ordem: Se verdadeiro, um atendimento reclassificado mantém a sua ordem de
+            chegada no novo nível (como na FilaAtendimento, o padrão); caso contrário, vai para o fim
+            dele (como na FilaAtendimentoMultinivel).
+        intervalos: Intervalo médio entre chamadas de cada nível, em segundos (None sem chamadas).
+        intervalo_geral: Intervalo médio entre chamadas de qualquer nível, em segundos.
+    """
+    def __init__(self, alfa: float = ALFA, preservar_ordem: bool = True,
+                 tempo: Callable[[], float] = time.monotonic):
+        self.alfa = alfa
+        self.preservar_ordem = preservar_ordem
+        self.tempo = tempo
+        self.indices = {risco: IndiceOrdem() for risco in Risco}
+        self.ordens: Dict[int, int] = {}
+        self.sequencia = 0
+        self.intervalos: Dict[Risco, Optional[float]] = {risco: None for risco in Risco}
+        self.referencias: Dict[Risco, float] = {}
+        self.intervalo_geral: Optional[float] = None
+        self.ultima_chamada: Optional[float] = None
+
+    def _media(self, media: Optional[float], valor: float) -> float:
+        return valor if media is None else media + self.alfa * (valor - media)
+
+    def inserir(self, atendimento: Atendimento, ordem: Optional[int] = None):
+        if ordem is None:
+            ordem = self.sequencia
+            self.sequencia += 1
+        indice = self.indices[atendimento.risco]
+        if not indice.vivos:
+            # O intervalo do nível só conta a partir do momento em que há alguém esperando.
+            self.referencias[atendimento.risco] = self.tempo()
+        self.ordens[id(atendimento)] = ordem
+        indice.inserir(ordem, atendimento)
+
+    def remover(self, atendimento: Atendimento, risco: Optional[Risco] = None) -> int:
+        ordem = self.ordens.pop(id(atendimento), None)
+        if ordem is None:
+            raise FilaError('Atendimento não está na fila')
+        self.indices[atendimento.risco if risco is None else risco].remover(ordem)
+        return ordem
+
+    def reclassificar(self, atendimento: Atendimento, risco_anterior: Risco):
+        """Atualiza o índice depois que o atendimento passou de `risco_anterior` para o risco atual."""
+        ordem = self.remover(atendimento, risco_anterior)
+        self.inserir(atendimento, ordem if self.preservar_ordem else None)
+
+    def registrar_chamada(self, atendimento: Atendimento):
+        agora = self.tempo()
+        risco = atendimento.risco
+        self.remover(atendimento)
+        self.intervalos[risco] = self._media(self.intervalos[risco], agora - self.referencias[risco])
+        self.referencias[risco] = agora
+        if self.ultima_chamada is not None:
+            self.intervalo_geral = self._media(self.intervalo_geral, agora - self.ultima_chamada)
+        self.ultima_chamada = agora
+
+    def _parametros(self, risco: Risco, agora: float) -> Optional[Tuple[float, float]]:
+        """(intervalo, inicio) tais que a espera na posição p do nível é max(0, inicio + p × intervalo)."""
+        intervalo = self.intervalos[risco]
+        if intervalo is not None:
+            return intervalo, intervalo - (agora - self.referencias[risco])
+        if self.intervalo_geral is None:
+            return None
+        frente = 0
+        for nivel in Risco:
+            if nivel is risco:
+                break
+            frente += len(self.indices[nivel].vivos)
+        return self.intervalo_geral, (frente + 1) * self.intervalo_geral - (agora - self.ultima_chamada)
+
+    def estimar(self, atendimento: Atendimento) -> Optional[timedelta]:
+        """Espera estimada do atendimento, ou None se ainda não houve nenhuma chamada."""
+        ordem = self.ordens.get(id(atendimento))
+        if ordem is None:
+            raise FilaError('Atendimento não está na fila')
+        risco = atendimento.risco
+        parametros = self._parametros(risco, self.tempo())
+        if parametros is None:
+            return None
+        intervalo, inicio = parametros
+        return timedelta(seconds=max(0.0, inicio + self.indices[risco].posicao(ordem) * intervalo))
+
+    def estimar_todos(self) -> List[Tuple[Atendimento, Optional[timedelta]]]:
+        """
+        Estimativas de todos os atendimentos na fila, nível a nível e na ordem de chamada, calculadas
+        de uma vez (sem consultar o índice para cada atendimento).
+        """
+        agora = self.tempo()
+        estimativas = []
+        for risco, indice in self.indices.items():
+            if not indice.vivos:
+                continue
+            ordens = sorted(indice.vivos)
+            parametros = self._parametros(risco, agora)
+            if parametros is None:
+                estimativas.extend((indice.vivos[ordem], None) for ordem in ordens)
+                continue
+            intervalo, inicio = parametros
+            estimativas.extend((indice.vivos[ordem], timedelta(seconds=max(0.0, inicio + posicao * intervalo)))
+                               for posicao, ordem in enumerate(ordens))
+        return estimativas
@@ -0,0 +1,174 @@
+import threading
+from typing import Callable, List, NamedTuple, Optional
+
+from main.domain import (ATENDIMENTO_REGISTRADO, FILA_INSERIDO, FILA_REMOVIDO, PACIENTE_CHAMADO,
+                         PACIENTE_REGISTRADO, RISCO_RECLASSIFICADO)
+from main.error import EventoError, ValidacaoError
+
+DESCARTAR = "descartar"
+BLOQUEAR = "bloquear"
+POLITICAS = (DESCARTAR, BLOQUEAR)
+
+
+class Evento(NamedTuple):
+    """
+    Alteração feita pelo ProntoSocorroService. É uma tupla nomeada para que a publicação custe o
+    mínimo possível.
+
+    Attributes:
+        offset: Posição do evento no barramento (crescente, começando em 0).
+        tipo: Tipo do evento (PACIENTE_REGISTRADO, FILA_INSERIDO, PACIENTE_CHAMADO, ...).
+        dados: Objeto alterado (Paciente ou Atendimento).
+    """
+    offset: int
+    tipo: str
+    dados: object
+
+class Assinatura:
+    """
+    Cursor de um consumidor do barramento. Cada assinatura lê os eventos no seu próprio ritmo a
+    partir do seu offset; ver BarramentoEventos para as políticas de consumidores lentos.
+
+    Attributes:
+        offset: Offset do próximo evento a ser lido.
+        politica: DESCARTAR ou BLOQUEAR.
+        perdidos: Eventos descartados antes de serem lidos (política DESCARTAR).
+    """
+    def __init__(self, barramento: "BarramentoEventos", offset: int, politica: str):
+        self.barramento = barramento
+        self.offset = offset
+        self.politica = politica
+        self.perdidos = 0
+
+    def pendentes(self) -> int:
+        return self.barramento.offset - self.offset
+
+    def ler(self, maximo: Optional[int] = None) -> List[Evento]:
+        """Retorna os eventos publicados desde a última leitura (no máximo `maximo`), sem esperar."""
+        barramento = self.barramento
+        fim = barramento.offset
+        if maximo is not None:
+            fim = min(fim, self.offset + maximo)
+        eventos = []
+        while self.offset < fim:
+            evento = barramento.buffer[self.offset % barramento.capacidade]
+            if evento.offset != self.offset:
+                # A posição já foi sobrescrita: o consumidor ficou mais de `capacidade` eventos atrás.
+                primeiro = barramento.primeiro_offset()
+                self.perdidos += primeiro - self.offset
+                self.offset = primeiro
+                fim = max(fim, primeiro)
+                continue
+            eventos.append(evento)
+            self.offset += 1
+        if self.politica == BLOQUEAR and eventos:
+            barramento._liberar_espaco()
+        return eventos
+
+    def aguardar(self, timeout: Optional[float] = None) -> List[Evento]:
+        """Espera até haver eventos novos (ou até `timeout` segundos) e os retorna."""
+        self.barramento._aguardar(self.offset, timeout)
+        return self.ler()
+
+    def processar(self, funcao: Callable[[Evento], None], maximo: Optional[int] = None) -> int:
+        """Chama `funcao` para cada evento pendente e retorna quantos foram processados."""
+        eventos = self.ler(maximo)
+        for evento in eventos:
+            funcao(evento)
+        return len(eventos)
+
+    def cancelar(self):
+        self.barramento.cancelar(self)
+
+class BarramentoEventos:
+    """
+    Barramento de eventos em memória, com um buffer circular de tamanho fixo.
+
+    O serviço publica um Evento a cada alteração. Publicar custa O(1), independentemente do número
+    de assinaturas: os consumidores não são chamados pelo serviço, cada um lê os eventos a partir
+    do seu offset (por exemplo, em uma thread própria com `Assinatura.aguardar`). Um consumidor
+    pode retomar a leitura a partir de um offset salvo, enquanto o evento ainda estiver no buffer.
+
+    Quando um consumidor fica mais de `capacidade` eventos atrás, vale a política da assinatura:
+        DESCARTAR: os eventos mais antigos são descartados para ele (contados em `perdidos`).
+        BLOQUEAR: a publicação espera o consumidor liberar espaço (contrapressão sobre o serviço).
+
+    Deve haver um único publicador (o serviço); as leituras podem ser feitas de outras threads.
+
+    Attributes:
+        capacidade: Quantidade de eventos mantidos no buffer.
+        offset: Offset do próximo evento a ser publicado.
+    """
+    def __init__(self, capacidade: int = 65_536):
+        if capacidade <= 0:
+            raise ValidacaoError("A capacidade do barramento deve ser positiva.")
+        self.capacidade = capacidade
+        self.buffer: List[Optional[Evento]] = [None] * capacidade
+        self.offset = 0
+        self.assinaturas: List[Assinatura] = []
+        self.bloqueantes: List[Assinatura] = []
+        self.condicao = threading.Condition()
+        self.aguardando = 0
+
+    def primeiro_offset(self) -> int:
+        """Offset do evento mais antigo ainda disponível no buffer."""
+        return max(0, self.offset - self.capacidade)
+
+    def assinar(self, desde: Optional[int] = None, politica: str = DESCARTAR) -> Assinatura:
+        """
+        Cria uma assinatura que lê os eventos a partir do offset `desde` (por padrão, apenas os
+        eventos publicados depois da assinatura).
+        """
+        if politica not in POLITICAS:
+            raise ValidacaoError(f"Política de assinatura inválida: {politica}")
+        if desde is None:
+            desde = self.offset
+        elif desde > self.offset:
+            raise EventoError(f"Offset {desde} ainda não foi publicado (último: {self.offset - 1}).")
+        elif desde < self.primeiro_offset() and politica == BLOQUEAR:
+            raise EventoError(f"Offset {desde} não está mais disponível (mais antigo: {self.primeiro_offset()}).")
+        assinatura = Assinatura(self, desde, politica)
+        with self.condicao:
+            self.assinaturas = self.assinaturas + [assinatura]
+            if politica == BLOQUEAR:
+                self.bloqueantes = self.bloqueantes + [assinatura]
+        return assinatura
+
+    def cancelar(self, assinatura: Assinatura):
+        with self.condicao:
+            self.assinaturas = [a for a in self.assinaturas if a is not assinatura]
+            self.bloqueantes = [a for a in self.bloqueantes if a is not assinatura]
+            self.condicao.notify_all()
+
+    def publicar(self, tipo: str, dados) -> int:
+        offset = self.offset
+        if self.bloqueantes and offset - min(a.offset for a in self.bloqueantes) >= self.capacidade:
+            self._esperar_espaco()
+        self.buffer[offset % self.capacidade] = Evento(offset, tipo, dados)
+        self.offset = offset + 1
+        if self.aguardando:
+            with self.condicao:
+                self.condicao.notify_all()
+        return offset
+
+    def _esperar_espaco(self):
+        with self.condicao:
+            self.aguardando += 1
+            try:
+                while self.bloqueantes and self.offset - min(a.offset for a in self.bloqueantes) >= self.capacidade:
+                    self.condicao.wait()
+            finally:
+                self.aguardando -= 1
+
+    def _liberar_espaco(self):
+        if self.aguardando:
+            with self.condicao:
+                self.condicao.notify_all()
+
+    def _aguardar(self, offset: int, timeout: Optional[float]):
+        with self.condicao:
+            self.aguardando += 1
+            try:
+                self.condicao.wait_for(lambda: self.offset > offset, timeout)
+            finally:
+                self.aguardando -= 1
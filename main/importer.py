@@ -0,0 +1,191 @@
+import argparse
+import csv
+import json
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from main.domain import Paciente
+from main.error import PSBaseError, ValidacaoError
+from main.repository import normalizar_cpf
+
+CAMPOS = ("nome", "cpf", "email", "nascimento")
+
+
+@dataclass
+class ResultadoImportacao:
+    """
+    Contadores de uma importação de pacientes.
+
+    Attributes:
+        lidos: Registros lidos do arquivo.
+        importados: Pacientes inseridos no repositório.
+        rejeitados: Registros inválidos (dados incorretos ou CPF já cadastrado).
+        segundos: Tempo decorrido desde o início da importação.
+    """
+    lidos: int = 0
+    importados: int = 0
+    rejeitados: int = 0
+    segundos: float = 0.0
+
+    @property
+    def vazao(self) -> float:
+        return self.lidos / self.segundos if self.segundos else 0.0
+
+    def __str__(self):
+        return (f"{self.lidos} lidos, {self.importados} importados, {self.rejeitados} rejeitados "
+                f"({self.vazao:,.0f} registros/s)")
+
+class RegistroInvalido(dict):
+    """Registro que não pôde ser lido do arquivo (ex.: JSON inválido); é rejeitado com `motivo`."""
+    def __init__(self, motivo: str):
+        super().__init__()
+        self.motivo = motivo
+
+def ler_csv(arquivo) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """
+    Lê registros de um arquivo CSV com cabeçalho nome,cpf,email,nascimento, como pares
+    (linha, registro); a linha é a última linha do arquivo ocupada pelo registro.
+    """
+    leitor = csv.DictReader(arquivo)
+    for registro in leitor:
+        yield leitor.line_num, registro
+
+def ler_jsonl(arquivo) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """Lê registros de um arquivo JSONL (um objeto JSON por linha), como pares (linha, registro)."""
+    for numero, linha in enumerate(arquivo, 1):
+        if linha.strip():
+            try:
+                registro = json.loads(linha)
+            except ValueError:
+                registro = RegistroInvalido("JSON inválido.")
+            if not isinstance(registro, dict):
+                registro = RegistroInvalido("O registro deve ser um objeto JSON.")
+            yield numero, registro
+
+LEITORES = {"csv": ler_csv, "jsonl": ler_jsonl}
+
+class ImportadorPacientes:
+    """
+    Importa pacientes em massa a partir de um fluxo de registros, com memória limitada.
+
+    Os registros são lidos por um gerador, validados com as regras de Paciente, comparados com os
+    CPFs já cadastrados no repositório e inseridos em lotes. Apenas o lote corrente fica em memória.
+    Registros inválidos são gravados no arquivo de rejeitados com o número da linha do arquivo de
+    origem e o motivo.
+
+    Attributes:
+        repositorio: Repositório de pacientes (em memória ou SQLite).
+        tamanho_lote: Quantidade de pacientes inseridos por vez.
+        rejeitados: Arquivo (aberto para escrita) onde os registros rejeitados são gravados em CSV.
+        progresso: Função chamada com o ResultadoImportacao parcial a cada `intervalo_progresso` registros.
+    """
+    def __init__(self, repositorio, tamanho_lote: int = 10_000, rejeitados=None,
+                 progresso: Optional[Callable[[ResultadoImportacao], None]] = None,
+                 intervalo_progresso: int = 100_000):
+        self.repositorio = repositorio
+        self.tamanho_lote = tamanho_lote
+        self.progresso = progresso
+        self.intervalo_progresso = intervalo_progresso
+        self.escritor_rejeitados = None
+        if rejeitados is not None:
+            self.escritor_rejeitados = csv.writer(rejeitados)
+            self.escritor_rejeitados.writerow(("linha", "motivo") + CAMPOS)
+
+    def _rejeitar(self, resultado: ResultadoImportacao, linha: int, registro: dict, motivo: str):
+        resultado.rejeitados += 1
+        if self.escritor_rejeitados is not None:
+            self.escritor_rejeitados.writerow((linha, motivo) + tuple(registro.get(c, "") for c in CAMPOS))
+
+    def _inserir_lote(self, lote):
+        if hasattr(self.repositorio, "inserir_lote"):
+            self.repositorio.inserir_lote(lote)
+        else:
+            for paciente in lote:
+                self.repositorio.inserir(paciente)
+
+    def _validar(self, resultado: ResultadoImportacao, linha: int, registro: dict, cpfs_lote: set):
+        if isinstance(registro, RegistroInvalido):
+            self._rejeitar(resultado, linha, registro, registro.motivo)
+            return None
+        for campo in CAMPOS:
+            valor = registro.get(campo)
+            if valor is None:
+                # Inclui o null do JSON e os campos que faltam em uma linha curta do CSV.
+                self._rejeitar(resultado, linha, registro, f"Campo obrigatório ausente: {campo}")
+                return None
+            if not isinstance(valor, str):
+                self._rejeitar(resultado, linha, registro, f"Tipo inválido para o campo: {campo}")
+                return None
+        try:
+            paciente = Paciente(*(registro[campo].strip() for campo in CAMPOS))
+        except ValidacaoError as e:
+            self._rejeitar(resultado, linha, registro, e.message)
+            return None
+        cpf = normalizar_cpf(paciente.cpf)
+        if cpf in cpfs_lote or self.repositorio.buscar(cpf) is not None:
+            self._rejeitar(resultado, linha, registro, "CPF já cadastrado.")
+            return None
+        cpfs_lote.add(cpf)
+        return paciente
+
+    def importar(self, registros: Iterable[Tuple[int, dict]]) -> ResultadoImportacao:
+        """Importa pares (linha, registro), como os produzidos por ler_csv e ler_jsonl."""
+        resultado = ResultadoImportacao()
+        inicio = time.perf_counter()
+        lote = []
+        cpfs_lote = set()
+        for linha, registro in registros:
+            resultado.lidos += 1
+            paciente = self._validar(resultado, linha, registro, cpfs_lote)
+            if paciente is not None:
+                lote.append(paciente)
+            if len(lote) >= self.tamanho_lote:
+                self._inserir_lote(lote)
+                resultado.importados += len(lote)
+                lote, cpfs_lote = [], set()
+            if self.progresso is not None and resultado.lidos % self.intervalo_progresso == 0:
+                resultado.segundos = time.perf_counter() - inicio
+                self.progresso(resultado)
+
+        if lote:
+            self._inserir_lote(lote)
+            resultado.importados += len(lote)
+        resultado.segundos = time.perf_counter() - inicio
+        return resultado
+
+    def importar_arquivo(self, caminho: str, formato: Optional[str] = None) -> ResultadoImportacao:
+        """Importa um arquivo CSV ou JSONL; o formato é deduzido da extensão se não for informado."""
+        formato = formato or caminho.rsplit(".", 1)[-1].lower()
+        if formato not in LEITORES:
+            raise ValidacaoError(f"Formato de arquivo não suportado: {formato}")
+        with open(caminho, newline="", encoding="utf-8") as arquivo:
+            return self.importar(LEITORES[formato](arquivo))
+
+
+def main(argumentos=None):
+    from main.sqlite_repository import conectar, PacienteRepositorySQLite
+
+    parser = argparse.ArgumentParser(description="Importa pacientes de um arquivo CSV ou JSONL.")
+    parser.add_argument("arquivo")
+    parser.add_argument("--banco", required=True, help="Banco de dados SQLite de destino.")
+    parser.add_argument("--formato", choices=sorted(LEITORES))
+    parser.add_argument("--rejeitados", default="rejeitados.csv")
+    parser.add_argument("--lote", type=int, default=10_000)
+    opcoes = parser.parse_args(argumentos)
+
+    repositorio = PacienteRepositorySQLite(conectar(opcoes.banco))
+    with open(opcoes.rejeitados, "w", newline="", encoding="utf-8") as rejeitados:
+        importador = ImportadorPacientes(repositorio, opcoes.lote, rejeitados,
+                                         progresso=lambda r: print(r, file=sys.stderr))
+        try:
+            print(importador.importar_arquivo(opcoes.arquivo, opcoes.formato))
+        except PSBaseError as e:
+            print(f"Erro ao importar pacientes: {e.message}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+from main.domain import Atendimento, Risco
+
+QUANTIS = (0.5, 0.95, 0.99)
+RESOLUCAO_RELOGIO = 0.01
+
+
+class HistogramaLog:
+    """
+    Histograma de valores inteiros não negativos com faixas log-lineares (no estilo do HDR
+    Histogram), para estimar quantis em fluxo contínuo com memória fixa.
+
+    Valores menores que 2 * 2^bits são contados exatamente; acima disso, cada potência de dois é
+    dividida em 2^bits faixas, o que limita o erro relativo dos quantis a 2^-bits (cerca de 3% com
+    bits=5). Registrar um valor custa O(1); calcular um quantil percorre as faixas.
+    """
+    __slots__ = ("bits", "sub_faixas", "limite_exato", "maximo", "contagens", "total", "soma")
+
+    def __init__(self, bits: int = 5, bits_maximo: int = 40):
+        self.bits = bits
+        self.sub_faixas = 1 << bits
+        self.limite_exato = 2 * self.sub_faixas
+        self.maximo = (1 << bits_maximo) - 1
+        self.contagens = [0] * ((bits_maximo - bits + 1) * self.sub_faixas)
+        self.total = 0
+        self.soma = 0
+
+    def _limite_inferior(self, indice: int) -> int:
+        if indice < self.limite_exato:
+            return indice
+        expoente = indice // self.sub_faixas - 1
+        return (indice - expoente * self.sub_faixas) << expoente
+
+    def registrar(self, valor: int):
+        if valor < self.limite_exato:
+            if valor < 0:
+                valor = 0
+            self.contagens[valor] += 1
+        else:
+            if valor > self.maximo:
+                valor = self.maximo
+            expoente = valor.bit_length() - self.bits - 1
+            self.contagens[expoente * self.sub_faixas + (valor >> expoente)] += 1
+        self.total += 1
+        self.soma += valor
+
+    def somar(self, outro: "HistogramaLog"):
+        self.contagens = [a + b for a, b in zip(self.contagens, outro.contagens)]
+        self.total += outro.total
+        self.soma += outro.soma
+
+    def quantil(self, q: float) -> Optional[float]:
+        """Retorna o valor estimado do quantil q (0 a 1), ou None se não houver registros."""
+        if self.total == 0:
+            return None
+        alvo = max(1, round(q * self.total))
+        acumulado = 0
+        for indice, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if acumulado >= alvo:
+                inferior = self._limite_inferior(indice)
+                largura = self._limite_inferior(indice + 1) - inferior
+                return inferior + (largura - 1) / 2
+        return float(self.maximo)
+
+class TaxaPorMinuto:
+    """Conta eventos no último minuto com 60 contadores de um segundo reaproveitados em anel."""
+    __slots__ = ("marcas", "contagens")
+
+    def __init__(self):
+        self.marcas = [-1] * 60
+        self.contagens = [0] * 60
+
+    def registrar(self, agora: float):
+        segundo = int(agora)
+        posicao = segundo % 60
+        if self.marcas[posicao] != segundo:
+            self.marcas[posicao] = segundo
+            self.contagens[posicao] = 0
+        self.contagens[posicao] += 1
+
+    def valor(self, agora: float) -> int:
+        segundo = int(agora)
+        return sum(contagem for marca, contagem in zip(self.marcas, self.contagens) if segundo - marca < 60)
+
+@dataclass
+class ResumoMetricas:
+    """
+    Fotografia das métricas da fila de atendimento. Tempos em segundos.
+
+    Attributes:
+        tamanho: Pacientes aguardando, por nível de risco.
+        espera_atual: Espera do primeiro paciente de cada nível (apenas dos níveis em que a fila
+            permite consultar o primeiro paciente).
+        quantis_espera: Quantis (p50, p95, p99) da espera dos pacientes já chamados, por nível de
+            risco, e de todos os níveis juntos (chave None).
+        soma_espera: Soma da espera dos pacientes já chamados, por nível de risco.
+        chegadas: Total de pacientes inseridos na fila.
+        chamadas: Total de pacientes chamados.
+        chegadas_por_minuto: Pacientes inseridos no último minuto.
+        chamadas_por_minuto: Pacientes chamados no último minuto.
+    """
+    tamanho: Dict[Risco, int]
+    espera_atual: Dict[Risco, float]
+    quantis_espera: Dict[Optional[Risco], Dict[float, Optional[float]]]
+    chegadas: int
+    chamadas: int
+    chegadas_por_minuto: int
+    chamadas_por_minuto: int
+    soma_espera: Dict[Risco, float]
+
+class MetricasFila:
+    """
+    Métricas da fila de atendimento atualizadas de forma incremental.
+
+    `registrar_chegada` e `registrar_chamada` são chamados pelo ProntoSocorroService ao inserir e ao
+    chamar um paciente, e custam O(1): contadores, taxa por minuto e um HistogramaLog por nível de
+    risco com a espera (em milissegundos) de cada paciente chamado. Os tamanhos da fila são lidos
+    diretamente da fila, que já os mantém por nível.
+
+    Ler a data e hora atual é a parte mais cara de uma chamada, por isso o valor de `relogio` é
+    reaproveitado por até RESOLUCAO_RELOGIO segundos (medidos pelo relógio monotônico) quando há
+    várias chamadas seguidas.
+
+    Attributes:
+        relogio: Função que retorna a data e hora atual (mesmo relógio de Atendimento.entrada).
+        tempo: Função monotônica usada nas taxas por minuto e na validade da leitura de `relogio`.
+    """
+    def __init__(self, relogio=datetime.now, tempo=time.monotonic):
+        self.relogio = relogio
+        self.tempo = tempo
+        self.esperas = {risco: HistogramaLog() for risco in Risco}
+        self.chegadas = 0
+        self.chamadas = 0
+        self.taxa_chegadas = TaxaPorMinuto()
+        self.taxa_chamadas = TaxaPorMinuto()
+        self.agora = None
+        self.validade_agora = float("-inf")
+
+    def registrar_chegada(self, atendimento: Atendimento):
+        self.chegadas += 1
+        self.taxa_chegadas.registrar(self.tempo())
+
+    def registrar_chamada(self, atendimento: Atendimento):
+        self.chamadas += 1
+        tempo = self.tempo()
+        self.taxa_chamadas.registrar(tempo)
+        if tempo >= self.validade_agora:
+            self.agora = self.relogio()
+            self.validade_agora = tempo + RESOLUCAO_RELOGIO
+        espera = self.agora - atendimento.entrada
+        self.esperas[atendimento.risco].registrar(
+            espera.days * 86_400_000 + espera.seconds * 1000 + espera.microseconds // 1000)
+
+    def _espera_atual(self, fila, agora: datetime) -> Dict[Risco, float]:
+        if not fila.possui_proximo():
+            return {}
+        if hasattr(fila, "niveis_ocupados"):
+            primeiros = [fila.espiar(risco) for risco in fila.niveis_ocupados()]
+        else:
+            primeiros = [fila.espiar()]
+        return {atendimento.risco: (agora - atendimento.entrada).total_seconds() for atendimento in primeiros}
+
+    def snapshot(self, fila) -> ResumoMetricas:
+        """Retorna as métricas atuais da fila `fila` (a mesma fila cujas operações são registradas)."""
+        agora = self.tempo()
+        total = HistogramaLog()
+        quantis = {}
+        for risco, histograma in self.esperas.items():
+            total.somar(histograma)
+            quantis[risco] = self._quantis(histograma)
+        quantis[None] = self._quantis(total)
+        return ResumoMetricas(
+            tamanho={risco: fila.tamanho(risco) for risco in Risco},
+            espera_atual=self._espera_atual(fila, self.relogio()),
+            quantis_espera=quantis,
+            chegadas=self.chegadas,
+            chamadas=self.chamadas,
+            chegadas_por_minuto=self.taxa_chegadas.valor(agora),
+            chamadas_por_minuto=self.taxa_chamadas.valor(agora),
+            soma_espera={risco: h.soma / 1000 for risco, h in self.esperas.items()},
+        )
+
+    @staticmethod
+    def _quantis(histograma: HistogramaLog) -> Dict[float, Optional[float]]:
+        return {q: None if (valor := histograma.quantil(q)) is None else valor / 1000 for q in QUANTIS}
+
+    def prometheus(self, fila) -> str:
+        """Exporta as métricas atuais no formato de texto do Prometheus."""
+        resumo = self.snapshot(fila)
+        linhas = [
+            "# HELP ps_fila_tamanho Pacientes aguardando atendimento.",
+            "# TYPE ps_fila_tamanho gauge",
+        ]
+        linhas += [f'ps_fila_tamanho{{risco="{r.name}"}} {n}' for r, n in resumo.tamanho.items()]
+        linhas += [
+            "# HELP ps_espera_atual_segundos Espera do primeiro paciente de cada nível de risco.",
+            "# TYPE ps_espera_atual_segundos gauge",
+        ]
+        linhas += [f'ps_espera_atual_segundos{{risco="{r.name}"}} {s:.3f}' for r, s in resumo.espera_atual.items()]
+        linhas += [
+            "# HELP ps_espera_segundos Espera dos pacientes chamados, do registro até a chamada.",
+            "# TYPE ps_espera_segundos summary",
+        ]
+        for risco in Risco:
+            rotulo = f'risco="{risco.name}"'
+            for q, valor in resumo.quantis_espera[risco].items():
+                if valor is not None:
+                    linhas.append(f'ps_espera_segundos{{{rotulo},quantile="{q}"}} {valor:.3f}')
+            linhas.append(f"ps_espera_segundos_sum{{{rotulo}}} {resumo.soma_espera[risco]:.3f}")
+            linhas.append(f"ps_espera_segundos_count{{{rotulo}}} {self.esperas[risco].total}")
+        linhas += [
+            "# HELP ps_chegadas_total Pacientes inseridos na fila.",
+            "# TYPE ps_chegadas_total counter",
+            f"ps_chegadas_total {resumo.chegadas}",
+            "# HELP ps_chamadas_total Pacientes chamados.",
+            "# TYPE ps_chamadas_total counter",
+            f"ps_chamadas_total {resumo.chamadas}",
+            "# HELP ps_chegadas_por_minuto Pacientes inseridos na fila no último minuto.",
+            "# TYPE ps_chegadas_por_minuto gauge",
+            f"ps_chegadas_por_minuto {resumo.chegadas_por_minuto}",
+            "# HELP ps_chamadas_por_minuto Pacientes chamados no último minuto.",
+            "# TYPE ps_chamadas_por_minuto gauge",
+            f"ps_chamadas_por_minuto {resumo.chamadas_por_minuto}",
+        ]
+        return "\n".join(linhas) + "\n"
@@ -0,0 +1,194 @@
+import itertools
+import multiprocessing
+from typing import Dict, Iterable, List
+
+from main.domain import Atendimento, FilaAtendimentoMultinivel, Paciente, Risco
+from main.error import FilaError, PSBaseError, ValidacaoError
+from main.policy import PoliticaPrioridade
+from main.repository import PacienteRepository, AtendimentoRepository
+
+RISCOS = list(Risco)
+
+
+def _executar_unidade(conexao, contagem, deslocamento: int, politica):
+    """
+    Laço principal do processo de uma unidade: mantém a fila de atendimento da unidade e responde
+    aos comandos recebidos pelo pipe. Após cada alteração, publica a quantidade de pacientes por
+    nível de risco na memória compartilhada `contagem`, a partir da posição `deslocamento`.
+    """
+    fila = FilaAtendimentoMultinivel()
+    atendimentos: Dict[int, Atendimento] = {}
+    numeros: Dict[int, int] = {}
+
+    def publicar():
+        for i, risco in enumerate(RISCOS):
+            contagem[deslocamento + i] = fila.tamanho(risco)
+
+    while True:
+        comando, *argumentos = conexao.recv()
+        if comando == 'encerrar':
+            break
+        try:
+            if comando == 'inserir':
+                numero, atendimento = argumentos
+                fila.inserir(atendimento)
+                atendimentos[numero] = atendimento
+                numeros[id(atendimento)] = numero
+                resposta = numero
+            elif comando == 'proximo':
+                atendimento = politica.proximo(fila)
+                resposta = numeros.pop(id(atendimento))
+                del atendimentos[resposta]
+            elif comando == 'remover':
+                atendimento = atendimentos.pop(argumentos[0])
+                fila.remover(atendimento)
+                del numeros[id(atendimento)]
+                resposta = argumentos[0]
+            else:
+                raise ValidacaoError(f'Comando desconhecido: {comando}')
+            publicar()
+            conexao.send(('ok', resposta))
+        except PSBaseError as e:
+            conexao.send(('erro', (type(e), e.message)))
+    conexao.close()
+
+class RedeProntoSocorro:
+    """
+    Gerencia uma rede de unidades de pronto-socorro, cada uma com a sua fila de atendimento, sobre
+    um cadastro de pacientes compartilhado.
+
+    Cada unidade é executada em um processo próprio, que mantém a fila da unidade e recebe
+    comandos por um pipe. Os cadastros de pacientes e atendimentos ficam no processo coordenador.
+    As quantidades de pacientes por nível de risco de cada unidade são publicadas em memória
+    compartilhada, de modo que os totais da rede são lidos sem parar nem consultar as unidades.
+
+    Os métodos devem ser chamados a partir de uma única thread do processo coordenador.
+
+    Attributes:
+        pacientes: Repositório de pacientes compartilhado por todas as unidades.
+        atendimentos: Repositório de atendimentos de toda a rede.
+        unidades: Identificadores das unidades.
+    """
+    def __init__(self, unidades: Iterable[str], pacientes: PacienteRepository = None,
+                 atendimentos: AtendimentoRepository = None, politica=None):
+        self.pacientes = pacientes if pacientes is not None else PacienteRepository()
+        self.atendimentos = atendimentos if atendimentos is not None else AtendimentoRepository(self.pacientes)
+        self.unidades: List[str] = list(unidades)
+        if len(set(self.unidades)) != len(self.unidades):
+            raise ValidacaoError('Identificadores de unidade repetidos.')
+        politica = politica if politica is not None else PoliticaPrioridade()
+
+        contexto = multiprocessing.get_context()
+        self.contagem = contexto.Array('q', len(self.unidades) * len(RISCOS), lock=False)
+        self.conexoes = {}
+        self.processos = {}
+        self.deslocamentos = {}
+        for i, unidade in enumerate(self.unidades):
+            conexao, conexao_unidade = contexto.Pipe()
+            deslocamento = i * len(RISCOS)
+            processo = contexto.Process(target=_executar_unidade, name=f'unidade-{unidade}', daemon=True,
+                                        args=(conexao_unidade, self.contagem, deslocamento, politica))
+            processo.start()
+            conexao_unidade.close()
+            self.conexoes[unidade] = conexao
+            self.processos[unidade] = processo
+            self.deslocamentos[unidade] = deslocamento
+
+        self.sequencia = itertools.count()
+        self.em_fila: Dict[int, Atendimento] = {}
+        self.numeros: Dict[int, int] = {}
+        self.unidade_de: Dict[int, str] = {}
+
+    def _enviar(self, unidade: str, *comando):
+        try:
+            conexao = self.conexoes[unidade]
+        except KeyError:
+            raise ValidacaoError(f'Unidade desconhecida: {unidade}')
+        conexao.send(comando)
+        status, resposta = conexao.recv()
+        if status == 'erro':
+            classe, mensagem = resposta
+            raise classe(mensagem)
+        return resposta
+
+    # --- operações ---
+
+    def registrar_paciente(self, nome, cpf, email, nascimento) -> Paciente:
+        paciente = Paciente(nome, cpf, email, nascimento)
+        self.pacientes.inserir(paciente)
+        return paciente
+
+    def registrar_atendimento(self, unidade: str, paciente: Paciente, risco: Risco) -> Atendimento:
+        """Registra o atendimento do paciente e o insere na fila da unidade."""
+        if unidade not in self.conexoes:
+            raise ValidacaoError(f'Unidade desconhecida: {unidade}')
+        atendimento = Atendimento(paciente, risco)
+        self.atendimentos.inserir(atendimento)
+        self._inserir(unidade, atendimento)
+        return atendimento
+
+    def _inserir(self, unidade: str, atendimento: Atendimento):
+        numero = next(self.sequencia)
+        self._enviar(unidade, 'inserir', numero, atendimento)
+        self.em_fila[numero] = atendimento
+        self.numeros[id(atendimento)] = numero
+        self.unidade_de[numero] = unidade
+
+    def chamar_proximo(self, unidade: str) -> Atendimento:
+        numero = self._enviar(unidade, 'proximo')
+        atendimento = self.em_fila.pop(numero)
+        del self.numeros[id(atendimento)]
+        del self.unidade_de[numero]
+        return atendimento
+
+    def _retirar(self, atendimento: Atendimento) -> str:
+        numero = self.numeros.get(id(atendimento))
+        if numero is None:
+            raise FilaError('Atendimento não está em nenhuma fila da rede')
+        unidade = self.unidade_de[numero]
+        self._enviar(unidade, 'remover', numero)
+        del self.em_fila[numero], self.numeros[id(atendimento)], self.unidade_de[numero]
+        return unidade
+
+    def remover(self, atendimento: Atendimento):
+        self._retirar(atendimento)
+
+    def transferir(self, atendimento: Atendimento, destino: str):
+        """Transfere um paciente que aguarda atendimento para a fila de outra unidade."""
+        if destino not in self.conexoes:
+            raise ValidacaoError(f'Unidade desconhecida: {destino}')
+        origem = self._retirar(atendimento)
+        try:
+            self._inserir(destino, atendimento)
+        except PSBaseError:
+            self._inserir(origem, atendimento)
+            raise
+
+    def unidade_atendimento(self, atendimento: Atendimento) -> str:
+        return self.unidade_de[self.numeros[id(atendimento)]]
+
+    # --- contagens (lidas da memória compartilhada, sem consultar as unidades) ---
+
+    def contagem_unidade(self, unidade: str) -> Dict[Risco, int]:
+        deslocamento = self.deslocamentos[unidade]
+        return {risco: self.contagem[deslocamento + i] for i, risco in enumerate(RISCOS)}
+
+    def contagem_rede(self) -> Dict[Risco, int]:
+        valores = self.contagem[:]
+        return {risco: sum(valores[i::len(RISCOS)]) for i, risco in enumerate(RISCOS)}
+
+    def encerrar(self):
+        for unidade, conexao in self.conexoes.items():
+            try:
+                conexao.send(('encerrar',))
+            except (BrokenPipeError, OSError):
+                pass
+            self.processos[unidade].join(timeout=5)
+            conexao.close()
+        self.conexoes.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.encerrar()
@@ -0,0 +1,318 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from main.domain import Atendimento, Paciente, Risco
+from main.error import PersistenciaError
+from main.repository import PacienteRepository, AtendimentoRepository
+from main.service import ProntoSocorroService
+
+POLITICAS_FSYNC = ('sempre', 'lote', 'nunca')
+
+ARQUIVO_LOG = 'eventos.log'
+ARQUIVO_SNAPSHOT = 'snapshot.json'
+
+
+def sincronizar_diretorio(diretorio: str):
+    """fsync do diretório, tornando duráveis as criações e trocas de nomes feitas nele."""
+    descritor = os.open(diretorio, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+    try:
+        os.fsync(descritor)
+    finally:
+        os.close(descritor)
+
+
+class LogEventos:
+    """
+    Log de escrita antecipada (write-ahead log) dos eventos de domínio, apenas com anexação.
+
+    Cada evento é uma linha JSON no formato [lsn, tipo, dados...], onde lsn é um número de sequência
+    crescente. A durabilidade depende da política de fsync:
+
+        sempre: fsync a cada evento (nenhum evento confirmado é perdido).
+        lote: fsync em grupo, a cada `tamanho_lote` eventos ou no máximo `intervalo_fsync`
+            segundos após o primeiro evento pendente (por um temporizador em segundo plano, mesmo
+            que nenhum outro evento chegue); uma queda de energia pode perder apenas o último lote.
+        nunca: os dados são entregues ao sistema operacional, sem fsync.
+
+    Attributes:
+        caminho: Caminho do arquivo de log.
+        lsn: Número de sequência do último evento registrado.
+    """
+    def __init__(self, caminho: str, lsn: int = 0, politica_fsync: str = 'lote',
+                 tamanho_lote: int = 1000, intervalo_fsync: float = 0.05, tamanho: Optional[int] = None):
+        """
+        Args:
+            tamanho: Se informado, o arquivo é truncado neste byte antes da abertura (fim da última
+                linha completa lida na recuperação), de modo que uma escrita interrompida no fim do
+                log não se junte ao próximo evento.
+        """
+        if politica_fsync not in POLITICAS_FSYNC:
+            raise PersistenciaError(f'Política de fsync inválida: {politica_fsync}')
+        self.caminho = caminho
+        self.lsn = lsn
+        self.politica_fsync = politica_fsync
+        self.tamanho_lote = tamanho_lote
+        self.intervalo_fsync = intervalo_fsync
+        self.pendentes = 0
+        self.ultimo_fsync = time.monotonic()
+        # Serializa as escritas com o fsync feito pelo temporizador da política 'lote'.
+        self.trava = threading.RLock()
+        self.temporizador: Optional[threading.Timer] = None
+        if tamanho is not None and os.path.exists(caminho):
+            self._truncar(caminho, tamanho)
+        self.arquivo = open(caminho, 'a', encoding='utf-8')
+
+    @staticmethod
+    def _truncar(caminho: str, tamanho: int):
+        with open(caminho, 'r+b') as arquivo:
+            arquivo.truncate(tamanho)
+            if tamanho > 0:
+                arquivo.seek(tamanho - 1)
+                if arquivo.read(1) != b'\n':
+                    arquivo.write(b'\n')  # última linha completa, mas sem a quebra de linha
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+
+    def registrar(self, tipo: str, *dados) -> int:
+        with self.trava:
+            self.lsn += 1
+            self.arquivo.write(json.dumps([self.lsn, tipo, *dados], separators=(',', ':'), ensure_ascii=False))
+            self.arquivo.write('\n')
+            self.pendentes += 1
+            if self.politica_fsync == 'sempre':
+                self.sincronizar()
+            elif self.politica_fsync == 'lote':
+                if (self.pendentes >= self.tamanho_lote
+                        or time.monotonic() - self.ultimo_fsync >= self.intervalo_fsync):
+                    self.sincronizar()
+                elif self.temporizador is None:
+                    self._agendar_fsync()
+            return self.lsn
+
+    def _agendar_fsync(self):
+        self.temporizador = threading.Timer(self.intervalo_fsync, self._fsync_agendado)
+        self.temporizador.daemon = True
+        self.temporizador.start()
+
+    def _fsync_agendado(self):
+        with self.trava:
+            self.temporizador = None
+            if self.pendentes and not self.arquivo.closed:
+                self.sincronizar()
+
+    def _cancelar_fsync(self):
+        if self.temporizador is not None:
+            self.temporizador.cancel()
+            self.temporizador = None
+
+    def sincronizar(self):
+        """Grava os eventos pendentes em disco (flush + fsync)."""
+        with self.trava:
+            self.arquivo.flush()
+            if self.politica_fsync != 'nunca':
+                os.fsync(self.arquivo.fileno())
+            self.pendentes = 0
+            self.ultimo_fsync = time.monotonic()
+
+    def reiniciar(self):
+        """Descarta o conteúdo do log (após um snapshot que já contém todos os eventos)."""
+        with self.trava:
+            self.arquivo.close()
+            self.arquivo = open(self.caminho, 'w', encoding='utf-8')
+            self.sincronizar()
+
+    def fechar(self):
+        with self.trava:
+            self._cancelar_fsync()
+            if not self.arquivo.closed:
+                self.sincronizar()
+                self.arquivo.close()
+
+    @staticmethod
+    def ler(caminho: str):
+        """
+        Percorre os eventos do log como pares (fim, evento), onde fim é a posição (em bytes) logo
+        após a linha do evento. Uma última linha incompleta é ignorada.
+        """
+        if not os.path.exists(caminho):
+            return
+        fim = 0
+        with open(caminho, 'rb') as arquivo:
+            for numero, linha in enumerate(arquivo, 1):
+                try:
+                    evento = json.loads(linha)
+                except ValueError:
+                    if arquivo.readline() == b'':
+                        return  # escrita interrompida no fim do arquivo
+                    raise PersistenciaError(f'Log de eventos corrompido na linha {numero}')
+                fim += len(linha)
+                yield fim, evento
+
+
+class ProntoSocorroServicePersistente(ProntoSocorroService):
+    """
+    Serviço do pronto-socorro que registra cada operação em um log de eventos e grava snapshots
+    compactados periodicamente, de modo que pacientes, atendimentos e a fila de atendimento
+    sobrevivem a um reinício do processo.
+
+    Na criação, o estado é recuperado a partir do último snapshot seguido dos eventos do log com
+    lsn posterior a ele. O barramento `eventos`, se informado, só passa a receber eventos depois
+    da recuperação.
+
+    Attributes:
+        diretorio: Diretório onde ficam o log e o snapshot.
+        log: Log de eventos.
+        intervalo_snapshot: Quantidade de eventos entre snapshots automáticos (0 desativa).
+    """
+    def __init__(self, diretorio: str, politica_fsync: str = 'lote', intervalo_snapshot: int = 100_000,
+                 fila=None, politica=None, eventos=None):
+        pacientes = PacienteRepository()
+        super().__init__(pacientes, AtendimentoRepository(pacientes), fila, politica)
+        self.diretorio = diretorio
+        self.intervalo_snapshot = intervalo_snapshot
+        self.numeros: Dict[int, int] = {}
+        self.registrados: Dict[int, Atendimento] = {}
+        self.em_fila: Dict[int, Atendimento] = {}
+        self.eventos_desde_snapshot = 0
+        os.makedirs(diretorio, exist_ok=True)
+        lsn = self._recuperar()
+        self.log = LogEventos(os.path.join(diretorio, ARQUIVO_LOG), lsn, politica_fsync, tamanho=self.tamanho_log)
+        self.eventos = eventos
+
+    # --- operações do serviço ---
+
+    def registrar_paciente(self, nome, cpf, email, nascimento):
+        paciente = super().registrar_paciente(nome, cpf, email, nascimento)
+        self._registrar_evento('paciente', nome, cpf, email, nascimento)
+        return paciente
+
+    def registrar_atendimento(self, paciente: Paciente, risco: Risco) -> Atendimento:
+        atendimento = super().registrar_atendimento(paciente, risco)
+        self._numerar(atendimento)
+        return atendimento
+
+    def inserir_fila_atendimento(self, atendimento: Atendimento) -> bool:
+        """Insere o atendimento na fila, registrando-o antes no repositório caso ainda não esteja."""
+        if id(atendimento) not in self.numeros:
+            self.atendimentos.inserir(atendimento)
+            self._numerar(atendimento)
+        super().inserir_fila_atendimento(atendimento)
+        numero = self.numeros[id(atendimento)]
+        self.em_fila[numero] = atendimento
+        self._registrar_evento('fila', numero)
+        return True
+
+    def remover_fila_atendimento(self, atendimento: Atendimento) -> bool:
+        super().remover_fila_atendimento(atendimento)
+        numero = self.numeros[id(atendimento)]
+        del self.em_fila[numero]
+        self._registrar_evento('removido', numero)
+        return True
+
+    def reclassificar_risco(self, atendimento: Atendimento, risco: Risco) -> Atendimento:
+        super().reclassificar_risco(atendimento, risco)
+        self._registrar_evento('reclassificado', self.numeros[id(atendimento)], risco.value)
+        return atendimento
+
+    def chamar_proximo(self) -> Atendimento:
+        atendimento = super().chamar_proximo()
+        numero = self.numeros[id(atendimento)]
+        del self.em_fila[numero]
+        self._registrar_evento('chamado', numero)
+        return atendimento
+
+    # --- log e snapshot ---
+
+    def _numerar(self, atendimento: Atendimento):
+        numero = len(self.registrados)
+        self.numeros[id(atendimento)] = numero
+        self.registrados[numero] = atendimento
+        self._registrar_evento('atendimento', numero, atendimento.paciente.cpf, atendimento.risco.value,
+                               atendimento.entrada.isoformat())
+
+    def _registrar_evento(self, tipo: str, *dados):
+        self.log.registrar(tipo, *dados)
+        self.eventos_desde_snapshot += 1
+        if self.intervalo_snapshot and self.eventos_desde_snapshot >= self.intervalo_snapshot:
+            self.snapshot()
+
+    def snapshot(self):
+        """Grava o estado atual em um snapshot (de forma atômica) e descarta o log já incorporado."""
+        self.log.sincronizar()
+        estado = {
+            'lsn': self.log.lsn,
+            'pacientes': [[p.nome, p.cpf, p.email, p.nascimento] for p in self.pacientes.pacientes.values()],
+            'atendimentos': [
+                [numero, a.paciente.cpf, a.risco.value, a.entrada.isoformat()]
+                for numero, a in self.registrados.items()
+            ],
+            'fila': list(self.em_fila),
+        }
+        caminho = os.path.join(self.diretorio, ARQUIVO_SNAPSHOT)
+        with open(caminho + '.tmp', 'w', encoding='utf-8') as arquivo:
+            json.dump(estado, arquivo, separators=(',', ':'), ensure_ascii=False)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(caminho + '.tmp', caminho)
+        # A troca de nomes só é durável após o fsync do diretório; sem ele, uma queda de energia
+        # depois de reiniciar o log poderia deixar o snapshot anterior com o log já vazio.
+        sincronizar_diretorio(self.diretorio)
+        self.log.reiniciar()
+        self.eventos_desde_snapshot = 0
+
+    def fechar(self):
+        self.log.fechar()
+
+    # --- recuperação ---
+
+    def _restaurar_atendimento(self, numero, cpf, risco, entrada):
+        atendimento = Atendimento(self.pacientes.buscar(cpf), Risco(risco), datetime.fromisoformat(entrada))
+        self.atendimentos.inserir(atendimento)
+        self.numeros[id(atendimento)] = numero
+        self.registrados[numero] = atendimento
+
+    def _aplicar(self, evento):
+        tipo, dados = evento[1], evento[2:]
+        if tipo == 'paciente':
+            ProntoSocorroService.registrar_paciente(self, *dados)
+        elif tipo == 'atendimento':
+            self._restaurar_atendimento(*dados)
+        elif tipo == 'fila':
+            atendimento = self.registrados[dados[0]]
+            self.fila_atendimento.inserir(atendimento)
+            self.em_fila[dados[0]] = atendimento
+        elif tipo in ('chamado', 'removido'):
+            atendimento = self.em_fila.pop(dados[0])
+            self.fila_atendimento.remover(atendimento)
+        elif tipo == 'reclassificado':
+            self.fila_atendimento.reclassificar(self.registrados[dados[0]], Risco(dados[1]))
+        else:
+            raise PersistenciaError(f'Evento desconhecido no log: {tipo}')
+
+    def _recuperar(self) -> int:
+        lsn = 0
+        caminho = os.path.join(self.diretorio, ARQUIVO_SNAPSHOT)
+        if os.path.exists(caminho):
+            with open(caminho, encoding='utf-8') as arquivo:
+                estado = json.load(arquivo)
+            lsn = estado['lsn']
+            for dados in estado['pacientes']:
+                ProntoSocorroService.registrar_paciente(self, *dados)
+            for dados in estado['atendimentos']:
+                self._restaurar_atendimento(*dados)
+            for numero in estado['fila']:
+                self.fila_atendimento.inserir(self.registrados[numero])
+                self.em_fila[numero] = self.registrados[numero]
+        self.tamanho_log = 0
+        for fim, evento in LogEventos.ler(os.path.join(self.diretorio, ARQUIVO_LOG)):
+            self.tamanho_log = fim
+            if evento[0] <= lsn:
+                continue
+            self._aplicar(evento)
+            lsn = evento[0]
+            self.eventos_desde_snapshot += 1
+        return lsn
@@ -0,0 +1,69 @@
+from datetime import datetime
+from typing import Optional
+
+from main.domain import Atendimento, Risco, TEMPO_MAXIMO_ESPERA
+from main.error import FilaVaziaError, ValidacaoError
+
+
+class PoliticaPrioridade:
+    """
+    Política de chamada padrão: o próximo paciente é sempre o de maior risco (e, no mesmo risco, o
+    que chegou primeiro).
+    """
+    def proximo(self, fila) -> Atendimento:
+        return fila.proximo()
+
+class PoliticaEnvelhecimento:
+    """
+    Política de chamada com envelhecimento, para evitar que pacientes de baixo risco esperem
+    indefinidamente.
+
+    Cada nível de risco possui um tempo máximo de espera (protocolo de Manchester). Enquanto nenhum
+    paciente ultrapassou esse tempo, vale a prioridade por risco. Caso contrário, é chamado o
+    paciente cuja espera mais excedeu o tempo máximo do seu nível, proporcionalmente. VERMELHO
+    (tempo máximo zero) é sempre chamado primeiro.
+
+    Apenas o primeiro paciente de cada nível é comparado, por isso a política exige uma fila com
+    acesso por nível (FilaAtendimentoMultinivel ou FilaAtendimentoConcorrente) e custa O(1) por
+    chamada.
+
+    Attributes:
+        tempos: Tempo máximo de espera por nível de risco.
+        relogio: Função que retorna a data e hora atual.
+    """
+    def __init__(self, tempos=None, relogio=datetime.now):
+        self.tempos = dict(TEMPO_MAXIMO_ESPERA if tempos is None else tempos)
+        self.relogio = relogio
+
+    def proximo(self, fila) -> Atendimento:
+        if not hasattr(fila, 'niveis_ocupados'):
+            raise ValidacaoError('A política de envelhecimento exige uma fila com acesso por nível de risco '
+                                 '(ex.: FilaAtendimentoMultinivel ou FilaAtendimentoConcorrente).')
+        while True:
+            risco = self._escolher(fila)
+            try:
+                return fila.proximo(risco)
+            except FilaVaziaError:
+                # Com a FilaAtendimentoConcorrente, outro guichê pode esvaziar o nível escolhido
+                # entre a escolha e a retirada: a escolha é refeita. Sem nível escolhido, a fila
+                # inteira está vazia.
+                if risco is None:
+                    raise
+
+    def _escolher(self, fila) -> Optional[Risco]:
+        """Nível do qual chamar o próximo paciente, ou None para seguir a prioridade por risco."""
+        agora = self.relogio()
+        escolhido = None
+        maior_atraso = 1.0
+        for risco in fila.niveis_ocupados():
+            limite = self.tempos[risco].total_seconds()
+            if limite <= 0:
+                return risco
+            try:
+                primeiro = fila.espiar(risco)
+            except FilaVaziaError:
+                continue
+            atraso = (agora - primeiro.entrada).total_seconds() / limite
+            if atraso > maior_atraso:
+                escolhido, maior_atraso = risco, atraso
+        return escolhido
@@ -0,0 +1,123 @@
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+import types
+from typing import Dict, Iterable, Optional
+
+from main import validation
+from main.metrics import QUANTIS, HistogramaLog
+
+
+class Perfilador:
+    """
+    Instrumentação opcional para medir o tempo gasto em cada método do serviço.
+
+    `instrumentar` substitui os métodos públicos de um objeto (ou as funções públicas de um módulo)
+    por versões que medem a duração de cada chamada com perf_counter_ns. As durações alimentam um
+    HistogramaLog por método, e uma amostra das chamadas é guardada como eventos de trace no formato
+    do Chrome (chrome://tracing, Perfetto). Chamadas aninhadas (ex.: o repositório chamado pelo
+    serviço) aparecem como spans dentro da chamada externa.
+
+    Sem instrumentação não há custo algum: os objetos usam os seus próprios métodos.
+    `desinstrumentar` restaura os métodos originais.
+
+    Attributes:
+        intervalo_amostragem: Uma a cada `intervalo_amostragem` chamadas de primeiro nível é gravada
+            no trace, com todos os seus spans aninhados.
+        limite_eventos: Quantidade máxima de eventos de trace guardados.
+        histogramas: Durações em nanossegundos, por nome de método.
+    """
+    def __init__(self, intervalo_amostragem: int = 1, limite_eventos: int = 1_000_000,
+                 relogio=time.perf_counter_ns):
+        self.intervalo_amostragem = intervalo_amostragem
+        self.limite_eventos = limite_eventos
+        self.relogio = relogio
+        self.histogramas: Dict[str, HistogramaLog] = {}
+        self.eventos = []
+        self.chamadas = itertools.count()
+        self.estado = threading.local()
+        self.originais = []
+
+    def _envolver(self, nome: str, funcao):
+        histograma = self.histogramas.setdefault(nome, HistogramaLog())
+        relogio = self.relogio
+        estado = self.estado
+        eventos = self.eventos
+
+        @functools.wraps(funcao)
+        def medir(*args, **kwargs):
+            profundidade = getattr(estado, "profundidade", 0)
+            if profundidade == 0:
+                estado.amostrar = next(self.chamadas) % self.intervalo_amostragem == 0
+            estado.profundidade = profundidade + 1
+            inicio = relogio()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                duracao = relogio() - inicio
+                estado.profundidade = profundidade
+                histograma.registrar(duracao)
+                if estado.amostrar and len(eventos) < self.limite_eventos:
+                    eventos.append((nome, inicio, duracao, threading.get_ident()))
+        return medir
+
+    def instrumentar(self, objeto, metodos: Optional[Iterable[str]] = None, prefixo: Optional[str] = None):
+        """
+        Instrumenta os métodos `metodos` de `objeto` (por padrão, todos os métodos públicos).
+
+        Os spans recebem o nome "<prefixo>.<método>", onde o prefixo padrão é o nome da classe do
+        objeto ou o nome do módulo.
+        """
+        if isinstance(objeto, types.ModuleType):
+            prefixo = prefixo or objeto.__name__
+            if metodos is None:
+                metodos = [nome for nome, valor in vars(objeto).items()
+                           if isinstance(valor, types.FunctionType) and valor.__module__ == objeto.__name__]
+        else:
+            prefixo = prefixo or type(objeto).__name__
+            if metodos is None:
+                metodos = [nome for nome in dir(type(objeto)) if callable(getattr(type(objeto), nome))]
+        for nome in metodos:
+            if nome.startswith("_"):
+                continue
+            original = vars(objeto).get(nome)
+            self.originais.append((objeto, nome, original))
+            setattr(objeto, nome, self._envolver(f"{prefixo}.{nome}", getattr(objeto, nome)))
+        return objeto
+
+    def instrumentar_servico(self, servico):
+        """Instrumenta o serviço, os seus repositórios, a fila de atendimento e as validações."""
+        for objeto in (servico, servico.pacientes, servico.atendimentos, servico.fila_atendimento):
+            if hasattr(objeto, "__dict__"):
+                self.instrumentar(objeto)
+        self.instrumentar(validation, [nome for nome in vars(validation) if nome.startswith("validar_")])
+        return servico
+
+    def desinstrumentar(self):
+        for objeto, nome, original in reversed(self.originais):
+            if original is None:
+                delattr(objeto, nome)
+            else:
+                setattr(objeto, nome, original)
+        self.originais.clear()
+
+    def resumo(self) -> Dict[str, dict]:
+        """Retorna, por método, a quantidade de chamadas, o tempo total e os quantis (em ns)."""
+        return {nome: {"chamadas": histograma.total, "total": histograma.soma,
+                       **{f"p{round(q * 100)}": histograma.quantil(q) for q in QUANTIS}}
+                for nome, histograma in self.histogramas.items() if histograma.total}
+
+    def trace(self) -> dict:
+        """Retorna os eventos amostrados no formato de trace do Chrome (tempos em microssegundos)."""
+        pid = os.getpid()
+        return {"traceEvents": [{"name": nome, "cat": nome.split(".", 1)[0], "ph": "X", "ts": inicio / 1000,
+                                 "dur": duracao / 1000, "pid": pid, "tid": tid}
+                                for nome, inicio, duracao, tid in self.eventos],
+                "displayTimeUnit": "ns"}
+
+    def salvar_trace(self, caminho: str):
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump(self.trace(), arquivo)
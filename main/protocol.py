@@ -0,0 +1,172 @@
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+from main import triage
+from main.domain import Risco
+from main.error import ProtocoloError
+
+CAMINHO_PADRAO = os.path.join(os.path.dirname(__file__), "protocolos", "manchester.txt")
+RISCO_PADRAO = Risco.AZUL
+FLUXOGRAMA_GERAL = "geral"
+
+
+@dataclass(frozen=True, slots=True)
+class Fluxograma:
+    """
+    Fluxograma compilado do protocolo de triagem.
+
+    Cada discriminador recebe um bit, numerados do nível mais grave para o menos grave. Assim, o
+    risco de uma combinação de discriminadores é dado pelo bit menos significativo ligado da sua
+    máscara, e `tabela[i]` guarda o risco do bit i - 1 (`tabela[0]` é o risco padrão).
+
+    Attributes:
+        nome: Nome do fluxograma.
+        bits: Máscara de cada discriminador.
+        tabela: Risco pela posição do bit menos significativo ligado.
+    """
+    nome: str
+    bits: Mapping[str, int]
+    tabela: Tuple[Risco, ...]
+
+    def mascara(self, discriminadores: Iterable[str]) -> int:
+        mascara = 0
+        try:
+            for discriminador in discriminadores:
+                mascara |= self.bits[discriminador]
+        except KeyError as e:
+            raise ProtocoloError(f"Discriminador desconhecido no fluxograma {self.nome}: {e.args[0]}")
+        return mascara
+
+    def classificar_mascara(self, mascara: int) -> Risco:
+        return self.tabela[(mascara & -mascara).bit_length()]
+
+    def classificar(self, discriminadores: Iterable[str]) -> Risco:
+        return self.classificar_mascara(self.mascara(discriminadores))
+
+@dataclass(frozen=True, slots=True)
+class Protocolo:
+    """
+    Versão imutável de um protocolo de triagem, com todos os fluxogramas já compilados.
+
+    Attributes:
+        versao: Identificação da versão do protocolo.
+        fluxogramas: Fluxogramas compilados, por nome.
+    """
+    versao: str
+    fluxogramas: Mapping[str, Fluxograma]
+
+    def fluxograma(self, nome: str) -> Fluxograma:
+        try:
+            return self.fluxogramas[nome]
+        except KeyError:
+            raise ProtocoloError(f"Fluxograma desconhecido: {nome}")
+
+
+def compilar_fluxograma(nome: str, niveis: List[Tuple[Risco, List[str]]]) -> Fluxograma:
+    """Compila as regras de um fluxograma (discriminadores por nível de risco) em uma tabela de bits."""
+    bits: Dict[str, int] = {}
+    tabela = [RISCO_PADRAO]
+    for risco, discriminadores in sorted(niveis, key=lambda nivel: nivel[0].value):
+        for discriminador in discriminadores:
+            if discriminador in bits:
+                raise ProtocoloError(f"Discriminador repetido no fluxograma {nome}: {discriminador}")
+            bits[discriminador] = 1 << len(bits)
+            tabela.append(risco)
+    return Fluxograma(nome, bits, tuple(tabela))
+
+def fluxograma_geral() -> Fluxograma:
+    """
+    Fluxograma "geral", gerado a partir de triage.REGRAS_TRIAGEM: o bit i é o campo i da tabela de
+    regras, de modo que a máscara e o risco são os mesmos de triage.mascara e triage.classificar.
+    """
+    bits = {campo: 1 << bit for bit, (campo, _) in enumerate(triage.REGRAS_TRIAGEM)}
+    return Fluxograma(FLUXOGRAMA_GERAL, bits, (triage.RISCO_PADRAO, *(risco for _, risco in triage.REGRAS_TRIAGEM)))
+
+def ler_protocolo(linhas: Iterable[str]) -> Protocolo:
+    """
+    Lê e compila um protocolo em texto simples. O fluxograma "geral" não é lido do texto: ele é
+    gerado a partir das regras de main.triage (ver fluxograma_geral).
+
+    Formato (linhas em branco e comentários iniciados por # são ignorados):
+
+        versao: 2024.1
+
+        fluxograma: dor_toracica
+            VERMELHO: via_aerea_comprometida, choque
+            LARANJA: dor_precordial
+    """
+    versao = None
+    fluxogramas: Dict[str, List[Tuple[Risco, List[str]]]] = {}
+    atual = None
+    for numero, linha in enumerate(linhas, 1):
+        linha = linha.split("#", 1)[0].strip()
+        if not linha:
+            continue
+        chave, separador, valor = linha.partition(":")
+        chave, valor = chave.strip(), valor.strip()
+        if not separador or not valor:
+            raise ProtocoloError(f"Linha {numero} do protocolo inválida: {linha}")
+
+        if chave == "versao":
+            versao = valor
+        elif chave == "fluxograma":
+            if valor == FLUXOGRAMA_GERAL:
+                raise ProtocoloError(f"O fluxograma {valor} é gerado a partir da triagem (linha {numero}).")
+            if valor in fluxogramas:
+                raise ProtocoloError(f"Fluxograma repetido na linha {numero}: {valor}")
+            atual = fluxogramas[valor] = []
+        elif chave in Risco.__members__:
+            if atual is None:
+                raise ProtocoloError(f"Nível de risco fora de um fluxograma na linha {numero}.")
+            atual.append((Risco[chave], [d.strip() for d in valor.split(",") if d.strip()]))
+        else:
+            raise ProtocoloError(f"Chave desconhecida na linha {numero} do protocolo: {chave}")
+
+    if versao is None:
+        raise ProtocoloError("O protocolo não informa a versão.")
+    compilados = {nome: compilar_fluxograma(nome, niveis) for nome, niveis in fluxogramas.items()}
+    compilados[FLUXOGRAMA_GERAL] = fluxograma_geral()
+    return Protocolo(versao, compilados)
+
+def carregar_protocolo(caminho: str = CAMINHO_PADRAO) -> Protocolo:
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            return ler_protocolo(arquivo)
+    except OSError as e:
+        raise ProtocoloError(f"Não foi possível ler o protocolo {caminho}: {e.strerror}")
+
+class MotorProtocolo:
+    """
+    Classifica o risco pelos fluxogramas de um protocolo de triagem carregado de arquivo.
+
+    O protocolo é compilado uma única vez e mantido em um objeto imutável. `recarregar` compila a
+    nova versão à parte e a publica com uma única atribuição: as classificações não usam lock, e
+    uma classificação em andamento termina com a versão que leu no início.
+
+    Attributes:
+        protocolo: Versão do protocolo em uso.
+    """
+    def __init__(self, caminho: str = CAMINHO_PADRAO):
+        self.caminho = caminho
+        self.protocolo = carregar_protocolo(caminho)
+        self.trava_recarga = threading.Lock()
+
+    @property
+    def versao(self) -> str:
+        return self.protocolo.versao
+
+    def recarregar(self, caminho: str = None) -> Protocolo:
+        """Carrega uma nova versão do protocolo; se ela for inválida, a versão atual é mantida."""
+        with self.trava_recarga:
+            caminho = caminho or self.caminho
+            protocolo = carregar_protocolo(caminho)
+            self.caminho, self.protocolo = caminho, protocolo
+        return protocolo
+
+    def mascara(self, fluxograma: str, discriminadores: Iterable[str]) -> int:
+        return self.protocolo.fluxograma(fluxograma).mascara(discriminadores)
+
+    def classificar(self, fluxograma: str, discriminadores: Iterable[str]) -> Risco:
+        return self.protocolo.fluxograma(fluxograma).classificar(discriminadores)
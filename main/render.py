@@ -0,0 +1,59 @@
+import sys
+from functools import lru_cache
+
+from main.cache import CacheLRU
+from main.domain import Atendimento
+
+TAMANHO_CACHE = 65_536
+
+
+@lru_cache(maxsize=None)
+def cores_erro():
+    """Códigos de cor das mensagens de erro; o colorama só é importado na primeira mensagem de erro."""
+    from colorama import Fore, Style
+    return Fore.RED, Style.RESET_ALL
+
+class Tela:
+    """
+    Buffer de saída do terminal: o texto de uma tela é acumulado e escrito de uma só vez em
+    `descarregar`, com uma única chamada de write na saída.
+
+    Attributes:
+        saida: Arquivo de texto onde a tela é escrita (por padrão, sys.stdout).
+        cores: Se falso, as mensagens de erro são escritas sem os códigos de cor.
+    """
+    def __init__(self, saida=None, cores: bool = True):
+        self.saida = saida
+        self.cores = cores
+        self.partes = []
+
+    def escrever(self, texto: str = ""):
+        self.partes.append(texto)
+        self.partes.append("\n")
+
+    def erro(self, texto: str):
+        if self.cores:
+            inicio, fim = cores_erro()
+            self.partes.append(inicio)
+            self.partes.append(texto)
+            self.partes.append(fim + "\n")
+        else:
+            self.escrever(texto)
+
+    def descarregar(self):
+        if self.partes:
+            saida = self.saida if self.saida is not None else sys.stdout
+            saida.write("".join(self.partes))
+            saida.flush()
+            self.partes.clear()
+
+_textos = CacheLRU(TAMANHO_CACHE)
+
+def formatar_atendimento(atendimento: Atendimento) -> str:
+    """
+    Texto de str(atendimento), guardado em cache pelos valores dos campos, de modo que um histórico
+    exibido novamente não é formatado outra vez.
+    """
+    paciente = atendimento.paciente
+    chave = (paciente.nome, paciente.cpf, atendimento.risco, atendimento.entrada)
+    return _textos.obter(chave, lambda _: str(atendimento))
@@ -1,45 +1,192 @@
-from typing import List
+import bisect
+import heapq
+import itertools
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
 
-from main.domain import Paciente, Atendimento
+from main.domain import Paciente, Atendimento, Risco
 
-from main.error import CPFDuplicadoError, PacienteNaoCadastradoError
+from main.error import CPFDuplicadoError, PacienteNaoCadastradoError, PersistenciaError, ValidacaoError
+
+TAMANHO_PREFIXO_NOME = 3
+_NAO_DIGITO = re.compile(r"[^0-9]")
+
+
+def normalizar_cpf(cpf: str) -> str:
+    if cpf.isdigit():
+        return cpf
+    return _NAO_DIGITO.sub("", cpf)
+
+def normalizar_nome(nome: str) -> str:
+    return " ".join(nome.split()).lower()
+
+def validar_paginacao(inicio: int, limite: Optional[int]):
+    if inicio < 0 or (limite is not None and limite < 0):
+        raise ValidacaoError('Parâmetros de paginação inválidos')
 
 class PacienteRepository:
     """
     Gerencia o armazenamento e recuperação de pacientes no sistema (apenas em memória).
+
+    Os pacientes são indexados pelo CPF normalizado (busca e verificação de duplicidade em O(1)),
+    com índices secundários por e-mail e pelo prefixo do nome.
     """
     def __init__(self):
-        self.pacientes: List[Paciente] = []
+        self.pacientes: Dict[str, Paciente] = {}
+        self.indice_email: Dict[str, List[str]] = {}
+        self.indice_nome: Dict[str, List[str]] = {}
 
     def inserir(self, paciente: Paciente):
-        self.pacientes.append(paciente)
+        cpf = normalizar_cpf(paciente.cpf)
+        if cpf in self.pacientes:
+            raise CPFDuplicadoError('Já existe um paciente cadastrado com este CPF')
+        self.pacientes[cpf] = paciente
+        self.indice_email.setdefault(paciente.email.lower(), []).append(cpf)
+        chave = normalizar_nome(paciente.nome)[:TAMANHO_PREFIXO_NOME]
+        self.indice_nome.setdefault(chave, []).append(cpf)
+
+    def inserir_lote(self, pacientes: Iterable[Paciente]):
+        for paciente in pacientes:
+            self.inserir(paciente)
 
     def buscar(self, cpf: str):
-        for p in self.pacientes:
-            if p.cpf == cpf:
-                return p
-        return None
+        return self.pacientes.get(normalizar_cpf(cpf))
+
+    def buscar_por_email(self, email: str) -> List[Paciente]:
+        return [self.pacientes[cpf] for cpf in self.indice_email.get(email.lower(), [])]
+
+    def buscar_por_nome(self, prefixo: str) -> List[Paciente]:
+        prefixo = normalizar_nome(prefixo)
+        if len(prefixo) >= TAMANHO_PREFIXO_NOME:
+            candidatos = self.indice_nome.get(prefixo[:TAMANHO_PREFIXO_NOME], [])
+        else:
+            candidatos = [cpf for chave, cpfs in self._itens_indice_nome() if chave.startswith(prefixo) for cpf in cpfs]
+        pacientes = (self.pacientes[cpf] for cpf in candidatos)
+        return [p for p in pacientes if normalizar_nome(p.nome).startswith(prefixo)]
+
+    def _itens_indice_nome(self):
+        return self.indice_nome.items()
+
+    def tamanho(self):
+        return len(self.pacientes)
 
 class AtendimentoRepository:
     """
     Gerencia o armazenamento e recuperação de atendimentos no sistema (apenas em memória).
+
+    Além da lista geral, mantém um índice por CPF com os atendimentos de cada paciente ordenados
+    pela data de entrada, de modo que o histórico custa O(log k + página) no número k de
+    atendimentos do paciente.
+
+    Com um ArquivoAtendimentos (main.archive), os atendimentos concluídos podem ser movidos para o
+    arquivo em disco com `arquivar`, deixando a memória apenas com os atendimentos em andamento;
+    o histórico e a contagem consideram os dois.
     """
-    def __init__(self, paciente_repository: PacienteRepository):
+    def __init__(self, paciente_repository: PacienteRepository, arquivo=None):
         self.paciente_repository = paciente_repository
+        self.arquivo = arquivo
         self.atendimentos: List[Atendimento] = []
+        self.indice_cpf: Dict[str, List[Atendimento]] = {}
+        self.indice_entrada: Dict[str, List[datetime]] = {}
 
     def inserir(self, atendimento: Atendimento):
         if self.paciente_repository.buscar(atendimento.paciente.cpf) == None:
             raise PacienteNaoCadastradoError('Paciente não cadastrado')
         else:
             self.atendimentos.append(atendimento)
+            cpf = normalizar_cpf(atendimento.paciente.cpf)
+            historico = self.indice_cpf.setdefault(cpf, [])
+            entradas = self.indice_entrada.setdefault(cpf, [])
+            posicao = bisect.bisect_right(entradas, atendimento.entrada)
+            historico.insert(posicao, atendimento)
+            entradas.insert(posicao, atendimento.entrada)
+
+    def arquivar(self, atendimentos: Iterable[Atendimento]) -> int:
+        """
+        Move os atendimentos da memória para o arquivo e retorna quantos foram movidos. Atendimentos
+        que não estão no repositório (ou repetidos) são ignorados. Se a gravação falhar, nada é
+        alterado: o arquivo é truncado de volta e os atendimentos continuam em memória.
+        """
+        if self.arquivo is None:
+            raise PersistenciaError('Repositório sem arquivo de atendimentos')
+        selecionados = []
+        vistos = set()
+        for atendimento in atendimentos:
+            if id(atendimento) not in vistos and self._posicao(atendimento) is not None:
+                vistos.add(id(atendimento))
+                selecionados.append(atendimento)
+        if not selecionados:
+            return 0
+        self.arquivo.anexar_lote(selecionados)
+        for atendimento in selecionados:
+            cpf = normalizar_cpf(atendimento.paciente.cpf)
+            historico, entradas = self.indice_cpf[cpf], self.indice_entrada[cpf]
+            posicao = self._posicao(atendimento)
+            del historico[posicao]
+            del entradas[posicao]
+            if not historico:
+                del self.indice_cpf[cpf], self.indice_entrada[cpf]
+        self.atendimentos = [a for a in self.atendimentos if id(a) not in vistos]
+        return len(selecionados)
+
+    def _posicao(self, atendimento: Atendimento) -> Optional[int]:
+        """Posição do atendimento no índice do seu CPF, ou None se ele não estiver no repositório."""
+        cpf = normalizar_cpf(atendimento.paciente.cpf)
+        historico = self.indice_cpf.get(cpf)
+        if historico is None:
+            return None
+        entradas = self.indice_entrada[cpf]
+        posicao = bisect.bisect_left(entradas, atendimento.entrada)
+        while posicao < len(historico) and entradas[posicao] == atendimento.entrada:
+            if historico[posicao] is atendimento:
+                return posicao
+            posicao += 1
+        return None
 
-    def historico_atendimentos(self, cpf: str):
-        historico = []
+    def _intervalo(self, cpf: str, desde: Optional[datetime], ate: Optional[datetime]):
         if self.paciente_repository.buscar(cpf) == None:
             raise PacienteNaoCadastradoError('Paciente não cadastrado')
-        else:
-            for i in range(0, len(self.atendimentos) - 1):
-                if self.atendimentos[i].paciente.cpf == cpf:
-                    historico.append(self.atendimentos[i])
-            return historico
\ No newline at end of file
+        entradas, historico = self._indice(normalizar_cpf(cpf))
+        inicio = 0 if desde is None else bisect.bisect_left(entradas, desde)
+        fim = len(entradas) if ate is None else bisect.bisect_right(entradas, ate)
+        return historico, inicio, max(inicio, fim)
+
+    def _indice(self, cpf: str):
+        return self.indice_entrada.get(cpf, []), self.indice_cpf.get(cpf, [])
+
+    def historico_atendimentos(self, cpf: str, desde: Optional[datetime] = None, ate: Optional[datetime] = None,
+                               inicio: int = 0, limite: Optional[int] = None) -> List[Atendimento]:
+        """
+        Retorna os atendimentos do paciente em ordem de entrada.
+
+        Args:
+            cpf: CPF do paciente.
+            desde: Se informado, apenas atendimentos com entrada a partir desta data.
+            ate: Se informado, apenas atendimentos com entrada até esta data.
+            inicio: Quantidade de atendimentos a pular (paginação).
+            limite: Quantidade máxima de atendimentos retornados (paginação).
+        """
+        validar_paginacao(inicio, limite)
+        historico, primeiro, ultimo = self._intervalo(cpf, desde, ate)
+        if self.arquivo is not None and self.arquivo.contar(cpf, desde, ate):
+            return self._historico_arquivado(cpf, desde, ate, historico[primeiro:ultimo], inicio, limite)
+        primeiro = min(primeiro + inicio, ultimo)
+        if limite is not None:
+            ultimo = min(ultimo, primeiro + limite)
+        return historico[primeiro:ultimo]
+
+    def _historico_arquivado(self, cpf: str, desde: Optional[datetime], ate: Optional[datetime],
+                             em_memoria: List[Atendimento], inicio: int, limite: Optional[int]) -> List[Atendimento]:
+        """Intercala, pela entrada, os registros arquivados com os atendimentos em memória."""
+        paciente = self.paciente_repository.buscar(cpf)
+        arquivados = (Atendimento(paciente, Risco(risco), datetime.fromtimestamp(entrada))
+                      for _, risco, entrada in self.arquivo.historico(cpf, desde, ate))
+        intercalados = heapq.merge(arquivados, em_memoria, key=lambda atendimento: atendimento.entrada)
+        return list(itertools.islice(intercalados, inicio, None if limite is None else inicio + limite))
+
+    def contar_atendimentos(self, cpf: str, desde: Optional[datetime] = None, ate: Optional[datetime] = None) -> int:
+        _, primeiro, ultimo = self._intervalo(cpf, desde, ate)
+        if self.arquivo is not None:
+            return ultimo - primeiro + self.arquivo.contar(cpf, desde, ate)
+        return ultimo - primeiro
@@ -0,0 +1,239 @@
+import argparse
+import asyncio
+import json
+import logging
+from http import HTTPStatus
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from main.domain import Atendimento, FichaAnalise, Paciente, Risco
+from main.error import FilaVaziaError, PacienteNaoCadastradoError, PSBaseError, ValidacaoError
+from main.service import ProntoSocorroService
+
+TAMANHO_MAXIMO_CABECALHO = 16 * 1024
+TAMANHO_MAXIMO_CORPO = 1024 * 1024
+CAMPOS_PACIENTE = ("nome", "cpf", "email", "nascimento")
+CAMPOS_FICHA = ("risco_morte", "gravidade_alta", "gravidade_moderada", "gravidade_baixa")
+
+log = logging.getLogger(__name__)
+
+
+def paciente_json(paciente: Paciente) -> dict:
+    return {"nome": paciente.nome, "cpf": paciente.cpf, "email": paciente.email, "nascimento": paciente.nascimento}
+
+def atendimento_json(atendimento: Atendimento) -> dict:
+    return {"paciente": paciente_json(atendimento.paciente), "risco": atendimento.risco.name,
+            "entrada": atendimento.entrada.isoformat()}
+
+class RequisicaoInvalida(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        self.status = status
+        self.message = message
+
+class ServidorHTTP:
+    """
+    Front-end HTTP/JSON assíncrono para o ProntoSocorroService, usando apenas a biblioteca padrão.
+
+    Cada conexão é atendida por uma corrotina que lê as requisições em sequência, com keep-alive
+    (HTTP/1.1) e suporte a pipelining: requisições enviadas em sequência sem aguardar as respostas
+    são respondidas na ordem em que chegaram. As operações do serviço são executadas no próprio
+    laço de eventos, que é single-thread, portanto não há acesso concorrente ao serviço.
+
+    Rotas:
+        POST /pacientes                        registra um paciente
+        POST /atendimentos                     classifica o risco, registra o atendimento e o insere na fila
+        POST /fila/proximo                     chama o próximo paciente da fila
+        GET  /pacientes/{cpf}/historico        histórico de atendimentos (?inicio=&limite=)
+    """
+    def __init__(self, ps_service: ProntoSocorroService):
+        self.ps_service = ps_service
+        self.servidor: Optional[asyncio.AbstractServer] = None
+
+    async def iniciar(self, host: str = "127.0.0.1", porta: int = 8080) -> asyncio.AbstractServer:
+        self.servidor = await asyncio.start_server(self.atender_conexao, host, porta, backlog=4096)
+        return self.servidor
+
+    async def atender_conexao(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    requisicao = await self._ler_requisicao(reader)
+                except RequisicaoInvalida as e:
+                    writer.write(self._resposta(e.status, {"erro": e.message}, manter_conexao=False))
+                    break
+                if requisicao is None:
+                    break
+                metodo, alvo, corpo, manter_conexao = requisicao
+                status, dados = self.processar(metodo, alvo, corpo)
+                writer.write(self._resposta(status, dados, manter_conexao))
+                if not manter_conexao:
+                    break
+                await writer.drain()
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _ler_requisicao(self, reader: asyncio.StreamReader):
+        try:
+            cabecalho = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise RequisicaoInvalida(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Cabeçalho muito grande.")
+        if len(cabecalho) > TAMANHO_MAXIMO_CABECALHO:
+            raise RequisicaoInvalida(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Cabeçalho muito grande.")
+
+        linhas = cabecalho.decode("latin-1").split("\r\n")
+        try:
+            metodo, alvo, versao = linhas[0].split(" ")
+        except ValueError:
+            raise RequisicaoInvalida(HTTPStatus.BAD_REQUEST, "Linha de requisição inválida.")
+        campos = {}
+        for linha in linhas[1:]:
+            if linha:
+                nome, _, valor = linha.partition(":")
+                campos[nome.strip().lower()] = valor.strip()
+
+        try:
+            tamanho = int(campos.get("content-length", "0") or 0)
+        except ValueError:
+            raise RequisicaoInvalida(HTTPStatus.BAD_REQUEST, "Content-Length inválido.")
+        if tamanho < 0:
+            raise RequisicaoInvalida(HTTPStatus.BAD_REQUEST, "Content-Length inválido.")
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            raise RequisicaoInvalida(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Corpo da requisição muito grande.")
+        corpo = await reader.readexactly(tamanho) if tamanho else b""
+
+        conexao = campos.get("connection", "").lower()
+        manter_conexao = conexao != "close" if versao == "HTTP/1.1" else conexao == "keep-alive"
+        return metodo, alvo, corpo, manter_conexao
+
+    @staticmethod
+    def _resposta(status: HTTPStatus, dados, manter_conexao: bool) -> bytes:
+        corpo = json.dumps(dados, ensure_ascii=False).encode()
+        cabecalho = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                     f"Content-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(corpo)}\r\n"
+                     f"Connection: {'keep-alive' if manter_conexao else 'close'}\r\n\r\n")
+        return cabecalho.encode() + corpo
+
+    # --- rotas ---
+
+    def processar(self, metodo: str, alvo: str, corpo: bytes) -> Tuple[HTTPStatus, object]:
+        url = urlsplit(alvo)
+        partes = [parte for parte in url.path.split("/") if parte]
+        try:
+            if metodo == "POST" and partes == ["pacientes"]:
+                return HTTPStatus.CREATED, self.registrar_paciente(self._json(corpo))
+            if metodo == "POST" and partes == ["atendimentos"]:
+                return HTTPStatus.CREATED, self.registrar_atendimento(self._json(corpo))
+            if metodo == "POST" and partes == ["fila", "proximo"]:
+                return HTTPStatus.OK, atendimento_json(self.ps_service.chamar_proximo())
+            if metodo == "GET" and len(partes) == 3 and partes[0] == "pacientes" and partes[2] == "historico":
+                return HTTPStatus.OK, self.buscar_historico(partes[1], parse_qs(url.query))
+            return HTTPStatus.NOT_FOUND, {"erro": "Rota não encontrada."}
+        except RequisicaoInvalida as e:
+            return e.status, {"erro": e.message}
+        except (PacienteNaoCadastradoError, FilaVaziaError) as e:
+            return HTTPStatus.NOT_FOUND, {"erro": e.message}
+        except PSBaseError as e:
+            return HTTPStatus.UNPROCESSABLE_ENTITY, {"erro": e.message}
+        except Exception:
+            # Uma falha inesperada responde 500 sem derrubar a conexão nem o servidor.
+            log.exception("Erro ao processar %s %s", metodo, alvo)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"erro": "Erro interno do servidor."}
+
+    @staticmethod
+    def _json(corpo: bytes) -> dict:
+        try:
+            dados = json.loads(corpo)
+        except ValueError:
+            raise RequisicaoInvalida(HTTPStatus.BAD_REQUEST, "JSON inválido.")
+        if not isinstance(dados, dict):
+            raise RequisicaoInvalida(HTTPStatus.BAD_REQUEST, "O corpo da requisição deve ser um objeto JSON.")
+        return dados
+
+    @staticmethod
+    def _campo(dados: dict, campo: str, tipo: type):
+        """Valor do campo (None se ausente ou nulo), que deve ser do tipo `tipo`."""
+        valor = dados.get(campo)
+        if valor is not None and not isinstance(valor, tipo):
+            raise RequisicaoInvalida(HTTPStatus.BAD_REQUEST, f"Tipo inválido para o campo: {campo}")
+        return valor
+
+    def registrar_paciente(self, dados: dict) -> dict:
+        valores = []
+        for campo in CAMPOS_PACIENTE:
+            valor = self._campo(dados, campo, str)
+            if valor is None:
+                raise ValidacaoError(f"Campo obrigatório ausente: {campo}")
+            valores.append(valor)
+        return paciente_json(self.ps_service.registrar_paciente(*valores))
+
+    def registrar_atendimento(self, dados: dict) -> dict:
+        paciente = self.ps_service.buscar_paciente(self._campo(dados, "cpf", str) or "")
+        if paciente is None:
+            raise PacienteNaoCadastradoError("Paciente não encontrado.")
+        if "risco" in dados:
+            try:
+                risco = Risco[(self._campo(dados, "risco", str) or "").upper()]
+            except KeyError:
+                raise ValidacaoError("Risco inválido.")
+        else:
+            risco = self.ps_service.classificar_risco(
+                FichaAnalise(*(bool(self._campo(dados, campo, bool)) for campo in CAMPOS_FICHA)))
+        atendimento = self.ps_service.registrar_atendimento(paciente, risco)
+        self.ps_service.inserir_fila_atendimento(atendimento)
+        return atendimento_json(atendimento)
+
+    def buscar_historico(self, cpf: str, parametros: dict) -> list:
+        paciente = self.ps_service.buscar_paciente(cpf)
+        if paciente is None:
+            raise PacienteNaoCadastradoError("Paciente não encontrado.")
+        try:
+            inicio = int(parametros.get("inicio", ["0"])[0])
+            limite = int(parametros["limite"][0]) if "limite" in parametros else None
+        except ValueError:
+            raise RequisicaoInvalida(HTTPStatus.BAD_REQUEST, "Parâmetros de paginação inválidos.")
+        if inicio < 0 or (limite is not None and limite < 0):
+            raise RequisicaoInvalida(HTTPStatus.BAD_REQUEST, "Parâmetros de paginação inválidos.")
+        return [atendimento_json(a) for a in self.ps_service.buscar_historico(paciente, inicio=inicio, limite=limite)]
+
+
+async def servir(ps_service: ProntoSocorroService, host: str, porta: int):
+    servidor = await ServidorHTTP(ps_service).iniciar(host, porta)
+    print(f"Servidor do pronto-socorro em http://{host}:{porta}")
+    async with servidor:
+        await servidor.serve_forever()
+
+def main(argumentos=None):
+    from main.repository import PacienteRepository, AtendimentoRepository
+
+    parser = argparse.ArgumentParser(description="Servidor HTTP/JSON do pronto-socorro.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8080)
+    parser.add_argument("--trace", help="Grava um trace (formato do Chrome) das operações ao encerrar.")
+    parser.add_argument("--amostragem", type=int, default=100,
+                        help="Com --trace, grava uma a cada N operações (padrão: 100).")
+    opcoes = parser.parse_args(argumentos)
+
+    pacientes = PacienteRepository()
+    ps_service = ProntoSocorroService(pacientes, AtendimentoRepository(pacientes))
+    perfilador = None
+    if opcoes.trace:
+        from main.profiling import Perfilador
+        perfilador = Perfilador(opcoes.amostragem)
+        perfilador.instrumentar_servico(ps_service)
+    try:
+        asyncio.run(servir(ps_service, opcoes.host, opcoes.porta))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if perfilador is not None:
+            perfilador.salvar_trace(opcoes.trace)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,177 @@
-from typing import List
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
 
-from main.domain import *
-from main.repository import PacienteRepository, AtendimentoRepository
+from main import triage
+from main.domain import (ATENDIMENTO_REGISTRADO, FILA_INSERIDO, FILA_REMOVIDO, PACIENTE_CHAMADO,
+                         PACIENTE_REGISTRADO, RISCO_RECLASSIFICADO, Atendimento, FichaAnalise, FilaAtendimento,
+                         Paciente, Risco)
+from main.error import ValidacaoError
+from main.policy import PoliticaPrioridade
+from main.repository import PacienteRepository, AtendimentoRepository, normalizar_cpf
 
 
 class ProntoSocorroService:
     """
     Serviço principal do pronto-socorro, responsável por coordenar as operações do sistema.
     """
-    def __init__(self, pacientes: PacienteRepository, atendimentos: AtendimentoRepository):
+    def __init__(self, pacientes: PacienteRepository, atendimentos: AtendimentoRepository, fila=None, politica=None,
+                 protocolo=None, metricas=None, eventos=None, cache=None, estimador=None,
+                 analise=None):
+        """
+        Args:
+            pacientes: Repositório de pacientes.
+            atendimentos: Repositório de atendimentos.
+            fila: Implementação da fila de atendimento (FilaAtendimento ou FilaAtendimentoMultinivel).
+                Por padrão, é utilizada uma FilaAtendimento.
+            politica: Política de chamada do próximo paciente (PoliticaPrioridade ou
+                PoliticaEnvelhecimento). Por padrão, é utilizada a PoliticaPrioridade.
+            protocolo: MotorProtocolo usado por classificar_protocolo. Por padrão, o protocolo
+                de main/protocolos/manchester.txt é carregado no primeiro uso.
+            metricas: MetricasFila atualizada a cada paciente inserido na fila ou chamado.
+                Por padrão, nenhuma métrica é coletada.
+            eventos: BarramentoEventos onde cada alteração (paciente registrado, atendimento
+                registrado, inserido, removido, reclassificado ou chamado) é publicada.
+                Por padrão, nenhum evento é publicado.
+            cache: CacheServico usado por buscar_paciente e buscar_historico. Por padrão, as
+                consultas vão sempre aos repositórios.
+            estimador: EstimadorEspera usado por estimar_espera, atualizado a cada alteração da
+                fila. Por padrão, nenhuma estimativa é mantida.
+            analise: AnaliseAtendimentos que recebe cada atendimento registrado, a espera de
+                cada atendimento chamado e os retirados da fila. Por padrão, nenhum relatório é
+                mantido.
+        """
         self.pacientes = pacientes
         self.atendimentos = atendimentos
-        self.fila_atendimento = FilaAtendimento()
+        self.fila_atendimento = fila if fila is not None else FilaAtendimento()
+        self.politica = politica if politica is not None else PoliticaPrioridade()
+        self.protocolo = protocolo
+        self.metricas = metricas
+        self.eventos = eventos
+        self.cache = cache
+        self.estimador = estimador
+        self.analise = analise
+        # Atendimentos chamados ou retirados da fila, a mover para o arquivo do repositório (se houver).
+        self.concluidos = [] if getattr(atendimentos, "arquivo", None) is not None else None
 
     def registrar_paciente(self, nome, cpf, email, nascimento):
         paciente = Paciente(nome, cpf, email, nascimento)
         self.pacientes.inserir(paciente)
+        if self.cache is not None:
+            self.cache.pacientes.guardar(normalizar_cpf(cpf), paciente)
+        if self.eventos is not None:
+            self.eventos.publicar(PACIENTE_REGISTRADO, paciente)
         return paciente
 
+    def buscar_paciente(self, cpf: str) -> Optional[Paciente]:
+        if self.cache is None:
+            return self.pacientes.buscar(cpf)
+        return self.cache.pacientes.obter(normalizar_cpf(cpf), self.pacientes.buscar)
+
     def classificar_risco(self, ficha: FichaAnalise) -> Risco:
-        if ficha.risco_morte:
-            return Risco.VERMELHO
-        if ficha.gravidade_alta:
-            return Risco.AMARELO
-        if ficha.gravidade_moderada:
-            return Risco.LARANJA
-        if ficha.gravidade_baixa:
-            return Risco.VERDE
-        else:
-            return Risco.AZUL
+        return triage.classificar(ficha)
+
+    def classificar_risco_lote(self, fichas):
+        """Classifica várias fichas com as mesmas regras de classificar_risco (ver triage.classificar_lote)."""
+        return triage.classificar_lote(fichas)
+
+    def classificar_protocolo(self, fluxograma: str, discriminadores) -> Risco:
+        """Classifica o risco pelos discriminadores presentes em um fluxograma do protocolo de triagem."""
+        if self.protocolo is None:
+            from main.protocol import MotorProtocolo
+            self.protocolo = MotorProtocolo()
+        return self.protocolo.classificar(fluxograma, discriminadores)
 
     def registrar_atendimento(self, paciente: Paciente, risco: Risco) -> Atendimento:
         atendimento = Atendimento(paciente, risco)
         self.atendimentos.inserir(atendimento)
+        if self.cache is not None:
+            self.cache.historicos.invalidar_grupo(normalizar_cpf(paciente.cpf))
+        if self.analise is not None:
+            self.analise.inserir(atendimento)
+        if self.eventos is not None:
+            self.eventos.publicar(ATENDIMENTO_REGISTRADO, atendimento)
         return atendimento
 
     def inserir_fila_atendimento(self, atendimento: Atendimento) -> bool:
         self.fila_atendimento.inserir(atendimento)
+        if self.metricas is not None:
+            self.metricas.registrar_chegada(atendimento)
+        if self.estimador is not None:
+            self.estimador.inserir(atendimento)
+        if self.eventos is not None:
+            self.eventos.publicar(FILA_INSERIDO, atendimento)
         return True
 
+    def remover_fila_atendimento(self, atendimento: Atendimento) -> bool:
+        self.fila_atendimento.remover(atendimento)
+        if self.estimador is not None:
+            self.estimador.remover(atendimento)
+        if self.analise is not None:
+            self.analise.descartar(atendimento)
+        if self.concluidos is not None:
+            self.concluidos.append(atendimento)
+        if self.eventos is not None:
+            self.eventos.publicar(FILA_REMOVIDO, atendimento)
+        return True
+
+    def reclassificar_risco(self, atendimento: Atendimento, risco: Risco) -> Atendimento:
+        risco_anterior = atendimento.risco
+        self.fila_atendimento.reclassificar(atendimento, risco)
+        if self.estimador is not None:
+            self.estimador.reclassificar(atendimento, risco_anterior)
+        if self.eventos is not None:
+            self.eventos.publicar(RISCO_RECLASSIFICADO, atendimento)
+        return atendimento
+
     def chamar_proximo(self) -> Atendimento:
-        return self.fila_atendimento.proximo()
+        atendimento = self.politica.proximo(self.fila_atendimento)
+        if self.metricas is not None:
+            self.metricas.registrar_chamada(atendimento)
+        if self.estimador is not None:
+            self.estimador.registrar_chamada(atendimento)
+        if self.analise is not None:
+            self.analise.registrar_chamada(atendimento)
+        if self.concluidos is not None:
+            self.concluidos.append(atendimento)
+        if self.eventos is not None:
+            self.eventos.publicar(PACIENTE_CHAMADO, atendimento)
+        return atendimento
+
+    def estimar_espera(self, atendimento: Atendimento) -> Optional[timedelta]:
+        """
+        Tempo de espera estimado de um atendimento na fila (ver EstimadorEspera), ou None enquanto
+        não houver chamadas suficientes para estimar.
+        """
+        if self.estimador is None:
+            raise ValidacaoError('O serviço não possui um estimador de espera.')
+        return self.estimador.estimar(atendimento)
+
+    def estimar_espera_fila(self) -> List[Tuple[Atendimento, Optional[timedelta]]]:
+        """Estimativas de espera de toda a fila de uma só vez, para o redesenho da tela de chamada."""
+        if self.estimador is None:
+            raise ValidacaoError('O serviço não possui um estimador de espera.')
+        return self.estimador.estimar_todos()
+
+    def arquivar_concluidos(self) -> int:
+        """
+        Move para o arquivo do repositório de atendimentos os atendimentos já chamados ou retirados
+        da fila, e retorna quantos foram movidos.
+        """
+        if not self.concluidos:
+            return 0
+        concluidos, self.concluidos = self.concluidos, []
+        try:
+            return self.atendimentos.arquivar(concluidos)
+        except Exception:
+            # Nada foi arquivado: os concluídos voltam para a próxima tentativa.
+            self.concluidos = concluidos + self.concluidos
+            raise
 
-    def buscar_historico(self, paciente: Paciente) -> List[Atendimento]:
-        return self.atendimentos.historico_atendimentos(paciente.cpf)
\ No newline at end of file
+    def buscar_historico(self, paciente: Paciente, desde: Optional[datetime] = None, ate: Optional[datetime] = None,
+                         inicio: int = 0, limite: Optional[int] = None) -> List[Atendimento]:
+        if self.cache is None:
+            return self.atendimentos.historico_atendimentos(paciente.cpf, desde, ate, inicio, limite)
+        chave = (normalizar_cpf(paciente.cpf), desde, ate, inicio, limite)
+        historico = self.cache.historicos.obter(
+            chave, lambda chave: self.atendimentos.historico_atendimentos(*chave))
+        return list(historico)
\ No newline at end of file
@@ -0,0 +1,158 @@
+import sqlite3
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from main.domain import Paciente, Atendimento, Risco
+from main.error import CPFDuplicadoError, PacienteNaoCadastradoError
+from main.repository import normalizar_cpf, normalizar_nome, validar_paginacao
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS pacientes (
+    cpf TEXT PRIMARY KEY,
+    nome TEXT NOT NULL,
+    nome_normalizado TEXT NOT NULL,
+    email TEXT NOT NULL,
+    nascimento TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pacientes_email ON pacientes (email COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS pacientes_nome ON pacientes (nome_normalizado);
+CREATE TABLE IF NOT EXISTS atendimentos (
+    id INTEGER PRIMARY KEY,
+    cpf TEXT NOT NULL REFERENCES pacientes (cpf),
+    risco INTEGER NOT NULL,
+    entrada TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS atendimentos_cpf_entrada ON atendimentos (cpf, entrada);
+"""
+
+# As instruções abaixo são constantes, de modo que o cache de instruções preparadas do módulo
+# sqlite3 as compila apenas uma vez por conexão.
+SQL_INSERIR_PACIENTE = "INSERT INTO pacientes (cpf, nome, nome_normalizado, email, nascimento) VALUES (?, ?, ?, ?, ?)"
+SQL_BUSCAR_PACIENTE = "SELECT nome, cpf, email, nascimento FROM pacientes WHERE cpf = ?"
+SQL_EXISTE_PACIENTE = "SELECT 1 FROM pacientes WHERE cpf = ?"
+SQL_BUSCAR_POR_EMAIL = "SELECT nome, cpf, email, nascimento FROM pacientes WHERE email = ? COLLATE NOCASE ORDER BY rowid"
+SQL_BUSCAR_POR_NOME = ("SELECT nome, cpf, email, nascimento FROM pacientes "
+                       "WHERE nome_normalizado >= ? AND nome_normalizado < ? ORDER BY rowid")
+SQL_CONTAR_PACIENTES = "SELECT COUNT(*) FROM pacientes"
+SQL_INSERIR_ATENDIMENTO = "INSERT INTO atendimentos (cpf, risco, entrada) VALUES (?, ?, ?)"
+SQL_HISTORICO = ("SELECT risco, entrada FROM atendimentos WHERE cpf = ? AND entrada >= ? AND entrada <= ? "
+                 "ORDER BY entrada, id LIMIT ? OFFSET ?")
+SQL_CONTAR_ATENDIMENTOS = "SELECT COUNT(*) FROM atendimentos WHERE cpf = ? AND entrada >= ? AND entrada <= ?"
+
+# Limites usados quando o filtro de data não é informado (as datas são gravadas em ISO 8601).
+ENTRADA_MINIMA = ""
+ENTRADA_MAXIMA = "\uffff"
+
+
+def conectar(caminho: str = ":memory:") -> sqlite3.Connection:
+    """
+    Abre uma conexão com o banco de dados em modo WAL e cria as tabelas e índices, se necessário.
+    """
+    conexao = sqlite3.connect(caminho, cached_statements=256, check_same_thread=False)
+    conexao.execute("PRAGMA journal_mode = WAL")
+    conexao.execute("PRAGMA synchronous = NORMAL")
+    conexao.execute("PRAGMA foreign_keys = ON")
+    conexao.executescript(ESQUEMA)
+    return conexao
+
+def _paciente(linha) -> Optional[Paciente]:
+    return Paciente(*linha) if linha is not None else None
+
+class PacienteRepositorySQLite:
+    """
+    Gerencia o armazenamento e recuperação de pacientes em um banco de dados SQLite.
+
+    Possui a mesma interface de PacienteRepository e pode ser usado no seu lugar pelo
+    ProntoSocorroService, permitindo cadastros maiores que a memória disponível.
+    """
+    def __init__(self, conexao: sqlite3.Connection):
+        self.conexao = conexao
+
+    @staticmethod
+    def _linha(paciente: Paciente):
+        cpf = normalizar_cpf(paciente.cpf)
+        return cpf, paciente.nome, normalizar_nome(paciente.nome), paciente.email, paciente.nascimento
+
+    def inserir(self, paciente: Paciente):
+        try:
+            with self.conexao:
+                self.conexao.execute(SQL_INSERIR_PACIENTE, self._linha(paciente))
+        except sqlite3.IntegrityError:
+            raise CPFDuplicadoError('Já existe um paciente cadastrado com este CPF')
+
+    def inserir_lote(self, pacientes: Iterable[Paciente]):
+        """Insere vários pacientes em uma única transação. Se algum CPF já existir, nenhum é inserido."""
+        try:
+            with self.conexao:
+                self.conexao.executemany(SQL_INSERIR_PACIENTE, map(self._linha, pacientes))
+        except sqlite3.IntegrityError:
+            raise CPFDuplicadoError('Já existe um paciente cadastrado com este CPF')
+
+    def buscar(self, cpf: str):
+        return _paciente(self.conexao.execute(SQL_BUSCAR_PACIENTE, (normalizar_cpf(cpf),)).fetchone())
+
+    def existe(self, cpf: str) -> bool:
+        return self.conexao.execute(SQL_EXISTE_PACIENTE, (normalizar_cpf(cpf),)).fetchone() is not None
+
+    def buscar_por_email(self, email: str) -> List[Paciente]:
+        return [Paciente(*linha) for linha in self.conexao.execute(SQL_BUSCAR_POR_EMAIL, (email,))]
+
+    def buscar_por_nome(self, prefixo: str) -> List[Paciente]:
+        prefixo = normalizar_nome(prefixo)
+        linhas = self.conexao.execute(SQL_BUSCAR_POR_NOME, (prefixo, prefixo + "\uffff"))
+        return [Paciente(*linha) for linha in linhas]
+
+    def tamanho(self):
+        return self.conexao.execute(SQL_CONTAR_PACIENTES).fetchone()[0]
+
+class AtendimentoRepositorySQLite:
+    """
+    Gerencia o armazenamento e recuperação de atendimentos em um banco de dados SQLite.
+
+    Possui a mesma interface de AtendimentoRepository. O histórico de um paciente é lido pelo
+    índice (cpf, entrada).
+    """
+    def __init__(self, paciente_repository: PacienteRepositorySQLite):
+        self.paciente_repository = paciente_repository
+        self.conexao = paciente_repository.conexao
+
+    @staticmethod
+    def _linha(atendimento: Atendimento):
+        return normalizar_cpf(atendimento.paciente.cpf), atendimento.risco.value, atendimento.entrada.isoformat()
+
+    def inserir(self, atendimento: Atendimento):
+        if not self.paciente_repository.existe(atendimento.paciente.cpf):
+            raise PacienteNaoCadastradoError('Paciente não cadastrado')
+        with self.conexao:
+            self.conexao.execute(SQL_INSERIR_ATENDIMENTO, self._linha(atendimento))
+
+    def inserir_lote(self, atendimentos: Iterable[Atendimento]):
+        """Insere vários atendimentos em uma única transação."""
+        try:
+            with self.conexao:
+                self.conexao.executemany(SQL_INSERIR_ATENDIMENTO, map(self._linha, atendimentos))
+        except sqlite3.IntegrityError:
+            raise PacienteNaoCadastradoError('Paciente não cadastrado')
+
+    @staticmethod
+    def _limites(desde: Optional[datetime], ate: Optional[datetime]):
+        return (ENTRADA_MINIMA if desde is None else desde.isoformat(),
+                ENTRADA_MAXIMA if ate is None else ate.isoformat())
+
+    def historico_atendimentos(self, cpf: str, desde: Optional[datetime] = None, ate: Optional[datetime] = None,
+                               inicio: int = 0, limite: Optional[int] = None) -> List[Atendimento]:
+        validar_paginacao(inicio, limite)
+        paciente = self.paciente_repository.buscar(cpf)
+        if paciente is None:
+            raise PacienteNaoCadastradoError('Paciente não cadastrado')
+        parametros = (normalizar_cpf(cpf), *self._limites(desde, ate), -1 if limite is None else limite, inicio)
+        return [
+            Atendimento(paciente, Risco(risco), datetime.fromisoformat(entrada))
+            for risco, entrada in self.conexao.execute(SQL_HISTORICO, parametros)
+        ]
+
+    def contar_atendimentos(self, cpf: str, desde: Optional[datetime] = None, ate: Optional[datetime] = None) -> int:
+        if not self.paciente_repository.existe(cpf):
+            raise PacienteNaoCadastradoError('Paciente não cadastrado')
+        parametros = (normalizar_cpf(cpf), *self._limites(desde, ate))
+        return self.conexao.execute(SQL_CONTAR_ATENDIMENTOS, parametros).fetchone()[0]
@@ -0,0 +1,127 @@
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator
+
+from main.domain import Atendimento, Paciente, Risco
+from main.repository import normalizar_cpf
+from main.validation import converter_data
+
+
+@dataclass(frozen=True, slots=True)
+class PacienteCompacto:
+    """
+    Representação imutável e compacta de um paciente já validado.
+
+    Attributes:
+        nome: Nome completo do paciente.
+        cpf: CPF do paciente como inteiro (sem os zeros à esquerda).
+        email: E-mail do paciente.
+        nascimento: Data de nascimento como ordinal (date.toordinal()).
+    """
+    nome: str
+    cpf: int
+    email: str
+    nascimento: int
+
+    @classmethod
+    def de_paciente(cls, paciente: Paciente) -> "PacienteCompacto":
+        nascimento = converter_data(paciente.nascimento).toordinal()
+        return cls(paciente.nome, int(normalizar_cpf(paciente.cpf)), paciente.email, nascimento)
+
+    @property
+    def cpf_formatado(self) -> str:
+        return f"{self.cpf:011d}"
+
+@dataclass(frozen=True, slots=True)
+class AtendimentoCompacto:
+    """
+    Representação imutável e compacta de um atendimento, sem referência ao objeto Paciente.
+
+    Attributes:
+        cpf: CPF do paciente como inteiro.
+        risco: Valor do nível de risco (Risco.value).
+        entrada: Data e hora de entrada em segundos desde a época Unix.
+    """
+    cpf: int
+    risco: int
+    entrada: float
+
+    @classmethod
+    def de_atendimento(cls, atendimento: Atendimento) -> "AtendimentoCompacto":
+        cpf = int(normalizar_cpf(atendimento.paciente.cpf))
+        return cls(cpf, atendimento.risco.value, atendimento.entrada.timestamp())
+
+    def para_atendimento(self, paciente: Paciente) -> Atendimento:
+        return Atendimento(paciente, Risco(self.risco), datetime.fromtimestamp(self.entrada))
+
+class AtendimentoView:
+    """
+    Visão leve de um registro do AtendimentoStore; os campos são lidos das colunas sob demanda.
+    """
+    __slots__ = ("store", "indice")
+
+    def __init__(self, store: "AtendimentoStore", indice: int):
+        self.store = store
+        self.indice = indice
+
+    @property
+    def cpf(self) -> int:
+        return self.store.cpfs[self.indice]
+
+    @property
+    def risco(self) -> Risco:
+        return Risco(self.store.riscos[self.indice])
+
+    @property
+    def entrada(self) -> datetime:
+        return datetime.fromtimestamp(self.store.entradas[self.indice])
+
+    def __repr__(self):
+        return f"AtendimentoView(cpf={self.cpf:011d}, risco={self.risco.name}, entrada={self.entrada:%d/%m/%Y %X})"
+
+class AtendimentoStore:
+    """
+    Armazena atendimentos em colunas (array), com 17 bytes por registro: CPF (uint64), risco
+    (uint8) e entrada (double, segundos desde a época Unix).
+
+    Os registros são acessados por índice como AtendimentoView, e as colunas podem ser lidas sem
+    cópia por meio de `colunas()`.
+    """
+    def __init__(self):
+        self.cpfs = array("Q")
+        self.riscos = array("B")
+        self.entradas = array("d")
+
+    def inserir(self, atendimento: Atendimento) -> int:
+        """Acrescenta o atendimento ao final das colunas e retorna o seu índice."""
+        return self.inserir_valores(int(normalizar_cpf(atendimento.paciente.cpf)), atendimento.risco.value,
+                                    atendimento.entrada.timestamp())
+
+    def inserir_valores(self, cpf: int, risco: int, entrada: float) -> int:
+        self.cpfs.append(cpf)
+        self.riscos.append(risco)
+        self.entradas.append(entrada)
+        return len(self.cpfs) - 1
+
+    def colunas(self):
+        """
+        Retorna memoryviews (sem cópia) das colunas de CPF, risco e entrada.
+
+        Enquanto as memoryviews existirem, novas inserções levantam BufferError; libere-as com
+        `release()` ou use-as dentro de um bloco `with`.
+        """
+        return memoryview(self.cpfs), memoryview(self.riscos), memoryview(self.entradas)
+
+    def __len__(self):
+        return len(self.cpfs)
+
+    def __getitem__(self, indice: int) -> AtendimentoView:
+        if indice < 0:
+            indice += len(self.cpfs)
+        if not 0 <= indice < len(self.cpfs):
+            raise IndexError("Índice de atendimento fora do intervalo")
+        return AtendimentoView(self, indice)
+
+    def __iter__(self) -> Iterator[AtendimentoView]:
+        return (AtendimentoView(self, indice) for indice in range(len(self.cpfs)))
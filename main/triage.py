@@ -0,0 +1,78 @@
+from typing import List, Mapping, Sequence, Union
+
+from main.domain import FichaAnalise, Risco
+from main.error import ValidacaoError
+
+# Tabela de regras da triagem, em ordem de prioridade: o primeiro campo verdadeiro da ficha define
+# o risco. É a única definição das regras, usada tanto na classificação individual quanto em lote.
+REGRAS_TRIAGEM = (
+    ("risco_morte", Risco.VERMELHO),
+    ("gravidade_alta", Risco.LARANJA),
+    ("gravidade_moderada", Risco.AMARELO),
+    ("gravidade_baixa", Risco.VERDE),
+)
+RISCO_PADRAO = Risco.AZUL
+CAMPOS = tuple(campo for campo, _ in REGRAS_TRIAGEM)
+
+
+def _compilar(regras) -> List[Risco]:
+    """Pré-calcula o risco para cada combinação de respostas (bit i = campo i da tabela de regras)."""
+    tabela = []
+    for mascara in range(1 << len(regras)):
+        risco = RISCO_PADRAO
+        for bit, (_, risco_regra) in enumerate(regras):
+            if mascara >> bit & 1:
+                risco = risco_regra
+                break
+        tabela.append(risco)
+    return tabela
+
+TABELA = _compilar(REGRAS_TRIAGEM)
+CODIGOS = [risco.value for risco in TABELA]
+
+
+def mascara(ficha: FichaAnalise) -> int:
+    """Respostas da ficha como bits (bit i = campo i da tabela de regras)."""
+    valor = 0
+    for bit, campo in enumerate(CAMPOS):
+        if getattr(ficha, campo):
+            valor |= 1 << bit
+    return valor
+
+def classificar(ficha: FichaAnalise) -> Risco:
+    return TABELA[mascara(ficha)]
+
+def classificar_lote(fichas: Union[Sequence[FichaAnalise], Mapping[str, Sequence[bool]]]):
+    """
+    Classifica o risco de várias fichas de uma só vez.
+
+    Args:
+        fichas: Uma lista de FichaAnalise, ou um mapeamento com uma coluna booleana por campo da
+            ficha (listas ou arrays NumPy de mesmo tamanho).
+
+    Returns:
+        Para uma lista de fichas, a lista de Risco correspondente. Para colunas, os códigos de
+        risco (Risco.value): um array NumPy int8 se as colunas forem arrays NumPy, ou uma lista
+        de inteiros caso contrário.
+    """
+    if not isinstance(fichas, Mapping):
+        return [TABELA[mascara(ficha)] for ficha in fichas]
+
+    try:
+        colunas = [fichas[campo] for campo in CAMPOS]
+    except KeyError as e:
+        raise ValidacaoError(f"Coluna ausente na triagem em lote: {e.args[0]}")
+    if len({len(coluna) for coluna in colunas}) > 1:
+        raise ValidacaoError("As colunas da triagem em lote devem ter o mesmo tamanho.")
+
+    if type(colunas[0]).__module__ == "numpy":
+        import numpy as np
+        indices = np.zeros(len(colunas[0]), dtype=np.uint8)
+        for bit, coluna in enumerate(colunas):
+            indices |= np.asarray(coluna, dtype=bool).astype(np.uint8) << bit
+        return np.asarray(CODIGOS, dtype=np.int8)[indices]
+
+    indices = [0] * len(colunas[0])
+    for bit, coluna in enumerate(colunas):
+        indices = [indice | 1 << bit if marcado else indice for indice, marcado in zip(indices, coluna)]
+    return [CODIGOS[indice] for indice in indices]
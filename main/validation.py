@@ -0,0 +1,163 @@
+import re
+import time
+from datetime import date
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+from main.error import ValidacaoError
+
+NOME = re.compile(r"[a-zA-ZÀ-ú\s]+")
+EMAIL = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+DATA = re.compile(r"(\d{2})/(\d{2})/(\d{4})")
+NAO_DIGITO = re.compile(r"[^0-9]")
+
+
+def _tabela_pesos(pesos) -> List[int]:
+    p1, p2, p3 = pesos
+    return [a * p1 + b * p2 + c * p3 for a in range(10) for b in range(10) for c in range(10)]
+
+# Soma ponderada dos dígitos verificadores pré-calculada por bloco de três dígitos do CPF, de modo
+# que a verificação custa três consultas por dígito em vez de nove multiplicações.
+DV1_BLOCOS = (_tabela_pesos((10, 9, 8)), _tabela_pesos((7, 6, 5)), _tabela_pesos((4, 3, 2)))
+DV2_BLOCOS = (_tabela_pesos((11, 10, 9)), _tabela_pesos((8, 7, 6)), _tabela_pesos((5, 4, 3)))
+
+ERRO_NOME_OBRIGATORIO = "O nome do paciente é obrigatório."
+ERRO_NOME_INVALIDO = "O nome do paciente contém caracteres inválidos."
+ERRO_CPF = "CPF inválido, deve conter 11 dígitos numéricos."
+ERRO_CPF_DIGITOS = "CPF inválido, dígitos verificadores não conferem."
+ERRO_CPF_REPETIDO = "CPF inválido, todos os dígitos são iguais."
+ERRO_EMAIL = "E-mail inválido."
+ERRO_NASCIMENTO = "Data de nascimento inválida, use o formato DD/MM/YYYY."
+ERRO_NASCIMENTO_FUTURO = "A data de nascimento não pode ser futura."
+
+
+def erro_nome(nome: str) -> Optional[str]:
+    if not nome or nome.isspace():
+        return ERRO_NOME_OBRIGATORIO
+    if NOME.fullmatch(nome) is None:
+        return ERRO_NOME_INVALIDO
+    return None
+
+def erro_cpf(cpf: str) -> Optional[str]:
+    """
+    Verifica o tamanho e os dígitos verificadores do CPF (aceita pontuação). CPFs com todos os
+    dígitos iguais (000.000.000-00, 111.111.111-11, ...) passam no cálculo, mas não são válidos.
+    """
+    if not cpf.isdigit():
+        cpf = NAO_DIGITO.sub("", cpf)
+    if len(cpf) != 11 or not cpf.isascii():
+        return ERRO_CPF
+    numero = int(cpf)
+    if numero % 11111111111 == 0:
+        return ERRO_CPF_REPETIDO
+    base, digitos = divmod(numero, 100)
+    bloco1, resto = divmod(base, 1000000)
+    bloco2, bloco3 = divmod(resto, 1000)
+    t1, t2, t3 = DV1_BLOCOS
+    dv1 = (t1[bloco1] + t2[bloco2] + t3[bloco3]) * 10 % 11 % 10
+    t1, t2, t3 = DV2_BLOCOS
+    dv2 = (t1[bloco1] + t2[bloco2] + t3[bloco3] + dv1 * 2) * 10 % 11 % 10
+    if digitos != dv1 * 10 + dv2:
+        return ERRO_CPF_DIGITOS
+    return None
+
+def erro_email(email: str) -> Optional[str]:
+    if EMAIL.fullmatch(email) is None:
+        return ERRO_EMAIL
+    return None
+
+@lru_cache(maxsize=65536)
+def converter_data(texto: str) -> Optional[date]:
+    """Converte uma data no formato DD/MM/YYYY, com cache (datas de nascimento se repetem muito)."""
+    partes = DATA.fullmatch(texto)
+    if partes is None:
+        return None
+    dia, mes, ano = partes.groups()
+    try:
+        return date(int(ano), int(mes), int(dia))
+    except ValueError:
+        return None
+
+_hoje = (date.min, 0.0)
+
+def hoje() -> date:
+    """Retorna a data atual, consultando o relógio do sistema no máximo uma vez por minuto."""
+    global _hoje
+    data, validade = _hoje
+    agora = time.time()
+    if agora >= validade:
+        data = date.today()
+        _hoje = (data, agora + 60)
+    return data
+
+def erro_nascimento(nascimento: str) -> Optional[str]:
+    data = converter_data(nascimento)
+    if data is None:
+        return ERRO_NASCIMENTO
+    if data > hoje():
+        return ERRO_NASCIMENTO_FUTURO
+    return None
+
+def _verificar(erro: Optional[str]):
+    if erro is not None:
+        raise ValidacaoError(erro)
+
+def validar_nome(nome: str) -> str:
+    _verificar(erro_nome(nome))
+    return nome.strip()
+
+def validar_cpf(cpf: str) -> str:
+    _verificar(erro_cpf(cpf))
+    return NAO_DIGITO.sub("", cpf)
+
+def validar_email(email: str) -> str:
+    _verificar(erro_email(email))
+    return email
+
+def validar_nascimento(nascimento: str) -> str:
+    _verificar(erro_nascimento(nascimento))
+    return nascimento
+
+def validar_registro(nome: str, cpf: str, email: str, nascimento: str) -> List[str]:
+    """Retorna a lista de erros de um registro de paciente (vazia se o registro é válido)."""
+    erros = [erro_nome(nome), erro_cpf(cpf), erro_email(email), erro_nascimento(nascimento)]
+    return [erro for erro in erros if erro is not None]
+
+CAMPOS_REGISTRO = ("nome", "cpf", "email", "nascimento")
+
+def validar_lote(registros: Iterable) -> List[List[str]]:
+    """
+    Valida vários registros de paciente sem levantar exceções, para importações em massa.
+
+    Campos ausentes (inclusive chaves faltando ou tuplas curtas) ou nulos e campos que não são
+    texto são informados como erros do registro, como os demais.
+
+    Args:
+        registros: Registros no formato (nome, cpf, email, nascimento) ou dicionários com essas chaves.
+
+    Returns:
+        Uma lista com os erros de cada registro, na mesma ordem da entrada.
+    """
+    verificacoes = (erro_nome, erro_cpf, erro_email, erro_nascimento)
+    resultado = []
+    for registro in registros:
+        if isinstance(registro, dict):
+            valores = [registro.get(campo) for campo in CAMPOS_REGISTRO]
+        else:
+            valores = list(registro)[:len(CAMPOS_REGISTRO)]
+            valores += [None] * (len(CAMPOS_REGISTRO) - len(valores))
+        if all(isinstance(valor, str) for valor in valores):
+            resultado.append(validar_registro(*valores))
+            continue
+        erros = []
+        for campo, valor, verificar in zip(CAMPOS_REGISTRO, valores, verificacoes):
+            if valor is None:
+                erros.append(f"Campo obrigatório ausente: {campo}")
+            elif not isinstance(valor, str):
+                erros.append(f"Tipo inválido para o campo: {campo}")
+            else:
+                erro = verificar(valor)
+                if erro is not None:
+                    erros.append(erro)
+        resultado.append(erros)
+    return resultado
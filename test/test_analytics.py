@@ -0,0 +1,165 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+from main.analytics import AnaliseAtendimentos
+from main.archive import ArquivoAtendimentos
+from main.domain import Atendimento, Paciente, Risco
+from main.error import ValidacaoError
+from main.repository import AtendimentoRepository, PacienteRepository
+from main.service import ProntoSocorroService
+
+BASE = datetime(2024, 1, 1, 8, 0)
+REGISTROS = [
+    (52998224725, Risco.VERDE.value, BASE, 600.0),
+    (52998224725, Risco.VERDE.value, BASE + timedelta(minutes=30), 1200.0),
+    (11144477735, Risco.AMARELO.value, BASE + timedelta(minutes=45), 300.0),
+    (52998224725, Risco.AZUL.value, BASE + timedelta(hours=1), float("nan")),
+    (12345678909, Risco.VERDE.value, BASE + timedelta(hours=2), 0.0),
+    (11144477735, Risco.VERDE.value, BASE + timedelta(hours=2, minutes=5), 1800.0),
+]
+
+
+class TestAnaliseAtendimentos(unittest.TestCase):
+    usar_numpy = False
+
+    def setUp(self):
+        try:
+            self.analise = AnaliseAtendimentos(usar_numpy=self.usar_numpy)
+        except ValidacaoError:
+            self.skipTest("NumPy não instalado")
+        cpfs, riscos, entradas, esperas = zip(*REGISTROS)
+        self.analise.carregar_colunas(cpfs, riscos, [entrada.timestamp() for entrada in entradas], esperas)
+
+    def test_visitas_por_risco_e_hora(self):
+        self.assertEqual(self.analise.visitas_por_risco(), {
+            (BASE, Risco.AMARELO): 1, (BASE, Risco.VERDE): 2, (BASE + timedelta(hours=1), Risco.AZUL): 1,
+            (BASE + timedelta(hours=2), Risco.VERDE): 2,
+        })
+        visitas = self.analise.visitas_por_risco(periodo=86400, desde=BASE + timedelta(minutes=30))
+        self.assertEqual(sorted(visitas.values()), [1, 1, 3])
+
+    def test_frequentes(self):
+        self.assertEqual(self.analise.frequentes(), [("52998224725", 3), ("11144477735", 2)])
+        self.assertEqual(self.analise.frequentes(1), [("52998224725", 3)])
+        self.assertEqual(self.analise.frequentes(desde=BASE + timedelta(hours=1)), [])
+
+    def test_espera_media(self):
+        medias = self.analise.espera_media()
+        self.assertEqual(medias[Risco.VERDE], timedelta(seconds=900))
+        self.assertEqual(medias[Risco.AMARELO], timedelta(minutes=5))
+        self.assertIsNone(medias[Risco.AZUL])
+        medias = self.analise.espera_media(ate=BASE + timedelta(minutes=30))
+        self.assertEqual(medias[Risco.VERDE], timedelta(seconds=900))
+        self.assertIsNone(medias[Risco.AMARELO])
+
+    def test_agregados_iguais_as_colunas(self):
+        """Os agregados mantidos na inserção devem coincidir com as consultas sobre as colunas."""
+        desde = BASE - timedelta(days=1)
+        self.assertEqual(self.analise.visitas_por_risco(), self.analise.visitas_por_risco(desde=desde))
+        self.assertEqual(self.analise.frequentes(), self.analise.frequentes(desde=desde))
+        self.assertEqual(self.analise.espera_media(), self.analise.espera_media(desde=desde))
+
+    def test_periodos_no_horario_local(self):
+        """Um relatório diário agrupa de meia-noite a meia-noite do horário local, não de UTC."""
+        fuso = os.environ.get("TZ")
+        os.environ["TZ"] = "America/Sao_Paulo"
+        time.tzset()
+        try:
+            analise = AnaliseAtendimentos(usar_numpy=self.usar_numpy)
+            dia = datetime(2026, 10, 17)
+            analise.carregar_colunas([52998224725, 11144477735], [Risco.VERDE.value] * 2,
+                                     [(dia + timedelta(hours=horas)).timestamp() for horas in (10, 22)])
+            esperado = {(dia, Risco.VERDE): 2}
+            self.assertEqual(analise.visitas_por_risco(periodo=86400), esperado)
+            self.assertEqual(analise.visitas_por_risco(periodo=86400, desde=dia), esperado)
+            # Com deslocamento zero, os dias são contados em UTC (22:00 em São Paulo já é o dia 18).
+            utc = AnaliseAtendimentos(usar_numpy=self.usar_numpy, deslocamento=0)
+            utc.carregar_colunas([52998224725, 11144477735], [Risco.VERDE.value] * 2,
+                                 [(dia + timedelta(hours=horas)).timestamp() for horas in (10, 22)])
+            self.assertEqual(len(utc.visitas_por_risco(periodo=86400)), 2)
+        finally:
+            if fuso is None:
+                del os.environ["TZ"]
+            else:
+                os.environ["TZ"] = fuso
+            time.tzset()
+
+class TestAnaliseAtendimentosNumpy(TestAnaliseAtendimentos):
+    usar_numpy = True
+
+class TestAnaliseServico(unittest.TestCase):
+
+    def test_servico_atualiza_analise(self):
+        agora = [BASE]
+        analise = AnaliseAtendimentos(usar_numpy=False, relogio=lambda: agora[0])
+        pacientes = PacienteRepository()
+        servico = ProntoSocorroService(pacientes, AtendimentoRepository(pacientes), analise=analise)
+        paciente = servico.registrar_paciente("Maria Silva", "52998224725", "maria@teste.com", "01/01/1990")
+        atendimento = servico.registrar_atendimento(paciente, Risco.LARANJA)
+        servico.inserir_fila_atendimento(atendimento)
+        agora[0] = atendimento.entrada + timedelta(minutes=8)
+        servico.chamar_proximo()
+        self.assertEqual(analise.espera_media()[Risco.LARANJA], timedelta(minutes=8))
+        self.assertEqual(len(analise), 1)
+
+    def test_servico_descarta_removidos(self):
+        """Um atendimento retirado da fila conta como visita, mas não registra espera."""
+        analise = AnaliseAtendimentos(usar_numpy=False)
+        pacientes = PacienteRepository()
+        servico = ProntoSocorroService(pacientes, AtendimentoRepository(pacientes), analise=analise)
+        paciente = servico.registrar_paciente("Maria Silva", "52998224725", "maria@teste.com", "01/01/1990")
+        atendimento = servico.registrar_atendimento(paciente, Risco.VERDE)
+        servico.inserir_fila_atendimento(atendimento)
+        servico.remover_fila_atendimento(atendimento)
+        self.assertEqual(analise.pendentes, {})
+        analise.registrar_chamada(atendimento)
+        self.assertIsNone(analise.espera_media()[Risco.VERDE])
+        self.assertEqual(analise.frequentes(minimo=1), [("52998224725", 1)])
+
+    def test_chamada_de_copia_do_atendimento(self):
+        """A linha pendente é encontrada pelo CPF e pela entrada, não pela identidade do objeto."""
+        analise = AnaliseAtendimentos(usar_numpy=False)
+        paciente = Paciente("Maria Silva", "52998224725", "maria@teste.com", "01/01/1990")
+        analise.inserir(Atendimento(paciente, Risco.AMARELO, BASE))
+        analise.registrar_chamada(Atendimento(paciente, Risco.AMARELO, BASE), BASE + timedelta(minutes=20))
+        self.assertEqual(analise.espera_media()[Risco.AMARELO], timedelta(minutes=20))
+
+    def test_mesma_entrada_nao_sobrescreve(self):
+        """Dois atendimentos do mesmo CPF no mesmo microssegundo têm, cada um, a sua espera."""
+        analise = AnaliseAtendimentos(usar_numpy=False)
+        paciente = Paciente("Maria Silva", "52998224725", "maria@teste.com", "01/01/1990")
+        with self.assertLogs("main.analytics", "WARNING"):
+            for risco in (Risco.AMARELO, Risco.VERDE):
+                analise.inserir(Atendimento(paciente, risco, BASE))
+        analise.registrar_chamada(Atendimento(paciente, Risco.AMARELO, BASE), BASE + timedelta(minutes=10))
+        analise.registrar_chamada(Atendimento(paciente, Risco.VERDE, BASE), BASE + timedelta(minutes=30))
+        self.assertEqual(analise.pendentes, {})
+        medias = analise.espera_media()
+        self.assertEqual(medias[Risco.AMARELO], timedelta(minutes=10))
+        self.assertEqual(medias[Risco.VERDE], timedelta(minutes=30))
+
+    def test_carregar_arquivo(self):
+        """O arquivo é carregado com os mesmos resultados com e sem NumPy (frombuffer sobre o mmap)."""
+        with tempfile.TemporaryDirectory() as diretorio:
+            arquivo = ArquivoAtendimentos(os.path.join(diretorio, "atendimentos.bin"))
+            paciente = Paciente("Maria Silva", "52998224725", "maria@teste.com", "01/01/1990")
+            for horas in (0, 0, 1):
+                arquivo.anexar(Atendimento(paciente, Risco.VERDE, BASE + timedelta(hours=horas)))
+            for usar_numpy in (False, True):
+                with self.subTest(usar_numpy=usar_numpy):
+                    try:
+                        analise = AnaliseAtendimentos(usar_numpy=usar_numpy)
+                    except ValidacaoError:
+                        self.skipTest("NumPy não instalado")
+                    analise.carregar_arquivo(arquivo)
+                    self.assertEqual(analise.visitas_por_risco(), {(BASE, Risco.VERDE): 2,
+                                                                   (BASE + timedelta(hours=1), Risco.VERDE): 1})
+                    self.assertEqual(analise.visitas_por_risco(desde=BASE), analise.visitas_por_risco())
+                    self.assertEqual(analise.frequentes(), [("52998224725", 3)])
+                    self.assertEqual(analise.frequentes(desde=BASE), [("52998224725", 3)])
+            arquivo.fechar()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,201 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from datetime import datetime
+from main.archive import CABECALHO, REGISTRO, ArquivoAtendimentos
+from main.domain import Atendimento, Paciente, Risco
+from main.error import PersistenciaError
+from main.repository import AtendimentoRepository, PacienteRepository
+from main.service import ProntoSocorroService
+
+
+class TestArquivoAtendimentos(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.diretorio.name, "atendimentos.bin")
+        self.paciente = Paciente("Maria Silva", "52998224725", "maria@teste.com", "01/01/1990")
+        self.outro = Paciente("Ana Souza", "11144477735", "ana@teste.com", "12/12/1985")
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def test_varrer_e_historico(self):
+        arquivo = ArquivoAtendimentos(self.caminho)
+        arquivo.anexar(Atendimento(self.paciente, Risco.VERDE, datetime(2024, 1, 3)))
+        arquivo.anexar(Atendimento(self.outro, Risco.AZUL, datetime(2024, 1, 2)))
+        arquivo.anexar(Atendimento(self.paciente, Risco.VERMELHO, datetime(2024, 1, 1)))
+        self.assertEqual([risco for _, risco, _ in arquivo.varrer()], [4, 5, 1])
+        self.assertEqual(len(list(arquivo.varrer(1, 2))), 1)
+        historico = list(arquivo.historico("529.982.247-25"))
+        self.assertEqual([risco for _, risco, _ in historico], [1, 4])
+        self.assertEqual(arquivo.contar("52998224725", desde=datetime(2024, 1, 2)), 1)
+        self.assertEqual(arquivo.registro(1)[0], 11144477735)
+        arquivo.fechar()
+
+    def test_reabrir_descarta_registro_incompleto(self):
+        arquivo = ArquivoAtendimentos(self.caminho)
+        arquivo.anexar(Atendimento(self.paciente, Risco.VERDE, datetime(2024, 1, 1)))
+        arquivo.sincronizar()
+        arquivo.fechar()
+        with open(self.caminho, "ab") as dados:
+            dados.write(b"\x01\x02\x03")
+        arquivo = ArquivoAtendimentos(self.caminho)
+        self.assertEqual(len(arquivo), 1)
+        self.assertEqual(os.path.getsize(self.caminho), len(CABECALHO) + REGISTRO.size)
+        self.assertEqual(arquivo.contar("52998224725"), 1)
+        arquivo.fechar()
+
+    def test_indice_persistido(self):
+        """O índice de CPF é gravado ao fechar e usado ao reabrir, intercalado aos registros novos."""
+        arquivo = ArquivoAtendimentos(self.caminho)
+        arquivo.anexar(Atendimento(self.paciente, Risco.VERDE, datetime(2024, 1, 1)))
+        arquivo.anexar(Atendimento(self.outro, Risco.AZUL, datetime(2024, 1, 2)))
+        arquivo.anexar(Atendimento(self.paciente, Risco.AMARELO, datetime(2024, 1, 5)))
+        arquivo.fechar()
+        self.assertTrue(os.path.exists(arquivo.caminho_indice))
+
+        arquivo = ArquivoAtendimentos(self.caminho)
+        self.assertEqual(arquivo.indexados, 3)
+        self.assertEqual(arquivo.pendentes_registros, {})
+        arquivo.anexar(Atendimento(self.paciente, Risco.VERMELHO, datetime(2024, 1, 3)))
+        arquivo.sincronizar()
+        self.assertEqual([risco for _, risco, _ in arquivo.historico("52998224725")], [4, 1, 3])
+        self.assertEqual(arquivo.contar("52998224725", desde=datetime(2024, 1, 2), ate=datetime(2024, 1, 4)), 1)
+        # Reaberto sem fechar (o índice não cobre o último registro).
+        reaberto = ArquivoAtendimentos(self.caminho)
+        self.assertEqual((reaberto.indexados, len(reaberto)), (3, 4))
+        self.assertEqual([risco for _, risco, _ in reaberto.historico("52998224725")], [4, 1, 3])
+        reaberto.salvar_indice()
+        self.assertEqual(reaberto.indexados, 4)
+        self.assertEqual([risco for _, risco, _ in reaberto.historico("52998224725")], [4, 1, 3])
+        reaberto.fechar()
+        arquivo.fechar()
+
+    def test_indice_invalido_reconstruido(self):
+        arquivo = ArquivoAtendimentos(self.caminho)
+        arquivo.anexar(Atendimento(self.paciente, Risco.VERDE, datetime(2024, 1, 1)))
+        arquivo.fechar()
+        with open(arquivo.caminho_indice, "r+b") as indice:
+            indice.truncate(20)
+        arquivo = ArquivoAtendimentos(self.caminho)
+        self.assertEqual(arquivo.indexados, 0)
+        self.assertEqual(arquivo.contar("52998224725"), 1)
+        arquivo.fechar()
+        arquivo = ArquivoAtendimentos(self.caminho)
+        self.assertEqual(arquivo.indexados, 1)
+        arquivo.fechar()
+
+    def test_indice_gravado_em_blocos_e_mapeamentos_liberados(self):
+        arquivo = ArquivoAtendimentos(self.caminho)
+        for dia in range(1, 8):
+            arquivo.anexar(Atendimento(self.paciente if dia % 2 else self.outro, Risco(dia % 5 + 1), datetime(2024, 1, dia)))
+        with mock.patch("main.archive.BLOCO_INDICE", 2):
+            arquivo.salvar_indice()
+        self.assertEqual(list(arquivo.indice_registros), [1, 3, 5, 0, 2, 4, 6])
+        self.assertEqual([int(entrada) for entrada in arquivo.indice_entradas],
+                         [int(datetime(2024, 1, dia).timestamp()) for dia in (2, 4, 6, 1, 3, 5, 7)])
+        # Um histórico em andamento mantém o mapeamento anterior; sem leitores, ele é fechado.
+        historico = arquivo.historico("52998224725")
+        next(historico)
+        mapa = arquivo.mapa_indice
+        arquivo.anexar(Atendimento(self.paciente, Risco.VERDE, datetime(2024, 1, 9)))
+        arquivo.salvar_indice()
+        self.assertFalse(mapa.closed)
+        self.assertEqual(len(list(historico)), 3)
+        mapa = arquivo.mapa_indice
+        arquivo.anexar(Atendimento(self.outro, Risco.VERDE, datetime(2024, 1, 10)))
+        arquivo.salvar_indice()
+        self.assertTrue(mapa.closed)
+        arquivo.fechar()
+        self.assertIsNone(arquivo.mapa)
+
+    def test_anexar_lote_falha_trunca(self):
+        arquivo = ArquivoAtendimentos(self.caminho)
+        arquivo.anexar_lote([Atendimento(self.paciente, Risco.VERDE, datetime(2024, 1, 1))])
+        with mock.patch("main.archive.os.fsync", side_effect=OSError("disco cheio")):
+            with self.assertRaises(OSError):
+                arquivo.anexar_lote([Atendimento(self.outro, Risco.AZUL, datetime(2024, 1, 2))])
+        self.assertEqual(len(arquivo), 1)
+        self.assertEqual(os.path.getsize(self.caminho), len(CABECALHO) + REGISTRO.size)
+        self.assertEqual(arquivo.contar("11144477735"), 0)
+        arquivo.fechar()
+
+    def test_arquivar_ignora_desconhecidos_e_repetidos(self):
+        pacientes = PacienteRepository()
+        pacientes.inserir(self.paciente)
+        arquivo = ArquivoAtendimentos(self.caminho)
+        atendimentos = AtendimentoRepository(pacientes, arquivo)
+        inserido = Atendimento(self.paciente, Risco.VERDE, datetime(2024, 1, 1))
+        atendimentos.inserir(inserido)
+        desconhecido = Atendimento(self.paciente, Risco.VERDE, datetime(2024, 1, 1))
+        self.assertEqual(atendimentos.arquivar([inserido, desconhecido, inserido]), 1)
+        self.assertEqual(len(arquivo), 1)
+        self.assertEqual(atendimentos.atendimentos, [])
+        self.assertEqual(atendimentos.arquivar([inserido]), 0)
+        arquivo.fechar()
+
+    def test_servico_restaura_concluidos_se_arquivar_falhar(self):
+        pacientes = PacienteRepository()
+        pacientes.inserir(self.paciente)
+        arquivo = ArquivoAtendimentos(self.caminho)
+        atendimentos = AtendimentoRepository(pacientes, arquivo)
+        servico = ProntoSocorroService(pacientes, atendimentos)
+        atendimento = servico.registrar_atendimento(self.paciente, Risco.VERDE)
+        servico.inserir_fila_atendimento(atendimento)
+        servico.chamar_proximo()
+        with mock.patch("main.archive.os.fsync", side_effect=OSError("disco cheio")):
+            with self.assertRaises(OSError):
+                servico.arquivar_concluidos()
+        self.assertEqual(servico.concluidos, [atendimento])
+        self.assertEqual(atendimentos.atendimentos, [atendimento])
+        self.assertEqual(atendimentos.contar_atendimentos("52998224725"), 1)
+        self.assertEqual(servico.arquivar_concluidos(), 1)
+        self.assertEqual(servico.buscar_historico(self.paciente), [atendimento])
+        arquivo.fechar()
+
+    def test_arquivar_sem_arquivo(self):
+        pacientes = PacienteRepository()
+        pacientes.inserir(self.paciente)
+        atendimentos = AtendimentoRepository(pacientes)
+        atendimento = Atendimento(self.paciente, Risco.VERDE)
+        atendimentos.inserir(atendimento)
+        with self.assertRaises(PersistenciaError):
+            atendimentos.arquivar([atendimento])
+        self.assertEqual(atendimentos.historico_atendimentos("52998224725"), [atendimento])
+
+    def test_arquivo_invalido(self):
+        with open(self.caminho, "wb") as dados:
+            dados.write(b"outro formato")
+        with self.assertRaises(PersistenciaError):
+            ArquivoAtendimentos(self.caminho)
+
+    def test_servico_arquiva_concluidos(self):
+        """Testa se os atendimentos chamados saem da memória e continuam no histórico."""
+        pacientes = PacienteRepository()
+        pacientes.inserir(self.paciente)
+        arquivo = ArquivoAtendimentos(self.caminho)
+        atendimentos = AtendimentoRepository(pacientes, arquivo)
+        servico = ProntoSocorroService(pacientes, atendimentos)
+        dias = [Atendimento(self.paciente, Risco.VERDE, datetime(2024, 1, dia)) for dia in (1, 2, 3)]
+        for atendimento in dias:
+            atendimentos.inserir(atendimento)
+        servico.inserir_fila_atendimento(dias[0])
+        servico.inserir_fila_atendimento(dias[2])
+        servico.chamar_proximo()
+        servico.remover_fila_atendimento(dias[2])
+
+        self.assertEqual(servico.arquivar_concluidos(), 2)
+        self.assertEqual(atendimentos.atendimentos, [dias[1]])
+        self.assertEqual(len(arquivo), 2)
+        self.assertEqual(servico.buscar_historico(self.paciente), dias)
+        self.assertEqual(servico.buscar_historico(self.paciente, inicio=1, limite=1), [dias[1]])
+        self.assertEqual(servico.buscar_historico(self.paciente, desde=datetime(2024, 1, 3)), [dias[2]])
+        self.assertEqual(atendimentos.contar_atendimentos("52998224725"), 3)
+        self.assertEqual(servico.arquivar_concluidos(), 0)
+        arquivo.fechar()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from datetime import datetime
+from main.cache import CacheLRU, CacheServico
+from main.domain import Paciente, Risco
+from main.repository import AtendimentoRepository, PacienteRepository
+from main.service import ProntoSocorroService
+
+
+class Relogio:
+    def __init__(self):
+        self.segundos = 0.0
+
+    def __call__(self):
+        return self.segundos
+
+class TestCacheLRU(unittest.TestCase):
+
+    def test_descarta_menos_usado(self):
+        cache = CacheLRU(2)
+        cache.guardar("a", 1)
+        cache.guardar("b", 2)
+        self.assertEqual(cache.obter("a", lambda chave: None), 1)
+        cache.guardar("c", 3)
+        self.assertEqual(set(cache.itens), {"a", "c"})
+        self.assertEqual(cache.obter("b", lambda chave: chave * 2), "bb")
+        self.assertEqual(cache.estatisticas()["descartados"], 2)
+        self.assertEqual((cache.acertos, cache.falhas), (1, 1))
+
+    def test_validade(self):
+        relogio = Relogio()
+        cache = CacheLRU(10, ttl=5, relogio=relogio)
+        carregados = []
+        carregar = lambda chave: carregados.append(chave) or len(carregados)
+        self.assertEqual(cache.obter("a", carregar), 1)
+        relogio.segundos = 4
+        self.assertEqual(cache.obter("a", carregar), 1)
+        relogio.segundos = 6
+        self.assertEqual(cache.obter("a", carregar), 2)
+        self.assertEqual(cache.expirados, 1)
+
+    def test_invalidar_grupo(self):
+        cache = CacheLRU(10, agrupar=lambda chave: chave[0])
+        for chave in (("x", 1), ("x", 2), ("y", 1)):
+            cache.guardar(chave, chave[1])
+        cache.invalidar_grupo("x")
+        cache.invalidar(("y", 1))
+        self.assertEqual(len(cache.itens), 0)
+        self.assertEqual(cache.grupos, {})
+
+class TestServicoCache(unittest.TestCase):
+
+    def setUp(self):
+        self.pacientes = PacienteRepository()
+        self.atendimentos = AtendimentoRepository(self.pacientes)
+        self.cache = CacheServico()
+        self.servico = ProntoSocorroService(self.pacientes, self.atendimentos, cache=self.cache)
+        self.paciente = self.servico.registrar_paciente("Maria Silva", "52998224725", "maria@teste.com", "01/01/1990")
+
+    def test_buscar_paciente(self):
+        self.assertIsNone(self.servico.buscar_paciente("11144477735"))
+        self.assertIs(self.servico.buscar_paciente("529.982.247-25"), self.paciente)
+        self.assertEqual((self.cache.pacientes.acertos, self.cache.pacientes.falhas), (1, 1))
+        outro = self.servico.registrar_paciente("Ana Souza", "11144477735", "ana@teste.com", "12/12/1985")
+        self.assertIs(self.servico.buscar_paciente("11144477735"), outro)
+
+    def test_paciente_nao_encontrado_nao_fica_em_cache(self):
+        self.assertIsNone(self.servico.buscar_paciente("11144477735"))
+        self.assertNotIn("11144477735", self.cache.pacientes.itens)
+        outro = Paciente("Ana Souza", "11144477735", "ana@teste.com", "12/12/1985")
+        self.pacientes.inserir(outro)
+        self.assertIs(self.servico.buscar_paciente("11144477735"), outro)
+
+    def test_historico_invalidado_ao_registrar_atendimento(self):
+        primeiro = self.servico.registrar_atendimento(self.paciente, Risco.VERDE)
+        self.assertEqual(self.servico.buscar_historico(self.paciente), [primeiro])
+        self.assertEqual(self.servico.buscar_historico(self.paciente), [primeiro])
+        self.assertEqual(self.cache.estatisticas()["historicos"]["acertos"], 1)
+        segundo = self.servico.registrar_atendimento(self.paciente, Risco.AZUL)
+        self.assertEqual(self.servico.buscar_historico(self.paciente), [primeiro, segundo])
+        self.assertEqual(self.servico.buscar_historico(self.paciente, inicio=1, limite=1), [segundo])
+        self.assertEqual(self.servico.buscar_historico(self.paciente, desde=datetime(2100, 1, 1)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,25 +1,31 @@
+import io
+import subprocess
+import sys
 import unittest
 from unittest.mock import patch, MagicMock
 from main.error import PSBaseError
 from main.domain import FichaAnalise, Risco, Paciente, Atendimento
 from main.cli import TerminalClient
+from main.render import Tela, formatar_atendimento
+from main.repository import PacienteRepository, AtendimentoRepository
+from main.service import ProntoSocorroService
 
 
 class TestCLI(unittest.TestCase):
     def setUp(self):
         """ Configuração inicial para os testes """
         self.ps_service_mock = MagicMock()
-        self.cli = TerminalClient(self.ps_service_mock)
+        self.saida = io.StringIO()
+        self.cli = TerminalClient(self.ps_service_mock, Tela(self.saida))
 
     # --- TESTES PARA REGISTRAR ATENDIMENTO ---
     @patch("builtins.input", side_effect=["12345678900"])
     def test_paciente_nao_cadastrado(self, mock_input):
         """ Testa se um paciente não cadastrado exibe mensagem de erro ao registrar atendimento """
-        self.ps_service_mock.pacientes.buscar.return_value = None
+        self.ps_service_mock.buscar_paciente.return_value = None
 
-        with patch("builtins.print") as mock_print:
-            self.cli.registrar_atendimento()
-            mock_print.assert_any_call("\nPaciente não encontrado.")
+        self.cli.registrar_atendimento()
+        self.assertIn("\nPaciente não encontrado.", self.saida.getvalue())
 
     @patch("builtins.input", side_effect=[
         "12345678900",
@@ -28,12 +34,11 @@ class TestCLI(unittest.TestCase):
     def test_paciente_risco_morte(self, mock_input):
         """ Testa se o paciente com risco de morte é classificado corretamente """
         paciente_mock = MagicMock()
-        self.ps_service_mock.pacientes.buscar.return_value = paciente_mock
+        self.ps_service_mock.buscar_paciente.return_value = paciente_mock
         self.ps_service_mock.classificar_risco.return_value = Risco.VERMELHO
 
-        with patch("builtins.print") as mock_print:
-            self.cli.registrar_atendimento()
-            mock_print.assert_any_call("\nClassificação de risco: VERMELHO")
+        self.cli.registrar_atendimento()
+        self.assertIn("\nClassificação de risco: VERMELHO", self.saida.getvalue())
 
     @patch("builtins.input", side_effect=[
         "12345678900",
@@ -42,12 +47,11 @@ class TestCLI(unittest.TestCase):
     def test_paciente_gravidade_alta(self, mock_input):
         """ Testa se o paciente com gravidade alta é classificado corretamente """
         paciente_mock = MagicMock()
-        self.ps_service_mock.pacientes.buscar.return_value = paciente_mock
+        self.ps_service_mock.buscar_paciente.return_value = paciente_mock
         self.ps_service_mock.classificar_risco.return_value = Risco.LARANJA
 
-        with patch("builtins.print") as mock_print:
-            self.cli.registrar_atendimento()
-            mock_print.assert_any_call("\nClassificação de risco: LARANJA")
+        self.cli.registrar_atendimento()
+        self.assertIn("\nClassificação de risco: LARANJA", self.saida.getvalue())
 
     @patch("builtins.input", side_effect=[
         "12345678900",
@@ -56,12 +60,11 @@ class TestCLI(unittest.TestCase):
     def test_paciente_gravidade_moderada(self, mock_input):
         """ Testa se o paciente com gravidade moderada é classificado corretamente """
         paciente_mock = MagicMock()
-        self.ps_service_mock.pacientes.buscar.return_value = paciente_mock
+        self.ps_service_mock.buscar_paciente.return_value = paciente_mock
         self.ps_service_mock.classificar_risco.return_value = Risco.AMARELO
 
-        with patch("builtins.print") as mock_print:
-            self.cli.registrar_atendimento()
-            mock_print.assert_any_call("\nClassificação de risco: AMARELO")
+        self.cli.registrar_atendimento()
+        self.assertIn("\nClassificação de risco: AMARELO", self.saida.getvalue())
 
     @patch("builtins.input", side_effect=[
         "12345678900",
@@ -70,12 +73,11 @@ class TestCLI(unittest.TestCase):
     def test_paciente_gravidade_baixa(self, mock_input):
         """ Testa se o paciente com gravidade baixa é classificado corretamente """
         paciente_mock = MagicMock()
-        self.ps_service_mock.pacientes.buscar.return_value = paciente_mock
+        self.ps_service_mock.buscar_paciente.return_value = paciente_mock
         self.ps_service_mock.classificar_risco.return_value = Risco.VERDE
 
-        with patch("builtins.print") as mock_print:
-            self.cli.registrar_atendimento()
-            mock_print.assert_any_call("\nClassificação de risco: VERDE")
+        self.cli.registrar_atendimento()
+        self.assertIn("\nClassificação de risco: VERDE", self.saida.getvalue())
 
     @patch("builtins.input", side_effect=[
         "12345678900",
@@ -84,21 +86,19 @@ class TestCLI(unittest.TestCase):
     def test_paciente_sem_gravidade(self, mock_input):
         """ Testa se o paciente sem gravidade é classificado corretamente """
         paciente_mock = MagicMock()
-        self.ps_service_mock.pacientes.buscar.return_value = paciente_mock
+        self.ps_service_mock.buscar_paciente.return_value = paciente_mock
         self.ps_service_mock.classificar_risco.return_value = Risco.AZUL
 
-        with patch("builtins.print") as mock_print:
-            self.cli.registrar_atendimento()
-            mock_print.assert_any_call("\nClassificação de risco: AZUL")
+        self.cli.registrar_atendimento()
+        self.assertIn("\nClassificação de risco: AZUL", self.saida.getvalue())
 
     @patch("builtins.input", side_effect=["12345678900"])
     def test_erro_ao_registrar_atendimento(self, mock_input):
         """ Testa se um erro ao buscar paciente é tratado corretamente """
-        self.ps_service_mock.pacientes.buscar.side_effect = PSBaseError("Erro ao buscar paciente.")
+        self.ps_service_mock.buscar_paciente.side_effect = PSBaseError("Erro ao buscar paciente.")
 
-        with patch("builtins.print") as mock_print:
-            self.cli.registrar_atendimento()
-            mock_print.assert_any_call("\nErro ao registrar atendimento: Erro ao buscar paciente.")
+        self.cli.registrar_atendimento()
+        self.assertIn("\nErro ao registrar atendimento: Erro ao buscar paciente.", self.saida.getvalue())
 
     # --- TESTES PARA HISTÓRICO DE ATENDIMENTO ---
     @patch("builtins.input", side_effect=["12345678900"])
@@ -106,23 +106,104 @@ class TestCLI(unittest.TestCase):
         """ Testa se um CPF válido retorna o histórico de atendimentos """
         paciente_mock = MagicMock()
         paciente_mock.nome = "João da Silva"
-        self.ps_service_mock.pacientes.buscar.return_value = paciente_mock
+        self.ps_service_mock.buscar_paciente.return_value = paciente_mock
 
         atendimento_mock = [MagicMock(), MagicMock()]  # Simulando dois atendimentos
         self.ps_service_mock.buscar_historico.return_value = atendimento_mock
 
-        with patch("builtins.print") as mock_print:
-            self.cli.buscar_historico()
-            mock_print.assert_any_call(f"\nHistórico de atendimentos para {paciente_mock.nome}:")
+        self.cli.buscar_historico()
+        self.assertIn(f"\nHistórico de atendimentos para {paciente_mock.nome}:", self.saida.getvalue())
 
     @patch("builtins.input", side_effect=["12345678900"])
     def test_buscar_historico_cpf_nao_cadastrado(self, mock_input):
         """ Testa se um CPF não cadastrado exibe a mensagem de erro apropriada """
-        self.ps_service_mock.pacientes.buscar.return_value = None
+        self.ps_service_mock.buscar_paciente.return_value = None
+
+        self.cli.buscar_historico()
+        self.assertIn("\nPaciente não encontrado.", self.saida.getvalue())
+
+    # --- TESTES DE RENDERIZAÇÃO ---
+    def test_uma_escrita_por_tela(self):
+        """ Testa se cada tela é escrita com uma única chamada de write """
+        saida = MagicMock()
+        cli = TerminalClient(self.ps_service_mock, Tela(saida))
+        self.ps_service_mock.chamar_proximo.side_effect = PSBaseError("Fila vazia.")
+        cli.chamar_proximo()
+        saida.write.assert_called_once()
+        self.assertIn("Erro ao chamar próximo: Fila vazia.", saida.write.call_args.args[0])
+
+    def test_formatar_atendimento_igual_str(self):
+        """ Testa se o texto em cache é o de str(atendimento) e acompanha mudanças nos campos """
+        atendimento = Atendimento(Paciente("Maria Silva", "52998224725", "maria@email.com", "15/05/1995"), Risco.AMARELO)
+        self.assertEqual(formatar_atendimento(atendimento), str(atendimento))
+        atendimento.risco = Risco.VERMELHO
+        self.assertEqual(formatar_atendimento(atendimento), str(atendimento))
+
+    @patch("builtins.input", side_effect=["12345678900", "sim", "não"])
+    def test_historico_paginado_sob_demanda(self, mock_input):
+        """ Testa se o histórico é buscado uma página por vez, conforme o usuário pede mais """
+        paciente_mock = MagicMock()
+        self.ps_service_mock.buscar_paciente.return_value = paciente_mock
+        self.ps_service_mock.buscar_historico.side_effect = lambda p, inicio, limite: [MagicMock()] * limite
+        cli = TerminalClient(self.ps_service_mock, Tela(self.saida), tamanho_pagina=5)
+
+        cli.buscar_historico()
 
-        with patch("builtins.print") as mock_print:
-            self.cli.buscar_historico()
-            mock_print.assert_any_call("\nPaciente não encontrado.")
+        chamadas = self.ps_service_mock.buscar_historico.call_args_list
+        self.assertEqual([c.kwargs["inicio"] for c in chamadas], [0, 5])
+        self.assertEqual(mock_input.call_count, 3)
+
+class TestCLILote(unittest.TestCase):
+    def setUp(self):
+        pacientes = PacienteRepository()
+        self.ps_service = ProntoSocorroService(pacientes, AtendimentoRepository(pacientes))
+        self.saida = io.StringIO()
+        self.cli = TerminalClient(self.ps_service, Tela(self.saida, cores=False), tamanho_pagina=2)
+
+    def test_executar_lote(self):
+        """ Testa a execução de comandos em lote, sem perguntas ao usuário """
+        comandos = io.StringIO(
+            '# cadastro\n'
+            'paciente "Maria Silva" 52998224725 maria@teste.com 01/01/1990\n'
+            'atendimento 52998224725 não sim não não\n'
+            'atendimento 52998224725 não não não sim\n'
+            'atendimento 52998224725 não não não não\n'
+            '\n'
+            'historico 52998224725\n'
+            'proximo\n')
+        with patch("builtins.input") as mock_input:
+            erros = self.cli.executar_lote(comandos)
+        mock_input.assert_not_called()
+
+        saida = self.saida.getvalue()
+        self.assertEqual(erros, 0)
+        self.assertIn("Classificação de risco: LARANJA", saida)
+        self.assertEqual(saida.count("Risco: AZUL"), 2)
+        self.assertIn("Próximo Paciente:\nAtendimento:\nPaciente: Paciente: Maria Silva (52998224725)\nRisco: LARANJA",
+                      saida)
+        self.assertEqual(self.ps_service.fila_atendimento.tamanho(), 2)
+
+    def test_lote_com_erros(self):
+        """ Testa se comandos inválidos são contados como erros sem interromper o lote """
+        comandos = ["foo", "paciente Maria", "atendimento 52998224725 sim sim sim sim", 'historico "aberto',
+                    "paciente 'Maria Silva' 52998224725 maria@teste.com 01/01/1990"]
+        self.assertEqual(self.cli.executar_lote(comandos), 4)
+        saida = self.saida.getvalue()
+        self.assertIn("Linha 1: comando desconhecido: foo", saida)
+        self.assertIn("Linha 2: o comando paciente espera 4 argumento(s).", saida)
+        self.assertIn("Paciente não encontrado.", saida)
+        self.assertIn("Paciente registrado com sucesso", saida)
+        self.assertNotIn("\x1b[", saida)
+
+class TestInicializacao(unittest.TestCase):
+    def test_modulos_opcionais_nao_carregados(self):
+        """ Testa se a inicialização do cliente não importa módulos usados apenas sob demanda """
+        opcionais = ("colorama", "argparse", "shlex", "main.protocol", "main.persistence", "main.metrics",
+                     "main.sqlite_repository", "main.events")
+        codigo = ("import sys, main.cli, main.repository, main.service; "
+                  f"print(','.join(m for m in {opcionais!r} if m in sys.modules))")
+        processo = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True)
+        self.assertEqual(processo.stdout.strip(), "")
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,107 @@
+import threading
+import unittest
+from bench.common import gerar_cpf
+from test import test_domain
+from main.concurrency import FilaAtendimentoConcorrente, PacienteRepositoryConcorrente, AtendimentoRepositoryConcorrente
+from main.domain import Atendimento, Paciente, Risco
+from main.error import CPFDuplicadoError, FilaVaziaError
+
+THREADS = 8
+POR_THREAD = 2000
+
+
+class TestFilaAtendimentoConcorrenteSequencial(test_domain.TestFilaAtendimentoEstavel):
+    classe_fila = FilaAtendimentoConcorrente
+    preserva_ordem = False
+
+
+class TestConcorrencia(unittest.TestCase):
+
+    def setUp(self):
+        self.paciente = Paciente("Ana Souza", "52998224725", "ana@email.com", "12/12/1985")
+
+    def executar_threads(self, alvo):
+        barreira = threading.Barrier(THREADS)
+        threads = [threading.Thread(target=alvo, args=(barreira, i)) for i in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_cada_atendimento_chamado_exatamente_uma_vez(self):
+        """Vários guichês chamando ao mesmo tempo nunca recebem o mesmo paciente."""
+        fila = FilaAtendimentoConcorrente()
+        atendimentos = [Atendimento(self.paciente, list(Risco)[i % 5]) for i in range(THREADS * POR_THREAD)]
+        chamados = [[] for _ in range(THREADS)]
+
+        def guiche(barreira, indice):
+            barreira.wait()
+            for atendimento in atendimentos[indice::THREADS]:
+                fila.inserir(atendimento)
+                try:
+                    chamados[indice].append(fila.proximo())
+                except FilaVaziaError:
+                    pass
+            while True:
+                try:
+                    chamados[indice].append(fila.proximo())
+                except FilaVaziaError:
+                    break
+
+        self.executar_threads(guiche)
+        todos = [id(a) for lista in chamados for a in lista]
+        self.assertEqual(len(todos), len(atendimentos))
+        self.assertEqual(set(todos), {id(a) for a in atendimentos})
+        self.assertEqual(fila.tamanho(), 0)
+        self.assertTrue(all(fila.tamanho(risco) == 0 for risco in Risco))
+
+    def test_cpf_unico_com_insercoes_concorrentes(self):
+        """RN5 - Apenas um dos cadastros simultâneos do mesmo CPF é aceito."""
+        repo = PacienteRepositoryConcorrente()
+        erros = []
+
+        def cadastrar(barreira, indice):
+            barreira.wait()
+            try:
+                repo.inserir(Paciente("Ana Souza", "52998224725", f"ana{indice}@email.com", "12/12/1985"))
+            except CPFDuplicadoError:
+                erros.append(indice)
+
+        self.executar_threads(cadastrar)
+        self.assertEqual(repo.tamanho(), 1)
+        self.assertEqual(len(erros), THREADS - 1)
+
+    def test_busca_por_nome_com_insercoes_concorrentes(self):
+        """A busca por prefixo curto percorre o índice de nomes enquanto outras threads inserem."""
+        repo = PacienteRepositoryConcorrente()
+        letras = "abcdefghijklmnopqrstuvwxyz"
+        erros = []
+
+        def cadastrar_e_buscar(barreira, indice):
+            barreira.wait()
+            try:
+                for i in range(200):
+                    nome = letras[indice % 26] + letras[i % 26] + letras[i // 26 % 26] + " Souza"
+                    repo.inserir(Paciente(nome, gerar_cpf(indice * 1000 + i), "ana@email.com", "12/12/1985"))
+                    repo.buscar_por_nome(letras[i % 26])
+            except RuntimeError as e:
+                erros.append(e)
+
+        self.executar_threads(cadastrar_e_buscar)
+        self.assertEqual(erros, [])
+        self.assertEqual(repo.tamanho(), THREADS * 200)
+
+    def test_historico_concorrente(self):
+        pacientes = PacienteRepositoryConcorrente()
+        pacientes.inserir(self.paciente)
+        repo = AtendimentoRepositoryConcorrente(pacientes)
+
+        def registrar(barreira, indice):
+            barreira.wait()
+            for _ in range(100):
+                repo.inserir(Atendimento(self.paciente, Risco.VERDE))
+                historico = repo.historico_atendimentos("52998224725")
+                self.assertEqual([a.entrada for a in historico], sorted(a.entrada for a in historico))
+
+        self.executar_threads(registrar)
+        self.assertEqual(repo.contar_atendimentos("52998224725"), THREADS * 100)
@@ -1,18 +1,18 @@
 import unittest
 from datetime import datetime
 from main.error import ValidacaoError
-from main.domain import Paciente, FilaAtendimento, Risco, Atendimento
+from main.domain import Paciente, FilaAtendimento, FilaAtendimentoMultinivel, Risco, Atendimento
 from main.error import *
 
 
 class TestEntities(unittest.TestCase):
     def test_nome_pessoa_validate(self):
         with self.assertRaises(ValidacaoError) as context:
-            Paciente(nome="   ", cpf="11111111111", email = "teste@teste.com", nascimento="11/11/1111")
+            Paciente(nome="   ", cpf="52998224725", email = "teste@teste.com", nascimento="11/11/1111")
         self.assertIn("nome", context.exception.args[0])
         
         with self.assertRaises(ValidacaoError) as context:
-            Paciente(nome="12345", cpf="11111111111", email="teste@teste.com", nascimento="11/11/1111")
+            Paciente(nome="12345", cpf="52998224725", email="teste@teste.com", nascimento="11/11/1111")
         self.assertIn("caracteres inválidos", context.exception.args[0])
     
     
@@ -28,28 +28,28 @@ class TestEntities(unittest.TestCase):
 
     def test_email_validate(self):
         with self.assertRaises(ValidacaoError) as context:
-            Paciente(nome="Teste", cpf="11111111111", email="email_invalido", nascimento="11/11/1111")
+            Paciente(nome="Teste", cpf="52998224725", email="email_invalido", nascimento="11/11/1111")
         self.assertIn("E-mail inválido", context.exception.args[0])
 
         with self.assertRaises(ValidacaoError) as context:
-            Paciente(nome="Teste", cpf="11111111111", email="teste@com", nascimento="11/11/1111")
+            Paciente(nome="Teste", cpf="52998224725", email="teste@com", nascimento="11/11/1111")
         self.assertIn("E-mail inválido", context.exception.args[0])
 
 
     def test_nascimento_validate(self):
         with self.assertRaises(ValidacaoError) as context:
-            Paciente(nome="Teste", cpf="11111111111", email="teste@teste.com", nascimento="31/02/2020")
+            Paciente(nome="Teste", cpf="52998224725", email="teste@teste.com", nascimento="31/02/2020")
         self.assertIn("Data de nascimento inválida", context.exception.args[0])
 
         with self.assertRaises(ValidacaoError) as context:
-            Paciente(nome="Teste", cpf="11111111111", email="teste@teste.com", nascimento="11/11/3000")
+            Paciente(nome="Teste", cpf="52998224725", email="teste@teste.com", nascimento="11/11/3000")
         self.assertIn("A data de nascimento não pode ser futura", context.exception.args[0])
 
         
     def test_paciente_valido(self):
-        paciente = Paciente(nome="Maria Silva", cpf="12345678901", email="maria@example.com", nascimento="15/05/1995")
+        paciente = Paciente(nome="Maria Silva", cpf="12345678909", email="maria@example.com", nascimento="15/05/1995")
         self.assertEqual(paciente.nome, "Maria Silva")
-        self.assertEqual(paciente.cpf, "12345678901")
+        self.assertEqual(paciente.cpf, "12345678909")
         self.assertEqual(paciente.email, "maria@example.com")
         self.assertEqual(paciente.nascimento, "15/05/1995")
 
@@ -57,8 +57,8 @@ class TestProximoDaFila(unittest.TestCase):
     def setUp(self):
         """Configuração antes de cada teste"""
         self.fila = FilaAtendimento()
-        self.paciente1 = Paciente(nome="Carlos Silva", cpf="11111111111", email="carlos@teste.com", nascimento="11/11/1990")
-        self.paciente2 = Paciente(nome="Ana Souza", cpf="22222222222", email="ana@teste.com", nascimento="12/12/1985")
+        self.paciente1 = Paciente(nome="Carlos Silva", cpf="52998224725", email="carlos@teste.com", nascimento="11/11/1990")
+        self.paciente2 = Paciente(nome="Ana Souza", cpf="11144477735", email="ana@teste.com", nascimento="12/12/1985")
 
     def tearDown(self):
         """Limpeza após cada teste"""
@@ -75,7 +75,7 @@ class TestProximoDaFila(unittest.TestCase):
     def test_paciente_nao_registrado_erro_email(self):
         """RT3 - Testa se um paciente com e-mail inválido levanta uma exceção e não entra na fila"""
         with self.assertRaises(ValidacaoError) as context:
-            Paciente(nome="Lucas Martins", cpf="33333333333", email="email-invalido", nascimento="15/08/1995")
+            Paciente(nome="Lucas Martins", cpf="39053344705", email="email-invalido", nascimento="15/08/1995")
         self.assertIn("E-mail inválido", str(context.exception))
 
     def test_triagem_gravidade_moderada_fila_com_pacientes(self):
@@ -130,3 +130,81 @@ class TestProximoDaFila(unittest.TestCase):
         
         if hasattr(self.fila, "historico"):
             self.assertIn(atendimento, self.fila.historico)
+
+
+class TestFilaAtendimentoEstavel(unittest.TestCase):
+    classe_fila = FilaAtendimento
+    # Um atendimento reclassificado mantém a ordem de chegada no novo nível.
+    preserva_ordem = True
+
+    def setUp(self):
+        self.fila = self.classe_fila()
+        self.pacientes = [
+            Paciente(nome=nome, cpf=cpf, email="p@teste.com", nascimento="01/01/1990")
+            for nome, cpf in [("Ana", "52998224725"), ("Bruno", "11144477735"), ("Carla", "12345678909")]
+        ]
+
+    def test_mesmo_risco_ordem_chegada(self):
+        """RN3 - Pacientes com o mesmo risco são chamados por ordem de chegada"""
+        atendimentos = [Atendimento(p, Risco.AMARELO) for p in self.pacientes]
+        for atendimento in atendimentos:
+            self.fila.inserir(atendimento)
+        self.assertEqual([self.fila.proximo() for _ in atendimentos], atendimentos)
+
+    def test_remover_atendimento(self):
+        """Testa a remoção de um paciente que deixou a fila"""
+        a1, a2, a3 = [Atendimento(p, Risco.VERDE) for p in self.pacientes]
+        for atendimento in (a1, a2, a3):
+            self.fila.inserir(atendimento)
+        self.fila.remover(a1)
+        self.assertEqual(self.fila.tamanho(), 2)
+        self.assertEqual(self.fila.tamanho(Risco.VERDE), 2)
+        self.assertEqual(self.fila.espiar(), a2)
+        self.assertEqual(self.fila.proximo(), a2)
+        self.assertEqual(self.fila.proximo(), a3)
+        self.assertFalse(self.fila.possui_proximo())
+        with self.assertRaises(FilaError):
+            self.fila.remover(a1)
+
+    def test_reclassificar(self):
+        """Testa se um paciente reclassificado muda de prioridade"""
+        a1, a2, a3 = [Atendimento(p, Risco.VERDE) for p in self.pacientes]
+        for atendimento in (a1, a2, a3):
+            self.fila.inserir(atendimento)
+        self.fila.reclassificar(a3, Risco.VERMELHO)
+        self.assertEqual(self.fila.tamanho(Risco.VERMELHO), 1)
+        self.assertEqual(self.fila.tamanho(Risco.VERDE), 2)
+        self.assertEqual([self.fila.proximo() for _ in range(3)], [a3, a1, a2])
+
+    def test_reclassificar_mesmo_nivel_e_retorno(self):
+        """Testa reclassificações para o mesmo nível e de volta ao nível anterior (A→B→A)"""
+        a1, a2, a3 = [Atendimento(p, Risco.VERDE) for p in self.pacientes]
+        for atendimento in (a1, a2, a3):
+            self.fila.inserir(atendimento)
+        self.fila.reclassificar(a2, Risco.VERDE)
+        self.fila.reclassificar(a1, Risco.AMARELO)
+        self.fila.reclassificar(a1, Risco.VERDE)
+        self.assertEqual(self.fila.tamanho(), 3)
+        self.assertEqual(self.fila.tamanho(Risco.VERDE), 3)
+        esperado = [a1, a2, a3] if self.preserva_ordem else [a3, a2, a1]
+        self.assertEqual([self.fila.proximo() for _ in range(3)], esperado)
+        self.assertFalse(self.fila.possui_proximo())
+
+    def test_espiar_fila_vazia(self):
+        with self.assertRaises(FilaVaziaError):
+            self.fila.espiar()
+
+    def test_prioridade_entre_niveis(self):
+        """RN2 - A fila respeita a classificação de risco"""
+        riscos = [Risco.AZUL, Risco.VERMELHO, Risco.AMARELO]
+        atendimentos = [Atendimento(p, r) for p, r in zip(self.pacientes, riscos)]
+        for atendimento in atendimentos:
+            self.fila.inserir(atendimento)
+        self.assertEqual([self.fila.proximo() for _ in atendimentos], [atendimentos[1], atendimentos[2], atendimentos[0]])
+        with self.assertRaises(FilaVaziaError):
+            self.fila.proximo()
+
+
+class TestFilaAtendimentoMultinivel(TestFilaAtendimentoEstavel):
+    classe_fila = FilaAtendimentoMultinivel
+    preserva_ordem = False
@@ -0,0 +1,96 @@
+import random
+import unittest
+from datetime import timedelta
+from main.domain import Atendimento, FilaAtendimento, FilaAtendimentoMultinivel, Paciente, Risco
+from main.error import FilaError, ValidacaoError
+from main.estimate import EstimadorEspera, IndiceOrdem
+from main.service import ProntoSocorroService
+
+
+class Tempo:
+    def __init__(self):
+        self.segundos = 0.0
+
+    def __call__(self):
+        return self.segundos
+
+class TestIndiceOrdem(unittest.TestCase):
+
+    def test_posicao_com_remocoes_e_reconstrucao(self):
+        gerador = random.Random(42)
+        indice = IndiceOrdem()
+        vivos = []
+        for ordem in range(5000):
+            indice.inserir(ordem, None)
+            vivos.append(ordem)
+            if gerador.random() < 0.6:
+                removido = vivos.pop(0 if gerador.random() < 0.8 else gerador.randrange(len(vivos)))
+                indice.remover(removido)
+        for posicao, ordem in enumerate(vivos):
+            self.assertEqual(indice.posicao(ordem), posicao)
+
+class TestEstimadorEspera(unittest.TestCase):
+
+    def setUp(self):
+        self.tempo = Tempo()
+        self.estimador = EstimadorEspera(alfa=0.5, tempo=self.tempo)
+        self.servico = ProntoSocorroService({}, {}, FilaAtendimento(), estimador=self.estimador)
+        self.paciente = Paciente("Maria Silva", "52998224725", "maria@teste.com", "01/01/1990")
+
+    def inserir(self, risco, quantidade):
+        atendimentos = [Atendimento(self.paciente, risco) for _ in range(quantidade)]
+        for atendimento in atendimentos:
+            self.servico.inserir_fila_atendimento(atendimento)
+        return atendimentos
+
+    def test_estimativa_pela_posicao_no_nivel(self):
+        verdes = self.inserir(Risco.VERDE, 4)
+        self.assertIsNone(self.servico.estimar_espera(verdes[0]))
+        for _ in range(2):
+            self.tempo.segundos += 600
+            self.servico.chamar_proximo()
+        self.assertEqual(self.estimador.intervalos[Risco.VERDE], 600)
+        self.assertEqual(self.servico.estimar_espera(verdes[2]), timedelta(minutes=10))
+        self.assertEqual(self.servico.estimar_espera(verdes[3]), timedelta(minutes=20))
+        self.tempo.segundos += 300
+        self.assertEqual(self.servico.estimar_espera(verdes[3]), timedelta(minutes=15))
+        self.assertEqual(self.servico.estimar_espera_fila(),
+                         [(verdes[2], timedelta(minutes=5)), (verdes[3], timedelta(minutes=15))])
+
+    def test_nivel_sem_chamadas_usa_intervalo_geral(self):
+        self.inserir(Risco.VERDE, 2)
+        for _ in range(2):
+            self.tempo.segundos += 120
+            self.servico.chamar_proximo()
+        amarelo, azul = self.inserir(Risco.AMARELO, 1)[0], self.inserir(Risco.AZUL, 1)[0]
+        self.assertEqual(self.servico.estimar_espera(amarelo), timedelta(minutes=2))
+        self.assertEqual(self.servico.estimar_espera(azul), timedelta(minutes=4))
+
+    def test_remover_e_reclassificar(self):
+        verdes = self.inserir(Risco.VERDE, 3)
+        self.tempo.segundos += 60
+        self.servico.chamar_proximo()
+        self.servico.remover_fila_atendimento(verdes[1])
+        self.assertEqual(self.servico.estimar_espera(verdes[2]), timedelta(minutes=1))
+        self.servico.reclassificar_risco(verdes[2], Risco.LARANJA)
+        self.assertEqual(self.estimador.indices[Risco.LARANJA].posicao(self.estimador.ordens[id(verdes[2])]), 0)
+        self.assertEqual(self.servico.chamar_proximo(), verdes[2])
+        with self.assertRaises(FilaError):
+            self.servico.estimar_espera(verdes[2])
+
+    def test_reclassificado_vai_para_o_fim_do_nivel(self):
+        estimador = EstimadorEspera(preservar_ordem=False, tempo=self.tempo)
+        servico = ProntoSocorroService({}, {}, FilaAtendimentoMultinivel(), estimador=estimador)
+        atendimentos = [Atendimento(self.paciente, risco) for risco in (Risco.VERDE, Risco.AMARELO, Risco.AMARELO)]
+        for atendimento in atendimentos:
+            servico.inserir_fila_atendimento(atendimento)
+        servico.reclassificar_risco(atendimentos[0], Risco.AMARELO)
+        self.assertEqual(estimador.indices[Risco.AMARELO].posicao(estimador.ordens[id(atendimentos[0])]), 2)
+
+    def test_servico_sem_estimador(self):
+        with self.assertRaises(ValidacaoError):
+            ProntoSocorroService({}, {}).estimar_espera(None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import threading
+import unittest
+from main.domain import Atendimento, Paciente, Risco
+from main.error import EventoError, ValidacaoError
+from main.events import (ATENDIMENTO_REGISTRADO, BLOQUEAR, FILA_INSERIDO, PACIENTE_CHAMADO, PACIENTE_REGISTRADO, RISCO_RECLASSIFICADO,
+                         BarramentoEventos)
+from main.repository import AtendimentoRepository, PacienteRepository
+from main.service import ProntoSocorroService
+
+
+class TestBarramentoEventos(unittest.TestCase):
+
+    def test_assinaturas_leem_de_forma_independente(self):
+        barramento = BarramentoEventos(capacidade=8)
+        primeira, segunda = barramento.assinar(), barramento.assinar()
+        for i in range(3):
+            barramento.publicar("teste", i)
+        self.assertEqual([e.dados for e in primeira.ler()], [0, 1, 2])
+        self.assertEqual([e.dados for e in segunda.ler(maximo=2)], [0, 1])
+        self.assertEqual(primeira.ler(), [])
+        self.assertEqual([e.offset for e in segunda.ler()], [2])
+
+    def test_retomar_de_offset(self):
+        barramento = BarramentoEventos(capacidade=8)
+        for i in range(5):
+            barramento.publicar("teste", i)
+        self.assertEqual([e.dados for e in barramento.assinar(desde=3).ler()], [3, 4])
+        self.assertEqual(barramento.assinar().ler(), [])
+        with self.assertRaises(EventoError):
+            barramento.assinar(desde=6)
+        with self.assertRaises(ValidacaoError):
+            barramento.assinar(politica="ignorar")
+
+    def test_consumidor_lento_perde_eventos_antigos(self):
+        barramento = BarramentoEventos(capacidade=4)
+        assinatura = barramento.assinar()
+        for i in range(10):
+            barramento.publicar("teste", i)
+        self.assertEqual([e.dados for e in assinatura.ler()], [6, 7, 8, 9])
+        self.assertEqual(assinatura.perdidos, 6)
+        with self.assertRaises(EventoError):
+            barramento.assinar(desde=0, politica=BLOQUEAR)
+
+    def test_consumidor_bloqueante_aplica_contrapressao(self):
+        barramento = BarramentoEventos(capacidade=4)
+        assinatura = barramento.assinar(politica=BLOQUEAR)
+        for i in range(4):
+            barramento.publicar("teste", i)
+        publicador = threading.Thread(target=barramento.publicar, args=("teste", 4))
+        publicador.start()
+        publicador.join(0.1)
+        self.assertTrue(publicador.is_alive())
+        self.assertEqual(len(assinatura.ler(maximo=1)), 1)
+        publicador.join(5)
+        self.assertFalse(publicador.is_alive())
+        self.assertEqual([e.dados for e in assinatura.ler()], [1, 2, 3, 4])
+        self.assertEqual(assinatura.perdidos, 0)
+
+    def test_aguardar_evento(self):
+        barramento = BarramentoEventos()
+        assinatura = barramento.assinar()
+        self.assertEqual(assinatura.aguardar(timeout=0.01), [])
+        threading.Timer(0.05, barramento.publicar, ("teste", 1)).start()
+        self.assertEqual([e.dados for e in assinatura.aguardar(timeout=5)], [1])
+
+class TestServicoEventos(unittest.TestCase):
+
+    def test_alteracoes_publicadas(self):
+        pacientes = PacienteRepository()
+        barramento = BarramentoEventos()
+        servico = ProntoSocorroService(pacientes, AtendimentoRepository(pacientes), eventos=barramento)
+        assinatura = barramento.assinar()
+        paciente = servico.registrar_paciente("Maria Silva", "52998224725", "maria@teste.com", "01/01/1990")
+        atendimento = servico.registrar_atendimento(paciente, Risco.AMARELO)
+        servico.inserir_fila_atendimento(atendimento)
+        servico.reclassificar_risco(atendimento, Risco.VERMELHO)
+        servico.chamar_proximo()
+        eventos = assinatura.ler()
+        self.assertEqual([e.tipo for e in eventos], [PACIENTE_REGISTRADO, ATENDIMENTO_REGISTRADO, FILA_INSERIDO,
+                                                     RISCO_RECLASSIFICADO, PACIENTE_CHAMADO])
+        self.assertIs(eventos[0].dados, paciente)
+        self.assertIs(eventos[-1].dados, atendimento)
+        self.assertEqual([e.offset for e in eventos], list(range(5)))
+
+    def test_sem_barramento(self):
+        servico = ProntoSocorroService({}, {})
+        paciente = Paciente("Maria Silva", "52998224725", "maria@teste.com", "01/01/1990")
+        servico.inserir_fila_atendimento(Atendimento(paciente, Risco.AZUL))
+        self.assertEqual(servico.chamar_proximo().paciente, paciente)
+
+
+if __name__ == '__main__':
+    unittest.main()
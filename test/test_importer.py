@@ -0,0 +1,70 @@
+import io
+import unittest
+from main.domain import Paciente
+from main.importer import ImportadorPacientes, ler_csv, ler_jsonl
+from main.repository import PacienteRepository
+
+CSV = """nome,cpf,email,nascimento
+Maria Silva,52998224725,maria@email.com,15/05/1995
+Joao 2,11144477735,joao@email.com,01/01/1980
+Ana Souza,111.444.777-35,ana@email.com,12/12/1985
+Ana Duplicada,11144477735,ana2@email.com,12/12/1985
+Carlos Lima,12345678909,carlos@email.com,11/11/1990
+"""
+
+
+class TestImportadorPacientes(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = PacienteRepository()
+        self.repo.inserir(Paciente("Carlos Lima", "12345678909", "carlos@email.com", "11/11/1990"))
+        self.rejeitados = io.StringIO()
+        self.parciais = []
+        self.importador = ImportadorPacientes(self.repo, tamanho_lote=2, rejeitados=self.rejeitados,
+                                              progresso=self.parciais.append, intervalo_progresso=2)
+
+    def test_importar_csv(self):
+        """Testa a importação com registros inválidos e CPFs duplicados no arquivo e no repositório."""
+        resultado = self.importador.importar(ler_csv(io.StringIO(CSV)))
+
+        self.assertEqual((resultado.lidos, resultado.importados, resultado.rejeitados), (5, 2, 3))
+        self.assertEqual(self.repo.tamanho(), 3)
+        self.assertEqual(self.repo.buscar("11144477735").nome, "Ana Souza")
+        self.assertEqual(len(self.parciais), 2)
+
+        linhas = self.rejeitados.getvalue().splitlines()
+        self.assertEqual(len(linhas), 4)
+        self.assertTrue(linhas[1].startswith("3,O nome do paciente contém caracteres inválidos."))
+        self.assertTrue(linhas[2].startswith("5,CPF já cadastrado."))
+        self.assertTrue(linhas[3].startswith("6,CPF já cadastrado."))
+
+    def test_importar_jsonl(self):
+        jsonl = io.StringIO(
+            '{"nome": "Maria Silva", "cpf": "52998224725", "email": "maria@email.com", "nascimento": "15/05/1995"}\n'
+            '\n'
+            '{"nome": "Sem CPF", "email": "x@email.com", "nascimento": "15/05/1995"}\n'
+        )
+        resultado = self.importador.importar(ler_jsonl(jsonl))
+
+        self.assertEqual((resultado.lidos, resultado.importados, resultado.rejeitados), (2, 1, 1))
+        self.assertIn("3,Campo obrigatório ausente: cpf", self.rejeitados.getvalue())
+
+    def test_campos_nulos_ou_invalidos(self):
+        """null no JSON, campos faltando em uma linha curta do CSV e JSON inválido são rejeitados."""
+        jsonl = io.StringIO(
+            '{"nome": null, "cpf": "52998224725", "email": "maria@email.com", "nascimento": "15/05/1995"}\n'
+            '{"nome": "Maria Silva", "cpf": 52998224725, "email": "maria@email.com", "nascimento": "15/05/1995"}\n'
+            '{"nome": "Maria Silva", "cpf": "529\n'
+            '["Maria Silva"]\n'
+        )
+        resultado = self.importador.importar(ler_jsonl(jsonl))
+        csv = io.StringIO("nome,cpf,email,nascimento\nMaria Silva,52998224725\n")
+        resultado_csv = self.importador.importar(ler_csv(csv))
+
+        self.assertEqual((resultado.importados, resultado.rejeitados), (0, 4))
+        self.assertEqual((resultado_csv.importados, resultado_csv.rejeitados), (0, 1))
+        self.assertEqual(self.repo.tamanho(), 1)
+        motivos = [linha.split(",")[:2] for linha in self.rejeitados.getvalue().splitlines()[1:]]
+        self.assertEqual(motivos, [["1", "Campo obrigatório ausente: nome"], ["2", "Tipo inválido para o campo: cpf"],
+                                   ["3", "JSON inválido."], ["4", "O registro deve ser um objeto JSON."],
+                                   ["2", "Campo obrigatório ausente: email"]])
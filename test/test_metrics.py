@@ -0,0 +1,103 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+from main.domain import Atendimento, FilaAtendimento, FilaAtendimentoMultinivel, Paciente, Risco
+from main.metrics import HistogramaLog, MetricasFila, TaxaPorMinuto
+from main.service import ProntoSocorroService
+
+
+class Relogio:
+    """Relógio controlado pelo teste, usado tanto como data e hora quanto como tempo monotônico."""
+    def __init__(self):
+        self.agora = datetime(2024, 1, 1, 8, 0)
+        self.segundos = 0.0
+
+    def avancar(self, segundos):
+        self.agora += timedelta(seconds=segundos)
+        self.segundos += segundos
+
+    def data_hora(self):
+        return self.agora
+
+    def monotonico(self):
+        return self.segundos
+
+class TestHistogramaLog(unittest.TestCase):
+
+    def test_quantis_com_erro_limitado(self):
+        gerador = random.Random(42)
+        valores = sorted(gerador.randint(0, 10_000_000) for _ in range(20_000))
+        histograma = HistogramaLog()
+        for valor in valores:
+            histograma.registrar(valor)
+        for q in (0.5, 0.95, 0.99):
+            exato = valores[round(q * len(valores)) - 1]
+            self.assertAlmostEqual(histograma.quantil(q), exato, delta=exato / 32)
+        self.assertEqual(histograma.total, len(valores))
+
+    def test_valores_pequenos_exatos(self):
+        histograma = HistogramaLog()
+        for valor in (0, 1, 2, 3):
+            histograma.registrar(valor)
+        self.assertEqual(histograma.quantil(0.5), 1)
+        self.assertEqual(histograma.quantil(1), 3)
+        self.assertIsNone(HistogramaLog().quantil(0.5))
+
+class TestTaxaPorMinuto(unittest.TestCase):
+
+    def test_janela_de_um_minuto(self):
+        taxa = TaxaPorMinuto()
+        for segundo in range(90):
+            taxa.registrar(segundo + 0.5)
+        self.assertEqual(taxa.valor(89.9), 60)
+        self.assertEqual(taxa.valor(200), 0)
+
+class TestMetricasFila(unittest.TestCase):
+
+    def setUp(self):
+        self.relogio = Relogio()
+        self.metricas = MetricasFila(self.relogio.data_hora, self.relogio.monotonico)
+        self.paciente = Paciente("Maria Silva", "52998224725", "maria@teste.com", "01/01/1990")
+
+    def _atendimento(self, risco):
+        return Atendimento(self.paciente, risco, self.relogio.agora)
+
+    def test_snapshot(self):
+        servico = ProntoSocorroService({}, {}, FilaAtendimentoMultinivel(), metricas=self.metricas)
+        for risco in (Risco.AMARELO, Risco.AMARELO, Risco.VERDE):
+            servico.inserir_fila_atendimento(self._atendimento(risco))
+        self.relogio.avancar(30)
+        servico.chamar_proximo()
+        self.relogio.avancar(30)
+
+        resumo = self.metricas.snapshot(servico.fila_atendimento)
+        self.assertEqual(resumo.tamanho[Risco.AMARELO], 1)
+        self.assertEqual(resumo.tamanho[Risco.VERDE], 1)
+        self.assertEqual(resumo.espera_atual, {Risco.AMARELO: 60.0, Risco.VERDE: 60.0})
+        self.assertAlmostEqual(resumo.quantis_espera[Risco.AMARELO][0.5], 30.0, delta=30 / 32)
+        self.assertEqual(resumo.quantis_espera[None][0.99], resumo.quantis_espera[Risco.AMARELO][0.99])
+        self.assertIsNone(resumo.quantis_espera[Risco.VERDE][0.5])
+        self.assertEqual((resumo.chegadas, resumo.chamadas), (3, 1))
+        self.assertEqual((resumo.chegadas_por_minuto, resumo.chamadas_por_minuto), (0, 1))
+
+    def test_espera_atual_fila_heap(self):
+        fila = FilaAtendimento()
+        fila.inserir(self._atendimento(Risco.VERDE))
+        fila.inserir(self._atendimento(Risco.LARANJA))
+        self.relogio.avancar(5)
+        self.assertEqual(self.metricas.snapshot(fila).espera_atual, {Risco.LARANJA: 5.0})
+        self.assertEqual(self.metricas.snapshot(FilaAtendimento()).espera_atual, {})
+
+    def test_prometheus(self):
+        fila = FilaAtendimentoMultinivel()
+        servico = ProntoSocorroService({}, {}, fila, metricas=self.metricas)
+        servico.inserir_fila_atendimento(self._atendimento(Risco.LARANJA))
+        self.relogio.avancar(2)
+        servico.chamar_proximo()
+
+        texto = self.metricas.prometheus(fila)
+        self.assertIn('ps_fila_tamanho{risco="LARANJA"} 0\n', texto)
+        self.assertIn('ps_espera_segundos{risco="LARANJA",quantile="0.5"} ', texto)
+        self.assertIn('ps_espera_segundos_count{risco="LARANJA"} 1\n', texto)
+        self.assertIn("ps_chegadas_total 1\n", texto)
+        self.assertIn("# TYPE ps_chamadas_total counter\n", texto)
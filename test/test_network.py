@@ -0,0 +1,58 @@
+import unittest
+from main.domain import Risco
+from main.network import RedeProntoSocorro
+from main.error import FilaError, FilaVaziaError, ValidacaoError
+
+
+class TestRedeProntoSocorro(unittest.TestCase):
+
+    def setUp(self):
+        self.rede = RedeProntoSocorro(["centro", "norte"])
+        self.ana = self.rede.registrar_paciente("Ana", "52998224725", "ana@email.com", "01/01/2000")
+        self.bruno = self.rede.registrar_paciente("Bruno", "11144477735", "bruno@email.com", "05/06/1985")
+
+    def tearDown(self):
+        self.rede.encerrar()
+
+    def test_filas_por_unidade(self):
+        """Cada unidade chama apenas os pacientes da sua própria fila."""
+        a1 = self.rede.registrar_atendimento("centro", self.ana, Risco.VERDE)
+        a2 = self.rede.registrar_atendimento("norte", self.bruno, Risco.AMARELO)
+
+        self.assertIs(self.rede.chamar_proximo("centro"), a1)
+        with self.assertRaises(FilaVaziaError):
+            self.rede.chamar_proximo("centro")
+        self.assertIs(self.rede.chamar_proximo("norte"), a2)
+
+    def test_contagem_rede(self):
+        """Os totais da rede por nível de risco são agregados a partir das unidades."""
+        self.rede.registrar_atendimento("centro", self.ana, Risco.VERDE)
+        self.rede.registrar_atendimento("norte", self.bruno, Risco.VERDE)
+        self.rede.registrar_atendimento("norte", self.ana, Risco.VERMELHO)
+
+        self.assertEqual(self.rede.contagem_unidade("norte")[Risco.VERMELHO], 1)
+        contagem = self.rede.contagem_rede()
+        self.assertEqual(contagem[Risco.VERDE], 2)
+        self.assertEqual(contagem[Risco.VERMELHO], 1)
+        self.assertEqual(sum(contagem.values()), 3)
+
+    def test_transferir(self):
+        """Um paciente em espera pode ser transferido para a fila de outra unidade."""
+        atendimento = self.rede.registrar_atendimento("centro", self.ana, Risco.LARANJA)
+        self.rede.transferir(atendimento, "norte")
+
+        self.assertEqual(self.rede.unidade_atendimento(atendimento), "norte")
+        self.assertEqual(self.rede.contagem_unidade("centro")[Risco.LARANJA], 0)
+        self.assertIs(self.rede.chamar_proximo("norte"), atendimento)
+        with self.assertRaises(FilaError):
+            self.rede.transferir(atendimento, "centro")
+
+    def test_historico_compartilhado(self):
+        self.rede.registrar_atendimento("centro", self.ana, Risco.AZUL)
+        self.rede.registrar_atendimento("norte", self.ana, Risco.AZUL)
+        self.assertEqual(len(self.rede.atendimentos.historico_atendimentos("52998224725")), 2)
+
+    def test_unidade_desconhecida(self):
+        with self.assertRaises(ValidacaoError):
+            self.rede.registrar_atendimento("sul", self.ana, Risco.AZUL)
+        self.assertEqual(self.rede.atendimentos.historico_atendimentos("52998224725"), [])
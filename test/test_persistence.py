@@ -0,0 +1,139 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from main.domain import Atendimento, FilaAtendimentoMultinivel, Paciente, Risco
+from main.persistence import LogEventos, ProntoSocorroServicePersistente, ARQUIVO_LOG
+from main.error import PersistenciaError, PacienteNaoCadastradoError
+
+
+class TestProntoSocorroServicePersistente(unittest.TestCase):
+
+    def setUp(self):
+        """Cria um diretório temporário para o log e o snapshot."""
+        self.diretorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio)
+
+    def criar_servico(self, **kwargs):
+        return ProntoSocorroServicePersistente(self.diretorio, **kwargs)
+
+    def popular(self, servico):
+        ana = servico.registrar_paciente("Ana", "52998224725", "ana@email.com", "01/01/2000")
+        bruno = servico.registrar_paciente("Bruno", "11144477735", "bruno@email.com", "05/06/1985")
+        carla = servico.registrar_paciente("Carla", "12345678909", "carla@email.com", "10/10/1995")
+        for paciente, risco in [(ana, Risco.VERDE), (bruno, Risco.VERMELHO), (carla, Risco.VERDE)]:
+            servico.inserir_fila_atendimento(servico.registrar_atendimento(paciente, risco))
+        servico.chamar_proximo()
+        return ana, bruno, carla
+
+    def verificar_estado(self, servico, ana, carla):
+        self.assertEqual(servico.pacientes.tamanho(), 3)
+        self.assertEqual(servico.fila_atendimento.tamanho(), 2)
+        self.assertEqual(servico.chamar_proximo().paciente, ana)
+        self.assertEqual(servico.chamar_proximo().paciente, carla)
+        self.assertEqual(len(servico.buscar_historico(ana)), 1)
+
+    def test_recuperar_do_log(self):
+        """Testa se pacientes, atendimentos e a fila sobrevivem a um reinício."""
+        servico = self.criar_servico(politica_fsync='sempre')
+        ana, _, carla = self.popular(servico)
+        servico.fechar()
+
+        self.verificar_estado(self.criar_servico(), ana, carla)
+
+    def test_recuperar_do_snapshot_e_log(self):
+        """Testa a recuperação a partir de um snapshot seguido de eventos posteriores."""
+        servico = self.criar_servico(intervalo_snapshot=4, fila=FilaAtendimentoMultinivel())
+        ana, _, carla = self.popular(servico)
+        servico.fechar()
+
+        self.verificar_estado(self.criar_servico(fila=FilaAtendimentoMultinivel()), ana, carla)
+
+    def test_reclassificacao_e_remocao(self):
+        servico = self.criar_servico()
+        ana, bruno, carla = self.popular(servico)
+        atendimento = servico.registrar_atendimento(bruno, Risco.AZUL)
+        servico.inserir_fila_atendimento(atendimento)
+        servico.reclassificar_risco(atendimento, Risco.LARANJA)
+        servico.remover_fila_atendimento(servico.fila_atendimento.espiar())
+        servico.fechar()
+
+        recuperado = self.criar_servico()
+        self.assertEqual(recuperado.fila_atendimento.tamanho(), 2)
+        self.assertEqual(recuperado.fila_atendimento.tamanho(Risco.VERDE), 2)
+
+    def test_fila_exige_paciente_cadastrado(self):
+        servico = self.criar_servico()
+        paciente = Paciente("Davi", "98765432100", "davi@email.com", "20/12/1990")
+        with self.assertRaises(PacienteNaoCadastradoError):
+            servico.inserir_fila_atendimento(Atendimento(paciente, Risco.AMARELO))
+        servico.fechar()
+
+    def test_ultima_linha_incompleta(self):
+        """Uma escrita interrompida no fim do log é ignorada na recuperação."""
+        servico = self.criar_servico()
+        ana, _, carla = self.popular(servico)
+        servico.fechar()
+        with open(os.path.join(self.diretorio, ARQUIVO_LOG), 'a') as arquivo:
+            arquivo.write('[99,"fila"')
+
+        self.verificar_estado(self.criar_servico(), ana, carla)
+
+    def test_escrita_apos_linha_incompleta(self):
+        """Eventos gravados depois de recuperar um log com o fim interrompido sobrevivem a outro reinício."""
+        servico = self.criar_servico()
+        self.popular(servico)
+        servico.fechar()
+        with open(os.path.join(self.diretorio, ARQUIVO_LOG), 'a') as arquivo:
+            arquivo.write('[99,"fila"')
+
+        servico = self.criar_servico()
+        davi = servico.registrar_paciente("Davi", "98765432100", "davi@email.com", "20/12/1990")
+        servico.inserir_fila_atendimento(servico.registrar_atendimento(davi, Risco.AZUL))
+        servico.fechar()
+
+        recuperado = self.criar_servico()
+        self.assertEqual(recuperado.pacientes.tamanho(), 4)
+        self.assertEqual(recuperado.fila_atendimento.tamanho(), 3)
+        recuperado.fechar()
+
+    def test_politica_fsync_invalida(self):
+        with self.assertRaises(PersistenciaError):
+            LogEventos(os.path.join(self.diretorio, 'x.log'), politica_fsync='as vezes')
+
+    def test_fsync_em_lote_sem_novos_eventos(self):
+        """Na política 'lote', o fsync ocorre após `intervalo_fsync` mesmo sem outro evento."""
+        log = LogEventos(os.path.join(self.diretorio, 'x.log'), politica_fsync='lote', intervalo_fsync=0.2)
+        threads = []
+        sincronizado = threading.Event()
+
+        def fsync(_):
+            threads.append(threading.current_thread())
+            sincronizado.set()
+
+        log.sincronizar()
+        with mock.patch('main.persistence.os.fsync', side_effect=fsync):
+            log.registrar('paciente', 'Ana')
+            self.assertTrue(sincronizado.wait(5))
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+        with log.trava:
+            self.assertEqual(log.pendentes, 0)
+        log.fechar()
+        self.assertIsNone(log.temporizador)
+
+    def test_snapshot_sincroniza_diretorio(self):
+        """O diretório é sincronizado após a troca do snapshot e antes de o log ser descartado."""
+        servico = self.criar_servico(politica_fsync='nunca')
+        self.popular(servico)
+        ordem = []
+        reiniciar = servico.log.reiniciar
+        with mock.patch('main.persistence.sincronizar_diretorio', side_effect=ordem.append), \
+                mock.patch.object(servico.log, 'reiniciar', side_effect=lambda: (ordem.append('log'), reiniciar())):
+            servico.snapshot()
+        self.assertEqual(ordem, [self.diretorio, 'log'])
+        servico.fechar()
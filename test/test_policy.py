@@ -0,0 +1,74 @@
+import unittest
+from datetime import datetime, timedelta
+from main.concurrency import FilaAtendimentoConcorrente
+from main.domain import FilaAtendimento, FilaAtendimentoMultinivel, Atendimento, Paciente, Risco
+from main.policy import PoliticaEnvelhecimento
+from main.service import ProntoSocorroService
+from main.error import ValidacaoError
+
+AGORA = datetime(2024, 1, 1, 12, 0)
+
+
+class TestPoliticaEnvelhecimento(unittest.TestCase):
+
+    def setUp(self):
+        """Cria um serviço com fila multinível e relógio fixo."""
+        self.fila = FilaAtendimentoMultinivel()
+        self.politica = PoliticaEnvelhecimento(relogio=lambda: AGORA)
+        self.pronto_socorro = ProntoSocorroService({}, {}, self.fila, self.politica)
+        self.paciente1 = Paciente("Ana", "52998224725", "ana@email.com", "01/01/2000")
+        self.paciente2 = Paciente("Bruno", "11144477735", "bruno@email.com", "05/06/1985")
+        self.paciente3 = Paciente("Carla", "12345678909", "carla@email.com", "10/10/1995")
+
+    def chegada(self, paciente, risco, minutos_atras):
+        atendimento = Atendimento(paciente, risco, AGORA - timedelta(minutes=minutos_atras))
+        self.pronto_socorro.inserir_fila_atendimento(atendimento)
+        return atendimento
+
+    def test_prioridade_dentro_do_prazo(self):
+        """Sem atrasos, a fila respeita a classificação de risco."""
+        verde = self.chegada(self.paciente1, Risco.VERDE, 100)
+        laranja = self.chegada(self.paciente2, Risco.LARANJA, 5)
+        self.assertEqual(self.pronto_socorro.chamar_proximo(), laranja)
+        self.assertEqual(self.pronto_socorro.chamar_proximo(), verde)
+
+    def test_paciente_baixo_risco_atrasado(self):
+        """Um paciente AZUL que excedeu o tempo máximo passa à frente de um AMARELO no prazo."""
+        azul = self.chegada(self.paciente1, Risco.AZUL, 300)
+        amarelo = self.chegada(self.paciente2, Risco.AMARELO, 30)
+        self.assertEqual(self.pronto_socorro.chamar_proximo(), azul)
+        self.assertEqual(self.pronto_socorro.chamar_proximo(), amarelo)
+
+    def test_maior_atraso_proporcional(self):
+        """Entre pacientes atrasados, é chamado o que mais excedeu o prazo do seu nível."""
+        verde = self.chegada(self.paciente1, Risco.VERDE, 130)
+        laranja = self.chegada(self.paciente2, Risco.LARANJA, 20)
+        self.assertEqual(self.pronto_socorro.chamar_proximo(), laranja)
+        self.assertEqual(self.pronto_socorro.chamar_proximo(), verde)
+
+    def test_vermelho_sempre_primeiro(self):
+        """RN2 - Pacientes VERMELHO são sempre chamados primeiro."""
+        self.chegada(self.paciente1, Risco.AZUL, 1000)
+        vermelho = self.chegada(self.paciente2, Risco.VERMELHO, 0)
+        self.assertEqual(self.pronto_socorro.chamar_proximo(), vermelho)
+
+    def test_nivel_esvaziado_por_outro_guiche(self):
+        """Se o nível escolhido é esvaziado antes da retirada, a escolha é refeita."""
+        class FilaDisputada(FilaAtendimentoConcorrente):
+            def proximo(self, risco=None):
+                if risco is not None and not self.disputada:
+                    self.disputada = True
+                    super().proximo(risco)
+                return super().proximo(risco)
+
+        fila = FilaDisputada()
+        fila.disputada = False
+        self.pronto_socorro = ProntoSocorroService({}, {}, fila, self.politica)
+        self.chegada(self.paciente1, Risco.AZUL, 300)
+        amarelo = self.chegada(self.paciente2, Risco.AMARELO, 30)
+        self.assertEqual(self.pronto_socorro.chamar_proximo(), amarelo)
+        self.assertTrue(fila.disputada)
+
+    def test_exige_fila_multinivel(self):
+        with self.assertRaises(ValidacaoError):
+            self.politica.proximo(FilaAtendimento())
@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import unittest
+from main import validation
+from main.domain import Risco
+from main.profiling import Perfilador
+from main.repository import PacienteRepository, AtendimentoRepository
+from main.service import ProntoSocorroService
+
+
+class RelogioContador:
+    """Relógio em nanossegundos que avança 10 ns a cada leitura."""
+    def __init__(self):
+        self.agora = 0
+
+    def __call__(self):
+        self.agora += 10
+        return self.agora
+
+class TestPerfilador(unittest.TestCase):
+
+    def setUp(self):
+        pacientes = PacienteRepository()
+        self.servico = ProntoSocorroService(pacientes, AtendimentoRepository(pacientes))
+        self.perfilador = Perfilador(relogio=RelogioContador())
+        self.addCleanup(self.perfilador.desinstrumentar)
+
+    def _registrar(self):
+        paciente = self.servico.registrar_paciente("Maria Silva", "52998224725", "maria@teste.com", "01/01/1990")
+        atendimento = self.servico.registrar_atendimento(paciente, Risco.AMARELO)
+        self.servico.inserir_fila_atendimento(atendimento)
+        return self.servico.chamar_proximo()
+
+    def test_histogramas_por_metodo(self):
+        self.perfilador.instrumentar_servico(self.servico)
+        self._registrar()
+        resumo = self.perfilador.resumo()
+
+        for nome in ("ProntoSocorroService.registrar_paciente", "PacienteRepository.inserir",
+                     "AtendimentoRepository.inserir", "FilaAtendimento.proximo", "main.validation.validar_cpf"):
+            self.assertEqual(resumo[nome]["chamadas"], 1, nome)
+        self.assertGreater(resumo["ProntoSocorroService.registrar_paciente"]["total"],
+                           resumo["PacienteRepository.inserir"]["total"])
+
+    def test_trace_com_spans_aninhados(self):
+        self.perfilador.instrumentar_servico(self.servico)
+        self._registrar()
+        eventos = {evento["name"]: evento for evento in self.perfilador.trace()["traceEvents"]}
+
+        externo = eventos["ProntoSocorroService.registrar_atendimento"]
+        interno = eventos["AtendimentoRepository.inserir"]
+        self.assertEqual(externo["ph"], "X")
+        self.assertLessEqual(externo["ts"], interno["ts"])
+        self.assertLessEqual(interno["ts"] + interno["dur"], externo["ts"] + externo["dur"])
+
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "trace.json")
+            self.perfilador.salvar_trace(caminho)
+            with open(caminho, encoding="utf-8") as arquivo:
+                self.assertEqual(len(json.load(arquivo)["traceEvents"]), len(self.perfilador.eventos))
+
+    def test_amostragem_por_chamada_externa(self):
+        self.perfilador.intervalo_amostragem = 2
+        self.perfilador.instrumentar(self.servico)
+        self.perfilador.instrumentar(self.servico.fila_atendimento)
+        self._registrar()
+        nomes = [nome for nome, *_ in self.perfilador.eventos]
+        # Chamadas externas 0 e 2 (registrar_paciente e inserir_fila_atendimento) com os seus spans internos.
+        self.assertEqual(sorted(nomes), ["FilaAtendimento.inserir", "ProntoSocorroService.inserir_fila_atendimento",
+                                         "ProntoSocorroService.registrar_paciente"])
+        self.assertEqual(self.perfilador.resumo()["ProntoSocorroService.chamar_proximo"]["chamadas"], 1)
+
+    def test_desinstrumentar(self):
+        originais = (validation.validar_cpf, type(self.servico).registrar_paciente)
+        self.perfilador.instrumentar_servico(self.servico)
+        self.assertIsNot(validation.validar_cpf, originais[0])
+        self.perfilador.desinstrumentar()
+        self.assertIs(validation.validar_cpf, originais[0])
+        self.assertNotIn("registrar_paciente", vars(self.servico))
+        self._registrar()
+        self.assertEqual(self.perfilador.resumo(), {})
@@ -0,0 +1,112 @@
+import itertools
+import os
+import tempfile
+import threading
+import unittest
+from main.domain import FichaAnalise, Risco
+from main.error import ProtocoloError
+from main.protocol import MotorProtocolo, ler_protocolo
+from main.service import ProntoSocorroService
+from main import triage
+
+PROTOCOLO_V1 = """
+versao: 1
+fluxograma: dor_toracica
+    VERMELHO: choque, via_aerea_comprometida
+    LARANJA: dor_precordial
+    AMARELO: dor_moderada
+"""
+
+PROTOCOLO_V2 = """
+versao: 2
+fluxograma: dor_toracica
+    VERMELHO: choque, via_aerea_comprometida
+    LARANJA: dor_precordial, dor_moderada
+"""
+
+
+class TestProtocolo(unittest.TestCase):
+
+    def setUp(self):
+        self.protocolo = ler_protocolo(PROTOCOLO_V1.splitlines())
+
+    def test_classificacao_pelo_discriminador_mais_grave(self):
+        fluxograma = self.protocolo.fluxograma("dor_toracica")
+        self.assertEqual(self.protocolo.versao, "1")
+        self.assertEqual(fluxograma.classificar(["dor_moderada"]), Risco.AMARELO)
+        self.assertEqual(fluxograma.classificar(["dor_moderada", "dor_precordial"]), Risco.LARANJA)
+        self.assertEqual(fluxograma.classificar(["dor_moderada", "via_aerea_comprometida"]), Risco.VERMELHO)
+        self.assertEqual(fluxograma.classificar([]), Risco.AZUL)
+        self.assertEqual(fluxograma.classificar_mascara(fluxograma.mascara(["dor_precordial"])), Risco.LARANJA)
+
+    def test_erros(self):
+        fluxograma = self.protocolo.fluxograma("dor_toracica")
+        with self.assertRaises(ProtocoloError):
+            fluxograma.classificar(["febre"])
+        with self.assertRaises(ProtocoloError):
+            self.protocolo.fluxograma("cefaleia")
+        for texto in ("fluxograma: a\n    VERMELHO: x", "versao: 1\nVERMELHO: x",
+                      "versao: 1\nfluxograma: a\n    VERMELHO: x\n    LARANJA: x",
+                      "versao: 1\nfluxograma: a\n    ROXO: x", "versao: 1\nfluxograma",
+                      "versao: 1\nfluxograma: geral\n    VERMELHO: x"):
+            with self.assertRaises(ProtocoloError):
+                ler_protocolo(texto.splitlines())
+
+    def test_fluxograma_geral_igual_triagem(self):
+        """O fluxograma geral do protocolo padrão segue as mesmas regras de classificar_risco."""
+        servico = ProntoSocorroService({}, {})
+        for valores in itertools.product([False, True], repeat=4):
+            presentes = [campo for campo, valor in zip(triage.CAMPOS, valores) if valor]
+            self.assertEqual(servico.classificar_protocolo("geral", presentes),
+                             triage.classificar(FichaAnalise(*valores)))
+        geral = self.protocolo.fluxograma("geral")
+        self.assertEqual(geral.mascara(["gravidade_alta", "gravidade_baixa"]),
+                         triage.mascara(FichaAnalise(False, True, False, True)))
+
+class TestMotorProtocolo(unittest.TestCase):
+
+    def setUp(self):
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.caminho = os.path.join(diretorio.name, "protocolo.txt")
+        self._gravar(PROTOCOLO_V1)
+        self.motor = MotorProtocolo(self.caminho)
+
+    def _gravar(self, texto):
+        with open(self.caminho, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto)
+
+    def test_recarregar(self):
+        self.assertEqual(self.motor.classificar("dor_toracica", ["dor_moderada"]), Risco.AMARELO)
+        self._gravar(PROTOCOLO_V2)
+        self.motor.recarregar()
+        self.assertEqual(self.motor.versao, "2")
+        self.assertEqual(self.motor.classificar("dor_toracica", ["dor_moderada"]), Risco.LARANJA)
+
+    def test_recarregar_invalido_mantem_versao(self):
+        self._gravar("versao: 3\nfluxograma: dor_toracica\n    VERMELHO: choque, choque")
+        with self.assertRaises(ProtocoloError):
+            self.motor.recarregar()
+        with self.assertRaises(ProtocoloError):
+            self.motor.recarregar(self.caminho + ".inexistente")
+        self.assertEqual(self.motor.versao, "1")
+
+    def test_recarregar_durante_classificacoes(self):
+        """As classificações continuam durante a recarga e sempre usam uma versão completa."""
+        resultados = set()
+        parar = threading.Event()
+
+        def classificar():
+            while not parar.is_set():
+                resultados.add(self.motor.classificar("dor_toracica", ["dor_moderada"]))
+
+        threads = [threading.Thread(target=classificar) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for texto in (PROTOCOLO_V2, PROTOCOLO_V1) * 10:
+            self._gravar(texto)
+            self.motor.recarregar()
+        parar.set()
+        for thread in threads:
+            thread.join()
+        self.assertLessEqual(resultados, {Risco.AMARELO, Risco.LARANJA})
@@ -0,0 +1,95 @@
+import unittest
+from datetime import datetime
+from main.domain import Paciente, Atendimento, Risco
+from main.repository import PacienteRepository, AtendimentoRepository
+from main.error import CPFDuplicadoError, PacienteNaoCadastradoError, ValidacaoError
+
+
+class TestPacienteRepository(unittest.TestCase):
+
+    def criar_repositorio(self):
+        return PacienteRepository()
+
+    def setUp(self):
+        """Cria um repositório com dois pacientes cadastrados."""
+        self.repo = self.criar_repositorio()
+        self.paciente1 = Paciente("Maria Silva", "52998224725", "maria@email.com", "15/05/1995")
+        self.paciente2 = Paciente("Mariana Costa", "11144477735", "familia@email.com", "01/02/1980")
+        self.repo.inserir(self.paciente1)
+        self.repo.inserir(self.paciente2)
+
+    def test_buscar_por_cpf(self):
+        """Testa a busca por CPF, inclusive com pontuação."""
+        self.assertEqual(self.repo.buscar("52998224725"), self.paciente1)
+        self.assertEqual(self.repo.buscar("111.444.777-35"), self.paciente2)
+        self.assertIsNone(self.repo.buscar("12345678909"))
+
+    def test_cpf_duplicado(self):
+        """RN5 - Testa se não é possível cadastrar dois pacientes com o mesmo CPF."""
+        duplicado = Paciente("Outra Pessoa", "529.982.247-25", "outra@email.com", "10/10/2000")
+        with self.assertRaises(CPFDuplicadoError):
+            self.repo.inserir(duplicado)
+        self.assertEqual(self.repo.tamanho(), 2)
+
+    def test_buscar_por_email(self):
+        """Testa a busca pelo índice de e-mail, sem diferenciar maiúsculas."""
+        self.assertEqual(self.repo.buscar_por_email("MARIA@email.com"), [self.paciente1])
+        self.assertEqual(self.repo.buscar_por_email("nao@existe.com"), [])
+
+    def test_buscar_por_nome(self):
+        """Testa a busca pelo prefixo do nome, com prefixos curtos e longos."""
+        self.assertEqual(self.repo.buscar_por_nome("mari"), [self.paciente1, self.paciente2])
+        self.assertEqual(self.repo.buscar_por_nome("Mariana"), [self.paciente2])
+        self.assertEqual(self.repo.buscar_por_nome("m"), [self.paciente1, self.paciente2])
+        self.assertEqual(self.repo.buscar_por_nome("Jo"), [])
+
+
+class TestAtendimentoRepository(unittest.TestCase):
+
+    def criar_repositorios(self):
+        pacientes = PacienteRepository()
+        return pacientes, AtendimentoRepository(pacientes)
+
+    def setUp(self):
+        """Cria um paciente com atendimentos em três dias diferentes."""
+        self.pacientes, self.repo = self.criar_repositorios()
+        self.paciente = Paciente("Carlos Lima", "52998224725", "carlos@email.com", "11/11/1990")
+        self.outro = Paciente("Ana Souza", "11144477735", "ana@email.com", "12/12/1985")
+        self.pacientes.inserir(self.paciente)
+        self.pacientes.inserir(self.outro)
+        self.dias = [Atendimento(self.paciente, Risco.VERDE, datetime(2024, 1, dia)) for dia in (1, 2, 3)]
+        self.repo.inserir(self.dias[1])
+        self.repo.inserir(Atendimento(self.outro, Risco.AZUL, datetime(2024, 1, 2)))
+        self.repo.inserir(self.dias[0])
+        self.repo.inserir(self.dias[2])
+
+    def test_historico_completo_ordenado(self):
+        """Testa se o histórico contém todos os atendimentos do paciente, inclusive o mais recente."""
+        self.assertEqual(self.repo.historico_atendimentos("52998224725"), self.dias)
+        self.assertEqual(self.repo.contar_atendimentos("52998224725"), 3)
+
+    def test_historico_intervalo(self):
+        """Testa o filtro por data de entrada."""
+        historico = self.repo.historico_atendimentos("52998224725", desde=datetime(2024, 1, 2))
+        self.assertEqual(historico, self.dias[1:])
+        historico = self.repo.historico_atendimentos("52998224725", ate=datetime(2024, 1, 2))
+        self.assertEqual(historico, self.dias[:2])
+        historico = self.repo.historico_atendimentos("52998224725", desde=datetime(2024, 2, 1))
+        self.assertEqual(historico, [])
+
+    def test_historico_paginado(self):
+        """Testa a paginação do histórico."""
+        self.assertEqual(self.repo.historico_atendimentos("52998224725", inicio=1, limite=1), [self.dias[1]])
+        self.assertEqual(self.repo.historico_atendimentos("52998224725", inicio=2, limite=5), [self.dias[2]])
+        self.assertEqual(self.repo.historico_atendimentos("52998224725", inicio=10), [])
+
+    def test_historico_paginacao_negativa(self):
+        with self.assertRaises(ValidacaoError):
+            self.repo.historico_atendimentos("52998224725", inicio=-1)
+        with self.assertRaises(ValidacaoError):
+            self.repo.historico_atendimentos("52998224725", limite=-1)
+
+    def test_paciente_nao_cadastrado(self):
+        """Testa se buscar o histórico de um CPF não cadastrado levanta exceção."""
+        with self.assertRaises(PacienteNaoCadastradoError):
+            self.repo.historico_atendimentos("12345678909")
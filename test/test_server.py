@@ -0,0 +1,99 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+from main.repository import PacienteRepository, AtendimentoRepository
+from main.server import ServidorHTTP
+from main.service import ProntoSocorroService
+
+PACIENTE = {"nome": "Ana Souza", "cpf": "52998224725", "email": "ana@email.com", "nascimento": "12/12/1985"}
+
+
+def requisicao(metodo, alvo, dados=None, conexao="keep-alive"):
+    corpo = json.dumps(dados).encode() if dados is not None else b""
+    return (f"{metodo} {alvo} HTTP/1.1\r\nHost: teste\r\nConnection: {conexao}\r\n"
+            f"Content-Length: {len(corpo)}\r\n\r\n").encode() + corpo
+
+
+async def ler_resposta(reader):
+    cabecalho = (await reader.readuntil(b"\r\n\r\n")).decode()
+    status = int(cabecalho.split(" ")[1])
+    tamanho = int(cabecalho.lower().split("content-length: ")[1].split("\r\n")[0])
+    return status, json.loads(await reader.readexactly(tamanho))
+
+
+class TestServidorHTTP(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        pacientes = PacienteRepository()
+        self.ps_service = ProntoSocorroService(pacientes, AtendimentoRepository(pacientes))
+        self.servidor = await ServidorHTTP(self.ps_service).iniciar("127.0.0.1", 0)
+        porta = self.servidor.sockets[0].getsockname()[1]
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", porta)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        self.servidor.close()
+        await self.servidor.wait_closed()
+
+    async def enviar(self, *requisicoes):
+        self.writer.write(b"".join(requisicoes))
+        await self.writer.drain()
+        return [await ler_resposta(self.reader) for _ in requisicoes]
+
+    async def test_fluxo_completo_com_pipelining(self):
+        """Testa o fluxo de atendimento com várias requisições em pipeline na mesma conexão."""
+        respostas = await self.enviar(
+            requisicao("POST", "/pacientes", PACIENTE),
+            requisicao("POST", "/atendimentos", {"cpf": "52998224725", "gravidade_baixa": True}),
+            requisicao("POST", "/atendimentos", {"cpf": "52998224725", "risco": "vermelho"}),
+            requisicao("POST", "/fila/proximo"),
+            requisicao("GET", "/pacientes/52998224725/historico?limite=1"),
+        )
+        self.assertEqual([status for status, _ in respostas], [201, 201, 201, 200, 200])
+        self.assertEqual(respostas[1][1]["risco"], "VERDE")
+        self.assertEqual(respostas[3][1]["risco"], "VERMELHO")
+        self.assertEqual(len(respostas[4][1]), 1)
+
+    async def test_erros(self):
+        respostas = await self.enviar(
+            requisicao("POST", "/fila/proximo"),
+            requisicao("POST", "/pacientes", {**PACIENTE, "cpf": "123"}),
+            requisicao("POST", "/atendimentos", {"cpf": "11144477735"}),
+            requisicao("GET", "/inexistente"),
+        )
+        self.assertEqual([status for status, _ in respostas], [404, 422, 404, 404])
+        self.assertEqual(respostas[0][1]["erro"], "Não tem nenhum paciente na fila de atendimento")
+
+    async def test_json_invalido_e_fechamento(self):
+        self.writer.write(b"POST /pacientes HTTP/1.1\r\nConnection: close\r\nContent-Length: 3\r\n\r\n{x}")
+        status, dados = await ler_resposta(self.reader)
+        self.assertEqual(status, 400)
+        self.assertEqual(await self.reader.read(), b"")
+
+    async def test_tipos_invalidos(self):
+        """Campos com tipos inválidos e paginação negativa respondem 400, sem derrubar a conexão."""
+        respostas = await self.enviar(
+            requisicao("POST", "/pacientes", {**PACIENTE, "cpf": 52998224725}),
+            requisicao("POST", "/pacientes", PACIENTE),
+            requisicao("POST", "/atendimentos", {"cpf": ["52998224725"]}),
+            requisicao("POST", "/atendimentos", {"cpf": "52998224725", "risco": 3}),
+            requisicao("POST", "/atendimentos", {"cpf": "52998224725", "gravidade_baixa": "false"}),
+            requisicao("GET", "/pacientes/52998224725/historico?inicio=-1"),
+            requisicao("GET", "/pacientes/52998224725/historico?limite=-1"),
+        )
+        self.assertEqual([status for status, _ in respostas], [400, 201, 400, 400, 400, 400, 400])
+
+    async def test_content_length_negativo(self):
+        self.writer.write(b"POST /pacientes HTTP/1.1\r\nContent-Length: -1\r\n\r\n")
+        status, _ = await ler_resposta(self.reader)
+        self.assertEqual(status, 400)
+        self.assertEqual(await self.reader.read(), b"")
+
+    async def test_erro_inesperado(self):
+        """Uma exceção inesperada do serviço responde 500 e a conexão continua atendendo."""
+        with mock.patch.object(self.ps_service, "chamar_proximo", side_effect=RuntimeError("falha")), \
+                self.assertLogs("main.server", "ERROR"):
+            respostas = await self.enviar(requisicao("POST", "/fila/proximo"), requisicao("POST", "/pacientes", PACIENTE))
+        self.assertEqual([status for status, _ in respostas], [500, 201])
+        self.assertEqual(respostas[0][1], {"erro": "Erro interno do servidor."})
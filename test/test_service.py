@@ -1,6 +1,6 @@
 import unittest
 import heapq
-from main.domain import FilaAtendimento, Atendimento, Paciente, Risco
+from main.domain import FilaAtendimento, FilaAtendimentoMultinivel, Atendimento, Paciente, Risco
 from main.service import ProntoSocorroService
 from main.error import FilaVaziaError
 
@@ -17,9 +17,9 @@ class TestFilaAtendimento(unittest.TestCase):
 
     def test_fila_com_pacientes(self):
         """Testa a inserção e ordem de atendimento na fila."""
-        paciente1 = Paciente("Ana", "12345678901", "ana@email.com", "01/01/2000")
+        paciente1 = Paciente("Ana", "12345678909", "ana@email.com", "01/01/2000")
         paciente2 = Paciente("Bruno", "98765432100", "bruno@email.com", "05/06/1985")
-        paciente3 = Paciente("Carlos", "11122233344", "carlos@email.com", "10/10/1995")
+        paciente3 = Paciente("Carlos", "11144477735", "carlos@email.com", "10/10/1995")
 
         atendimento1 = Atendimento(paciente1, Risco.VERDE)  # Baixa prioridade
         atendimento2 = Atendimento(paciente2, Risco.VERMELHO)  # Alta prioridade
@@ -38,7 +38,7 @@ class TestFilaAtendimento(unittest.TestCase):
         """Testa se o método possui_proximo() funciona corretamente."""
         self.assertFalse(self.fila.possui_proximo())
 
-        paciente = Paciente("Davi", "99988877766", "davi@email.com", "20/12/1990")
+        paciente = Paciente("Davi", "52998224725", "davi@email.com", "20/12/1990")
         atendimento = Atendimento(paciente, Risco.LARANJA)
         self.fila.inserir(atendimento)
 
@@ -55,7 +55,7 @@ class TestProntoSocorroService(unittest.TestCase):
 
     def test_inserir_fila_atendimento(self):
         """Testa se um atendimento é corretamente inserido na fila do pronto-socorro."""
-        paciente = Paciente("Fernando", "22233344455", "fernando@email.com", "30/07/1992")
+        paciente = Paciente("Fernando", "39053344705", "fernando@email.com", "30/07/1992")
         atendimento = Atendimento(paciente, Risco.AMARELO)
 
         resultado = self.pronto_socorro.inserir_fila_atendimento(atendimento)
@@ -63,8 +63,8 @@ class TestProntoSocorroService(unittest.TestCase):
 
     def test_chamar_proximo(self):
         """Testa se chamar_proximo() respeita a ordem de prioridade."""
-        paciente1 = Paciente("Gabriel", "44455566677", "gabriel@email.com", "12/09/1995")
-        paciente2 = Paciente("Helena", "77788899900", "helena@email.com", "25/05/1980")
+        paciente1 = Paciente("Gabriel", "71428793860", "gabriel@email.com", "12/09/1995")
+        paciente2 = Paciente("Helena", "04187363084", "helena@email.com", "25/05/1980")
 
         atendimento1 = Atendimento(paciente1, Risco.VERDE)
         atendimento2 = Atendimento(paciente2, Risco.VERMELHO)
@@ -74,3 +74,18 @@ class TestProntoSocorroService(unittest.TestCase):
 
         self.assertEqual(self.pronto_socorro.chamar_proximo(), atendimento2)
         self.assertEqual(self.pronto_socorro.chamar_proximo(), atendimento1)
+
+    def test_fila_multinivel(self):
+        """Testa o serviço configurado com a fila multinível."""
+        pronto_socorro = ProntoSocorroService(self.pacientes_repo, self.atendimentos_repo, FilaAtendimentoMultinivel())
+        paciente1 = Paciente("Gabriel", "52998224725", "gabriel@email.com", "12/09/1995")
+        paciente2 = Paciente("Helena", "11144477735", "helena@email.com", "25/05/1980")
+        atendimento1 = Atendimento(paciente1, Risco.VERDE)
+        atendimento2 = Atendimento(paciente2, Risco.LARANJA)
+
+        pronto_socorro.inserir_fila_atendimento(atendimento1)
+        pronto_socorro.inserir_fila_atendimento(atendimento2)
+
+        self.assertEqual(pronto_socorro.fila_atendimento.tamanho(Risco.LARANJA), 1)
+        self.assertEqual(pronto_socorro.chamar_proximo(), atendimento2)
+        self.assertEqual(pronto_socorro.chamar_proximo(), atendimento1)
@@ -0,0 +1,53 @@
+import unittest
+from datetime import datetime
+from test import test_repository
+from main.domain import Paciente, Atendimento, Risco
+from main.service import ProntoSocorroService
+from main.sqlite_repository import conectar, PacienteRepositorySQLite, AtendimentoRepositorySQLite
+from main.error import CPFDuplicadoError, PacienteNaoCadastradoError
+
+
+class TestPacienteRepositorySQLite(test_repository.TestPacienteRepository):
+
+    def criar_repositorio(self):
+        return PacienteRepositorySQLite(conectar())
+
+    def test_inserir_lote(self):
+        """Testa a inserção em lote e a atomicidade em caso de CPF duplicado."""
+        novos = [Paciente("Carla", "12345678909", "carla@email.com", "10/10/1995"),
+                 Paciente("Davi", "98765432100", "davi@email.com", "20/12/1990")]
+        self.repo.inserir_lote(novos)
+        self.assertEqual(self.repo.tamanho(), 4)
+        with self.assertRaises(CPFDuplicadoError):
+            self.repo.inserir_lote([Paciente("Eva", "39053344705", "eva@email.com", "01/01/2001"), novos[0]])
+        self.assertEqual(self.repo.tamanho(), 4)
+
+
+class TestAtendimentoRepositorySQLite(test_repository.TestAtendimentoRepository):
+
+    def criar_repositorios(self):
+        pacientes = PacienteRepositorySQLite(conectar())
+        return pacientes, AtendimentoRepositorySQLite(pacientes)
+
+    def test_inserir_lote(self):
+        self.repo.inserir_lote([Atendimento(self.outro, Risco.AMARELO, datetime(2024, 1, 5))] * 3)
+        self.assertEqual(self.repo.contar_atendimentos("11144477735"), 4)
+        paciente = Paciente("Davi", "98765432100", "davi@email.com", "20/12/1990")
+        with self.assertRaises(PacienteNaoCadastradoError):
+            self.repo.inserir(Atendimento(paciente, Risco.AZUL))
+
+
+class TestServiceSQLite(unittest.TestCase):
+
+    def test_servico_com_sqlite(self):
+        """O ProntoSocorroService funciona sem alterações sobre os repositórios SQLite."""
+        pacientes = PacienteRepositorySQLite(conectar())
+        servico = ProntoSocorroService(pacientes, AtendimentoRepositorySQLite(pacientes))
+        paciente = servico.registrar_paciente("Ana", "52998224725", "ana@email.com", "01/01/2000")
+        atendimento = servico.registrar_atendimento(paciente, Risco.LARANJA)
+        servico.inserir_fila_atendimento(atendimento)
+
+        self.assertEqual(servico.chamar_proximo(), atendimento)
+        self.assertEqual(servico.buscar_historico(servico.pacientes.buscar("52998224725")), [atendimento])
+        with self.assertRaises(CPFDuplicadoError):
+            servico.registrar_paciente("Ana", "52998224725", "ana@email.com", "01/01/2000")
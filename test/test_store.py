@@ -0,0 +1,41 @@
+import unittest
+from datetime import datetime, date
+from main.domain import Atendimento, Paciente, Risco
+from main.store import AtendimentoCompacto, AtendimentoStore, PacienteCompacto
+
+
+class TestRepresentacaoCompacta(unittest.TestCase):
+
+    def setUp(self):
+        self.paciente = Paciente("Ana Souza", "041.873.630-84", "ana@email.com", "12/12/1985")
+        self.atendimento = Atendimento(self.paciente, Risco.AMARELO, datetime(2024, 3, 1, 10, 30))
+
+    def test_paciente_compacto(self):
+        compacto = PacienteCompacto.de_paciente(self.paciente)
+        self.assertEqual(compacto.cpf, 4187363084)
+        self.assertEqual(compacto.cpf_formatado, "04187363084")
+        self.assertEqual(date.fromordinal(compacto.nascimento), date(1985, 12, 12))
+        with self.assertRaises(AttributeError):
+            compacto.nome = "Outra"
+
+    def test_atendimento_compacto_ida_e_volta(self):
+        compacto = AtendimentoCompacto.de_atendimento(self.atendimento)
+        self.assertEqual(compacto.risco, Risco.AMARELO.value)
+        self.assertEqual(compacto.para_atendimento(self.paciente), self.atendimento)
+
+    def test_store_colunar(self):
+        """Testa a inserção e leitura de atendimentos no armazenamento colunar."""
+        store = AtendimentoStore()
+        store.inserir(self.atendimento)
+        store.inserir_valores(52998224725, Risco.VERMELHO.value, datetime(2024, 3, 2).timestamp())
+
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store[0].cpf, 4187363084)
+        self.assertEqual(store[0].entrada, datetime(2024, 3, 1, 10, 30))
+        self.assertEqual(store[-1].risco, Risco.VERMELHO)
+        self.assertEqual([v.cpf for v in store], [4187363084, 52998224725])
+        cpfs, riscos, entradas = store.colunas()
+        self.assertEqual(riscos.tolist(), [3, 1])
+        cpfs.release(); riscos.release(); entradas.release()
+        with self.assertRaises(IndexError):
+            store[2]
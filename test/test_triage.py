@@ -0,0 +1,69 @@
+import itertools
+import unittest
+from unittest import mock
+from main import triage
+from main.domain import FichaAnalise, Risco
+from main.service import ProntoSocorroService
+from main.triage import classificar_lote
+from main.error import ValidacaoError
+
+COMBINACOES = list(itertools.product([False, True], repeat=4))
+
+
+class TestTriagem(unittest.TestCase):
+
+    def setUp(self):
+        self.pronto_socorro = ProntoSocorroService({}, {})
+
+    def test_classificacao_individual(self):
+        """RN1 - Classificação conforme o protocolo de Manchester."""
+        casos = [
+            (FichaAnalise(True, True, True, True), Risco.VERMELHO),
+            (FichaAnalise(False, True, False, False), Risco.LARANJA),
+            (FichaAnalise(False, False, True, False), Risco.AMARELO),
+            (FichaAnalise(False, True, True, False), Risco.LARANJA),
+            (FichaAnalise(False, False, False, True), Risco.VERDE),
+            (FichaAnalise(False, False, False, False), Risco.AZUL),
+        ]
+        for ficha, risco in casos:
+            self.assertEqual(self.pronto_socorro.classificar_risco(ficha), risco)
+
+    def test_lote_igual_individual(self):
+        """A classificação em lote usa as mesmas regras da classificação individual."""
+        fichas = [FichaAnalise(*valores) for valores in COMBINACOES]
+        esperado = [self.pronto_socorro.classificar_risco(ficha) for ficha in fichas]
+
+        self.assertEqual(self.pronto_socorro.classificar_risco_lote(fichas), esperado)
+
+        colunas = dict(zip(("risco_morte", "gravidade_alta", "gravidade_moderada", "gravidade_baixa"),
+                           zip(*COMBINACOES)))
+        self.assertEqual(self.pronto_socorro.classificar_risco_lote(colunas), [r.value for r in esperado])
+
+    def test_mascara_segue_tabela_de_regras(self):
+        """Os bits da máscara seguem a ordem dos campos na tabela de regras, e não uma ordem fixa."""
+        regras = tuple(reversed(triage.REGRAS_TRIAGEM))
+        tabela = triage._compilar(regras)
+        with mock.patch.multiple(triage, CAMPOS=tuple(campo for campo, _ in regras), TABELA=tabela,
+                                 CODIGOS=[risco.value for risco in tabela]):
+            ficha = FichaAnalise(False, False, True, True)
+            self.assertEqual(triage.mascara(ficha), 0b0011)
+            self.assertEqual(triage.classificar(ficha), Risco.VERDE)
+            colunas = {campo: [valor] for campo, valor in zip(triage.CAMPOS, (True, False, False, False))}
+            self.assertEqual(classificar_lote(colunas), [Risco.VERDE.value])
+
+    def test_lote_colunas_invalidas(self):
+        with self.assertRaises(ValidacaoError):
+            classificar_lote({"risco_morte": [True]})
+        with self.assertRaises(ValidacaoError):
+            classificar_lote({"risco_morte": [True], "gravidade_alta": [], "gravidade_moderada": [],
+                              "gravidade_baixa": []})
+
+    def test_lote_numpy(self):
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest("NumPy não instalado")
+        colunas = {campo: np.array(valores) for campo, valores in
+                   zip(("risco_morte", "gravidade_alta", "gravidade_moderada", "gravidade_baixa"), zip(*COMBINACOES))}
+        esperado = [self.pronto_socorro.classificar_risco(FichaAnalise(*v)).value for v in COMBINACOES]
+        self.assertEqual(classificar_lote(colunas).tolist(), esperado)
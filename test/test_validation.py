@@ -0,0 +1,53 @@
+import unittest
+from main.validation import validar_cpf, validar_lote, erro_cpf, erro_nascimento
+from main.validation import ERRO_CPF, ERRO_CPF_DIGITOS, ERRO_CPF_REPETIDO, ERRO_EMAIL, ERRO_NASCIMENTO, ERRO_NOME_INVALIDO
+from main.error import ValidacaoError
+
+
+class TestValidacao(unittest.TestCase):
+
+    def test_cpf_digitos_verificadores(self):
+        """RN4 - O CPF deve ter 11 dígitos e dígitos verificadores corretos."""
+        self.assertIsNone(erro_cpf("52998224725"))
+        self.assertIsNone(erro_cpf("529.982.247-25"))
+        self.assertEqual(erro_cpf("52998224726"), ERRO_CPF_DIGITOS)
+        self.assertEqual(erro_cpf("5299822472"), ERRO_CPF)
+        self.assertEqual(erro_cpf("٥٢٩٩٨٢٢٤٧٢٥"), ERRO_CPF)
+
+    def test_cpf_digitos_repetidos(self):
+        """CPFs com todos os dígitos iguais têm dígitos verificadores "corretos", mas são inválidos."""
+        for digito in "0123456789":
+            self.assertEqual(erro_cpf(digito * 11), ERRO_CPF_REPETIDO)
+        self.assertEqual(erro_cpf("111.111.111-11"), ERRO_CPF_REPETIDO)
+
+    def test_validar_cpf_normaliza(self):
+        self.assertEqual(validar_cpf("529.982.247-25"), "52998224725")
+        with self.assertRaises(ValidacaoError):
+            validar_cpf("12345678901")
+
+    def test_nascimento(self):
+        self.assertIsNone(erro_nascimento("29/02/2000"))
+        self.assertEqual(erro_nascimento("29/02/2001"), ERRO_NASCIMENTO)
+        self.assertEqual(erro_nascimento("1/2/2000"), ERRO_NASCIMENTO)
+
+    def test_validar_lote(self):
+        """Testa a validação em lote, que retorna os erros de cada registro sem levantar exceções."""
+        erros = validar_lote([
+            ("Maria Silva", "52998224725", "maria@email.com", "15/05/1995"),
+            {"nome": "R2D2", "cpf": "52998224725", "email": "maria", "nascimento": "15/05/1995"},
+            ("Ana", "11144477735", "ana@email.com", "31/04/1990"),
+        ])
+        self.assertEqual(erros, [[], [ERRO_NOME_INVALIDO, ERRO_EMAIL], [ERRO_NASCIMENTO]])
+
+    def test_validar_lote_campos_ausentes_ou_invalidos(self):
+        erros = validar_lote([
+            {"nome": "Maria Silva", "cpf": "52998224725", "email": "maria@email.com"},
+            ("Maria Silva", None, "maria", 15),
+            ("Ana",),
+        ])
+        self.assertEqual(erros, [
+            ["Campo obrigatório ausente: nascimento"],
+            ["Campo obrigatório ausente: cpf", ERRO_EMAIL, "Tipo inválido para o campo: nascimento"],
+            ["Campo obrigatório ausente: cpf", "Campo obrigatório ausente: email",
+             "Campo obrigatório ausente: nascimento"],
+        ])